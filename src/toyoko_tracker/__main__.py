@@ -1,7 +1,10 @@
 """
 支持 `python -m toyoko_tracker` 启动。
 """
+import multiprocessing
+
 from .app import main
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    multiprocessing.freeze_support()
+    main()
@@ -10,6 +10,7 @@ Relay：
 
 import json
 import re
+import hashlib
 import time
 import threading
 import logging
@@ -20,16 +21,23 @@ import socket
 import subprocess
 import shutil
 import queue
+import multiprocessing
+import tracemalloc
+from bisect import bisect_left
+from collections import deque, OrderedDict
+from itertools import islice
+from contextlib import contextmanager
 from copy import deepcopy
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, replace
 from datetime import datetime, timedelta
 from typing import List, Optional, Tuple, Dict, Any
 
 import requests
 from flask import Flask, request, jsonify, Response
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, Tag
 import smtplib
 from email.message import EmailMessage
+from html import unescape as _html_unescape
 
 from importlib.metadata import version, PackageNotFoundError
 
@@ -37,7 +45,6 @@ from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import WebDriverException
 
 # ---- precise timing helpers (monotonic) ----
@@ -54,6 +61,25 @@ try:
 except Exception:
     _HAS_PLAYWRIGHT = False
 
+# ---- Optional: fast HTML parsers for the offer extractor ----
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    _HAS_SELECTOLAX = True
+except Exception:
+    _HAS_SELECTOLAX = False
+
+try:
+    import lxml  # noqa: F401  (BeautifulSoup's "lxml" tree builder)
+    _HAS_LXML = True
+except Exception:
+    _HAS_LXML = False
+
+try:
+    import psutil  # optional: RSS-based recycling of Selenium drivers
+    _HAS_PSUTIL = True
+except Exception:
+    _HAS_PSUTIL = False
+
 try:
     from selenium.webdriver.chrome.service import Service
     from webdriver_manager.chrome import ChromeDriverManager  # 自动下载 chromedriver（可选）
@@ -80,7 +106,63 @@ DEFAULT_HOTEL_CODES: List[str] = [
     "00001", "00003", "00005", "00007", "00009"
 ]
 DEFAULT_LOOP_INTERVAL_SECONDS = 30
-DEFAULT_PER_HOTEL_DELAY_SECONDS = 3
+DEFAULT_PER_HOTEL_DELAY_SECONDS = 3  # legacy pacing; seeds the rate limit of older configs
+# Global token bucket shared by every page fetch (all lanes, engines and worker processes)
+DEFAULT_RATE_LIMIT_RPS = round(1.0 / DEFAULT_PER_HOTEL_DELAY_SECONDS, 2)
+DEFAULT_RATE_LIMIT_BURST = 2
+MIN_RATE_LIMIT_RPS = 0.05
+MAX_RATE_LIMIT_RPS = 20.0
+MAX_RATE_LIMIT_BURST = 20
+# AIMD pacing: back off sharply when the site degrades, creep back up to the configured rate/concurrency
+DEFAULT_AIMD_ENABLED = True
+AIMD_WINDOW = 6  # checks per control decision
+AIMD_RATE_STEP = 0.05  # requests/sec added after a healthy window
+AIMD_DECREASE = 0.5  # rate and concurrency factor after a degraded window
+AIMD_FAIL_RATIO = 0.34  # share of failed checks (available=None) that counts as degraded
+AIMD_LATENCY_FACTOR = 2.0  # window median above this multiple of the healthy baseline counts as degraded
+AIMD_BASELINE_ALPHA = 0.2
+# Page classification: markers are matched against the title and the top of the page
+PAGE_HEAD_CHARS = 800
+BLOCK_PAGE_MARKERS = (
+    "access denied", "403 forbidden", "too many requests", "request blocked",
+    "unusual traffic", "captcha", "verify you are human", "are you a robot",
+    "アクセスが集中", "アクセスが制限",
+)
+MAINTENANCE_PAGE_MARKERS = (
+    "under maintenance", "scheduled maintenance", "temporarily unavailable", "service unavailable",
+    "メンテナンス", "系统维护",
+)
+ERROR_PAGE_MARKERS = (
+    "internal server error", "bad gateway", "gateway timeout", "page not found",
+    "an error has occurred", "system error", "エラーが発生",
+)
+_NO_VACANCY_RE = re.compile(
+    r"no (rooms?|vacanc\w*|availability)|not available|fully booked|sold out|満室|空室がありません", re.I)
+# Class prefixes of the result list / empty-state message; a sold-out page says so inside them
+EMPTY_STATE_CLASS_MARKERS = ("SearchResultRoomPlanList_", "SearchResultEmpty_")
+PAGE_BAD_CLASSES = ("blocked", "maintenance", "error")
+# Circuit breaker per engine/proxy: open after repeated bad pages, cool down exponentially
+CIRCUIT_FAILURE_THRESHOLD = 3
+CIRCUIT_BASE_COOLDOWN_SEC = 60
+CIRCUIT_MAX_COOLDOWN_SEC = 1800
+# HTML parser used to read offers out of browser renders; "auto" picks the fastest installed
+PARSER_BACKENDS = ("auto", "selectolax", "lxml", "html.parser")
+DEFAULT_PARSER_BACKEND = "auto"
+# Content fingerprints: reuse the previous result when a page renders identically
+CONTENT_CACHE_MAX = 2000  # (hotel, dates, query) keys remembered
+# /metrics histogram buckets (seconds)
+METRIC_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+# Adaptive polling: volatile (hotel, stay) pairs are polled more often, quiet ones less
+DEFAULT_ADAPTIVE_POLLING = False
+DEFAULT_POLL_MIN_INTERVAL_SEC = 30
+DEFAULT_POLL_MAX_INTERVAL_SEC = 900
+POLL_CHANGE_ALPHA = 0.3  # EWMA weight of the latest poll in the change score
+POLL_INITIAL_SCORE = 0.5  # unseen pairs start halfway between the bounds
+DEFAULT_CONCURRENCY = 1  # hotels checked in parallel (one browser/driver each)
+MAX_CONCURRENCY = 8
+DEFAULT_SELENIUM_POOL_SIZE = 1  # warm Chrome drivers (never fewer than the concurrency)
+DEFAULT_EXECUTION_MODE = "thread"  # "thread" | "process" (each render worker process owns its browser)
+RENDER_PROCESS_TASK_TIMEOUT_SEC = 180  # a worker stuck on one hotel this long is killed and restarted
 DEFAULT_ROOM_REQUIREMENT = "any"  # any|single|double|twin
 DEFAULT_PEOPLE = 1
 DEFAULT_ROOMS = 1
@@ -116,8 +198,60 @@ SAVE_PATH = os.path.join(BASE_DIR, SAVE_FILENAME)
 AUTO_SAVE_PATH = os.path.join(BASE_DIR, AUTO_SAVE_FILENAME)
 
 # Fetch Configuration
-BASE_URL = "https://www.toyoko-inn.com/eng/search/result/room_plan/"
+PLAYWRIGHT_POOL_MAX_NAVIGATIONS = 40  # recycle a warm browser context after this many page loads
+DEFAULT_PLAYWRIGHT_CAPTURE = False    # read room plans from the page's JSON response when possible
+PLAYWRIGHT_CAPTURE_TIMEOUT_MS = 8000
+PLAYWRIGHT_CAPTURE_MAX_MISSES = 3     # after this many misses in a row, skip capture for a while
+PLAYWRIGHT_CAPTURE_BACKOFF_CHECKS = 20
+# Only JSON responses whose URL matches this are parsed for room plans (override with TOYOKO_CAPTURE_URL_RE)
+PLAYWRIGHT_CAPTURE_URL_RE = re.compile(
+    os.environ.get("TOYOKO_CAPTURE_URL_RE") or r"room[_-]?plan|/vacanc|/availability", re.IGNORECASE)
+PLAYWRIGHT_NAME_WAIT_MS = 3000        # how long a captured check waits for the DOM to read the hotel name
+DEFAULT_IN_PAGE_EXTRACT = False       # extract offers inside the browser and return only the fields
+IN_PAGE_VALIDATE_EVERY = 25           # also parse the full DOM in Python for every Nth in-page extraction
+IN_PAGE_MAX_MISMATCHES = 3            # after this many disagreements, fall back to DOM parsing
+IN_PAGE_TEXT_CHARS = 20000            # body text returned when a page has no room plan cards
+# Config fields saved with each recorded page (they change how a page is filtered)
+RECORD_PARAM_FIELDS = ("people", "rooms", "smoking", "room_requirement", "budget_enabled", "budget_limit")
+# Resource blocking during renders (none of these affect extract_offers)
+DEFAULT_BLOCK_RESOURCES = False  # opt-in: on Selenium it also turns on the performance log
+DEFAULT_BLOCK_ALLOW = ""  # comma-separated URL substrings that are never blocked
+DEFAULT_BLOCK_DENY = ""   # comma-separated URL substrings blocked in addition to the built-in list
+BLOCKED_RESOURCE_TYPES = ("image", "font", "media")
+BLOCKED_URL_EXTENSIONS = (".png", ".jpg", ".jpeg", ".gif", ".webp", ".avif", ".svg", ".ico",
+                          ".woff", ".woff2", ".ttf", ".otf", ".mp4", ".webm", ".mp3")
+BLOCKED_URL_SUBSTRINGS = (
+    "googletagmanager.com", "google-analytics.com", "analytics.google.com", "doubleclick.net",
+    "googleadservices.com", "googlesyndication.com", "connect.facebook.net", "facebook.com/tr",
+    "bat.bing.com", "clarity.ms", "hotjar.com", "criteo.", "yimg.jp/images/listing",
+    "s.yimg.jp", "analytics.tiktok.com", "ads-twitter.com", "static.ads-twitter.com",
+    "t.co/i/adsct", "cdn.treasuredata.com", "line-scdn.net/tag", "tr.line.me",
+)
+# Rough per-type transfer sizes behind the "bytes_est" counter (blocked requests never report a size)
+BLOCKED_BYTES_ESTIMATE = {"image": 60_000, "font": 40_000, "media": 300_000, "script": 50_000, "other": 5_000}
+# TOYOKO_BASE_URL points the tracker at another host, e.g. the local stand-in (python -m toyoko_tracker.standin)
+BASE_URL = os.environ.get("TOYOKO_BASE_URL") or "https://www.toyoko-inn.com/eng/search/result/room_plan/"
 TIMEOUT = 20
+READY_TIMEOUT_SEC = 20      # give up waiting for a terminal page state after this long
+READY_POLL_MS = 150
+READY_QUIET_MS = 2500       # a loaded page that has shown no price cards for this long counts as settled
+READY_TIMING_WINDOW = 500   # time-to-ready samples kept per engine
+CHECK_TIMING_WINDOW = 2000  # per-check timing records kept for /status
+ROUND_TIMING_WINDOW = 200   # per-round timing records kept for /status
+SLOW_HOTELS_SHOWN = 10
+LOG_RING_SIZE = 1000        # structured log entries kept for /logs and /status
+LOG_PAGE_MAX = 500          # entries per /logs reply
+LOG_LEVELS = {"debug": 10, "info": 20, "warning": 30, "error": 40}
+EVENT_QUEUE_MAX = 256       # pending events per /events client before it is resynced
+EVENT_KEEPALIVE_SEC = 15    # comment line sent to idle /events clients
+PROFILE_MAX_SECONDS = 120         # upper bound for one /debug/profile run
+PROFILE_DEFAULT_INTERVAL_MS = 10
+TRACEMALLOC_DEFAULT_FRAMES = 10   # traceback depth recorded per allocation
+TRACEMALLOC_TOP = 25              # call sites listed per snapshot or diff
+SELENIUM_RECYCLE_AFTER_LOADS = 100
+SELENIUM_RECYCLE_RSS_MB = 1500
+SELENIUM_PROBE_TIMEOUT_SEC = 5
+SELENIUM_ACQUIRE_TIMEOUT_SEC = 120
 HEADERS = {
     "User-Agent": (
         "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
@@ -146,15 +280,46 @@ class HotelResult:
     # For UI: all matching offers to display (each: price_text, member_price_text, remaining_norm, room_title)
     offers_display: Optional[List[Dict[str, Any]]] = None
     requirement_unmet: bool = False
+    # Why the check failed (timeout | blocked | site_error | error), None when it didn't
+    error: Optional[str] = None
+    # What the render looked like: ok | no_vacancy | blocked | maintenance | error
+    page_class: Optional[str] = None
+    # Page fingerprint matched the previous check: this is that check's result, not re-parsed
+    unchanged: bool = False
+    # Time spent checking, excluding rate-limiter waits
+    elapsed_ms: Optional[float] = None
+    # Engine that produced the page, ms per pipeline stage, and page bytes read back into Python
+    engine: Optional[str] = None
+    stages: Optional[Dict[str, float]] = None
+    fetch_bytes: Optional[int] = None
+    # Extra fetch attempts within this check (HTTP engine falling back to a browser)
+    retries: Optional[int] = None
+    # Stay this result was checked for (one hotel can be watched over several ranges)
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
 
 
 @dataclass
 class AppConfig:
     start_date: str = DEFAULT_START_DATE
     end_date: str = DEFAULT_END_DATE
+    # Additional [start, end] stays watched alongside start_date/end_date
+    extra_date_ranges: List[List[str]] = None
     hotel_codes: List[str] = None
     loop_interval_seconds: int = DEFAULT_LOOP_INTERVAL_SECONDS
     per_hotel_delay_seconds: int = DEFAULT_PER_HOTEL_DELAY_SECONDS
+    # Request pacing: sustained fetches per second and how many may go back-to-back
+    rate_limit_rps: float = DEFAULT_RATE_LIMIT_RPS
+    rate_limit_burst: int = DEFAULT_RATE_LIMIT_BURST
+    # Lower rate/concurrency automatically when the site slows down or pushes back
+    aimd_enabled: bool = DEFAULT_AIMD_ENABLED
+    # Adaptive polling (replaces the fixed loop interval when enabled)
+    adaptive_polling: bool = DEFAULT_ADAPTIVE_POLLING
+    poll_min_interval_sec: int = DEFAULT_POLL_MIN_INTERVAL_SEC
+    poll_max_interval_sec: int = DEFAULT_POLL_MAX_INTERVAL_SEC
+    concurrency: int = DEFAULT_CONCURRENCY
+    selenium_pool_size: int = DEFAULT_SELENIUM_POOL_SIZE
+    execution_mode: str = DEFAULT_EXECUTION_MODE
     people: int = DEFAULT_PEOPLE
     rooms: int = DEFAULT_ROOMS
     # Budget
@@ -183,20 +348,59 @@ class AppConfig:
     # Alerts repeat
     available_alert_repeat: int = DEFAULT_AVAILABLE_ALERT_REPEAT
     available_alert_repeat_interval_sec: int = DEFAULT_AVAILABLE_ALERT_REPEAT_INTERVAL_SEC
-    # Rendering engine: "selenium" or "playwright"
+    # Rendering engine: "selenium", "playwright" or "http" (browserless, falls back to a browser)
     engine: str = "playwright" if _HAS_PLAYWRIGHT else "selenium"
+    # Playwright: build offers from the room-plan JSON response instead of the DOM
+    playwright_capture: bool = DEFAULT_PLAYWRIGHT_CAPTURE
+    # Selenium/Playwright: run the offer extractor inside the page, return compact JSON
+    # (config file / API only until it has been benchmarked against a real browser)
+    in_page_extract: bool = DEFAULT_IN_PAGE_EXTRACT
+    # HTML parser backend: auto | selectolax | lxml | html.parser
+    parser_backend: str = DEFAULT_PARSER_BACKEND
+    # Block images/fonts/media/trackers during renders
+    block_resources: bool = DEFAULT_BLOCK_RESOURCES
+    block_allow: str = DEFAULT_BLOCK_ALLOW
+    block_deny: str = DEFAULT_BLOCK_DENY
+    # Save every newly parsed page here as a benchmark fixture (empty = off)
+    record_dir: str = ""
 
     def __post_init__(self):
         if self.hotel_codes is None:
             self.hotel_codes = list(DEFAULT_HOTEL_CODES)
+        if self.extra_date_ranges is None:
+            self.extra_date_ranges = []
 
 
 # ========= Global Status =========
 _ALERT_STATE: Dict[str, Dict[str, Any]] = {}
-_LOG_LINES: List[str] = []
+# Log entries {seq, ts, level, source, message}; seq counts every entry ever appended (the "logs" version)
+_LOG_RING: "deque[Dict[str, Any]]" = deque(maxlen=LOG_RING_SIZE)
+_LOG_SEQ = 0
 _LOG_LOCK = threading.Lock()
+# /status versions: bumped whenever that part of the snapshot changes, so
+# clients can ask for changes since the versions they last saw
+_VERSIONS: Dict[str, int] = {"config": 1, "results": 1, "timings": 0, "state": 1}
+_VERSION_LOCK = threading.Lock()
+_STATUS_CACHE: Dict[str, Tuple[int, Any]] = {}  # part -> (version, JSON-ready snapshot)
+_LOG_FORWARD = None  # set inside render worker processes to ship log entries to the parent
 _LAST_RESULTS: List[HotelResult] = []
 _RESULTS_LOCK = threading.Lock()
+# Adaptive polling state per "code|start|end": change score, interval, next due time, last result
+_POLL_STATE: Dict[str, Dict[str, Any]] = {}
+_POLL_LOCK = threading.Lock()
+_RATE_LIMITER = None  # TokenBucket while the worker runs; None (no limit) inside render worker processes
+_RATE_WAIT = threading.local()  # per-thread seconds spent waiting for tokens during the current check
+_AIMD = None  # AimdController while the worker runs with aimd_enabled
+_CIRCUITS: Dict[str, "CircuitBreaker"] = {}  # "engine|proxy" -> breaker; kept across restarts
+_CIRCUITS_LOCK = threading.Lock()
+_CIRCUITS_ACTIVE = False  # only the tracker process gates on breakers, not render worker processes
+# query key -> (fingerprint, result); lives in whichever process renders
+_CONTENT_CACHE: "OrderedDict[str, Tuple[str, HotelResult]]" = OrderedDict()
+_CONTENT_CACHE_LOCK = threading.Lock()
+_CONTENT_STATS: Dict[str, Any] = {"hits": 0, "checks": 0, "last_round": None}
+_CONTENT_STATS_LOCK = threading.Lock()
+_IN_PAGE_STATS: Dict[str, Any] = {"extractions": 0, "validated": 0, "mismatches": 0, "errors": 0, "disabled": False}
+_IN_PAGE_LOCK = threading.Lock()
 _START_TIME = _now_wall()
 _PROGRESS = {"round": 0, "done": 0, "total": 0, "round_started": 0.0, "round_started_mono": 0.0}
 _UPTIME_STARTED: Optional[float] = None        # wall-clock (for display)
@@ -205,13 +409,25 @@ _PROGRESS_LOCK = threading.Lock()
 _ACTION_LOCK = threading.Lock()
 _CURRENT_ACTION: str = "(idle)"
 _ACTION_TS: float = 0.0
+_READY_TIMINGS: Dict[str, "deque[Tuple[float, str]]"] = {}  # engine -> (ms, state)
+_READY_LOCK = threading.Lock()
+_CHECK_TIMES: "deque[Dict[str, Any]]" = deque(maxlen=CHECK_TIMING_WINDOW)
+_ROUND_TIMES: "deque[Dict[str, Any]]" = deque(maxlen=ROUND_TIMING_WINDOW)
+_TIMING_LOCK = threading.Lock()
+_BLOCK_STATS_LOCK = threading.Lock()
+_BLOCK_STATS: Dict[str, Any] = {"requests": 0, "bytes_est": 0, "by_type": {}}       # current round
+_BLOCK_STATS_LAST: Dict[str, Any] = {"requests": 0, "bytes_est": 0, "by_type": {}}  # previous round
 _CONFIG = AppConfig()
 _CONFIG_LOCK = threading.Lock()
 
 _worker_thread: Optional[threading.Thread] = None
+_RENDER_RUNNER = None  # RenderProcessPool / _CheckLanes of the running worker, for /status
 _stop_event = threading.Event()
-_driver: Optional[webdriver.Chrome] = None
-_DRIVER_LOCK = threading.Lock()
+_SELENIUM_POOL: Optional["SeleniumDriverPool"] = None
+_SELENIUM_POOL_LOCK = threading.Lock()
+_PW_LOCAL = threading.local()          # per-thread PlaywrightPool
+_PW_POOLS: List["PlaywrightPool"] = []  # registry for /status
+_PW_POOLS_LOCK = threading.Lock()
 _RUN_REQUESTED = False  # only set True by /start; set False by /stop
 # ========= Mail Queue (async, non-blocking) =========
 _MAIL_QUEUE: "queue.Queue[Dict[str, Any]]" = queue.Queue()
@@ -230,13 +446,61 @@ def _safe_print(text: str) -> None:
             pass
 
 
-def _log(msg: str) -> None:
-    line = f"[{datetime.now().strftime('%H:%M:%S')}] {msg}"
+_LOG_TAG_RE = re.compile(r"\[([\w -]+)\]")
+_LOG_WARN_RE = re.compile(r"\b(failed|exception)\b", re.I)
+
+
+def _log_meta(msg: str) -> Tuple[str, str]:
+    """
+    (level, source) from the message's leading "[tag]" and wording; only used
+    when the call site doesn't pass them (errors and warnings pass a level).
+    """
+    m = _LOG_TAG_RE.match(msg)
+    tag = m.group(1) if m else ""
+    if tag == "error":
+        level = "error"
+    elif _LOG_WARN_RE.search(msg):
+        level = "warning"
+    else:
+        level = "info"
+    return level, (tag if tag and tag != "error" else "app")
+
+
+def _format_log_entry(entry: Dict[str, Any]) -> str:
+    return f"[{datetime.fromtimestamp(entry['ts']).strftime('%H:%M:%S')}] {entry['message']}"
+
+
+def _log(msg: str, level: Optional[str] = None, source: Optional[str] = None) -> None:
+    inferred_level, inferred_source = _log_meta(msg)
+    entry = {"ts": time.time(), "level": level or inferred_level, "source": source or inferred_source, "message": msg}
+    if _LOG_FORWARD is not None:
+        # render worker process: the parent records the entry and prints it
+        try:
+            _LOG_FORWARD(entry)
+            return
+        except Exception:
+            pass
+    _append_log_entry(entry)
+    _safe_print(_format_log_entry(entry))
+
+
+def _append_log_entry(entry: Dict[str, Any]) -> None:
+    global _LOG_SEQ
+    with _LOG_LOCK:
+        _LOG_SEQ += 1
+        entry["seq"] = _LOG_SEQ
+        _LOG_RING.append(entry)
+    _EVENTS.publish("changed", "logs")
+
+
+def _log_entries(since: int) -> Tuple[List[Dict[str, Any]], int, bool]:
+    """Entries with seq > since (oldest first), the latest seq, and whether older entries were already dropped."""
     with _LOG_LOCK:
-        _LOG_LINES.append(line)
-        if len(_LOG_LINES) > 500:
-            del _LOG_LINES[: len(_LOG_LINES) - 500]
-    _safe_print(line)
+        seq = _LOG_SEQ
+        first = seq - len(_LOG_RING) + 1
+        start = max(0, since + 1 - first)
+        entries = list(islice(_LOG_RING, start, None))
+    return entries, seq, since + 1 < first
 
 
 def _set_action(msg: str) -> None:
@@ -244,6 +508,75 @@ def _set_action(msg: str) -> None:
     with _ACTION_LOCK:
         _CURRENT_ACTION = str(msg)
         _ACTION_TS = time.time()
+    _bump_version("state")
+
+
+class _EventHub:
+    """
+    Fan-out to /events clients, one bounded queue each. Publishing with no
+    clients connected costs a lock and an empty list. A client that falls
+    EVENT_QUEUE_MAX events behind is told to resync instead of queueing more.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subs: List["queue.Queue[Tuple[str, Any]]"] = []
+
+    def subscribe(self) -> "queue.Queue[Tuple[str, Any]]":
+        q: "queue.Queue[Tuple[str, Any]]" = queue.Queue(maxsize=EVENT_QUEUE_MAX)
+        with self._lock:
+            self._subs.append(q)
+        return q
+
+    def unsubscribe(self, q: "queue.Queue[Tuple[str, Any]]") -> None:
+        with self._lock:
+            if q in self._subs:
+                self._subs.remove(q)
+
+    def active(self) -> bool:
+        return bool(self._subs)
+
+    def publish(self, event: str, data: Any = None) -> None:
+        # Held throughout, so no other publisher can refill a queue between the
+        # drain and the resync marker (clients only ever take from their queue).
+        with self._lock:
+            for q in self._subs:
+                try:
+                    q.put_nowait((event, data))
+                except queue.Full:
+                    try:
+                        while True:
+                            q.get_nowait()
+                    except queue.Empty:
+                        pass
+                    q.put_nowait(("resync", None))
+
+
+_EVENTS = _EventHub()
+
+
+def _bump_version(part: str) -> None:
+    with _VERSION_LOCK:
+        _VERSIONS[part] += 1
+    _EVENTS.publish("changed", part)
+
+
+def _versions() -> Dict[str, int]:
+    with _VERSION_LOCK:
+        out = dict(_VERSIONS)
+    with _LOG_LOCK:
+        out["logs"] = _LOG_SEQ
+    return out
+
+
+def _cached_snapshot(part: str, version: int, build):
+    """Reuse the snapshot built for `version` of `part`, so unchanged parts aren't re-serialised per request."""
+    hit = _STATUS_CACHE.get(part)
+    if hit is not None and hit[0] == version:
+        return hit[1]
+    value = build()
+    _STATUS_CACHE[part] = (version, value)
+    return value
 
 # ========= Configuration Read/Write =========
 def _load_config_from_file(path: str) -> bool:
@@ -256,6 +589,8 @@ def _load_config_from_file(path: str) -> bool:
             cfg = _CONFIG
             cfg.start_date = data.get('start_date', cfg.start_date)
             cfg.end_date = data.get('end_date', cfg.end_date)
+            if 'extra_date_ranges' in data:
+                cfg.extra_date_ranges = _parse_date_ranges(data.get('extra_date_ranges'))
             if isinstance(data.get('hotel_codes'), list):
                 cfg.hotel_codes = [str(x) for x in data['hotel_codes']]
             cfg.people = int(data.get('people', cfg.people))
@@ -293,12 +628,42 @@ def _load_config_from_file(path: str) -> bool:
                 'per_hotel_delay_seconds',
                 getattr(cfg, 'per_hotel_delay_seconds', DEFAULT_PER_HOTEL_DELAY_SECONDS)
             ))))
+            # Configs saved before the rate limiter existed: one request per old per-hotel delay
+            rps = data.get('rate_limit_rps', 1.0 / cfg.per_hotel_delay_seconds)
+            cfg.rate_limit_rps = _clamp_rps(rps, cfg.rate_limit_rps)
+            cfg.rate_limit_burst = _clamp_burst(data.get('rate_limit_burst', cfg.rate_limit_burst), cfg.rate_limit_burst)
+            cfg.aimd_enabled = bool(data.get('aimd_enabled', getattr(cfg, 'aimd_enabled', DEFAULT_AIMD_ENABLED)))
+            cfg.adaptive_polling = bool(data.get('adaptive_polling', getattr(cfg, 'adaptive_polling', DEFAULT_ADAPTIVE_POLLING)))
+            try:
+                cfg.poll_min_interval_sec = max(5, int(data.get('poll_min_interval_sec', cfg.poll_min_interval_sec)))
+                cfg.poll_max_interval_sec = max(cfg.poll_min_interval_sec, int(data.get('poll_max_interval_sec', cfg.poll_max_interval_sec)))
+            except Exception:
+                cfg.poll_min_interval_sec = DEFAULT_POLL_MIN_INTERVAL_SEC
+                cfg.poll_max_interval_sec = DEFAULT_POLL_MAX_INTERVAL_SEC
+            try:
+                cfg.concurrency = max(1, min(MAX_CONCURRENCY, int(data.get('concurrency', cfg.concurrency))))
+            except Exception:
+                cfg.concurrency = DEFAULT_CONCURRENCY
+            try:
+                cfg.selenium_pool_size = max(1, min(MAX_CONCURRENCY, int(data.get('selenium_pool_size', cfg.selenium_pool_size))))
+            except Exception:
+                cfg.selenium_pool_size = DEFAULT_SELENIUM_POOL_SIZE
+            mode = str(data.get('execution_mode', getattr(cfg, 'execution_mode', DEFAULT_EXECUTION_MODE)))
+            cfg.execution_mode = mode if mode in {'thread', 'process'} else DEFAULT_EXECUTION_MODE
             cfg.available_alert_repeat = int(data.get('available_alert_repeat', cfg.available_alert_repeat))
             cfg.available_alert_repeat_interval_sec = int(data.get('available_alert_repeat_interval_sec', cfg.available_alert_repeat_interval_sec))
             eng = str(data.get('engine', getattr(cfg, 'engine', 'selenium')))
-            if eng not in {'selenium','playwright'}:
+            if eng not in {'selenium', 'playwright', 'http'}:
                 eng = 'selenium'
             cfg.engine = eng
+            cfg.playwright_capture = bool(data.get('playwright_capture', getattr(cfg, 'playwright_capture', DEFAULT_PLAYWRIGHT_CAPTURE)))
+            cfg.in_page_extract = bool(data.get('in_page_extract', getattr(cfg, 'in_page_extract', DEFAULT_IN_PAGE_EXTRACT)))
+            pb = str(data.get('parser_backend', getattr(cfg, 'parser_backend', DEFAULT_PARSER_BACKEND)))
+            cfg.parser_backend = pb if pb in PARSER_BACKENDS else DEFAULT_PARSER_BACKEND
+            cfg.block_resources = bool(data.get('block_resources', getattr(cfg, 'block_resources', DEFAULT_BLOCK_RESOURCES)))
+            cfg.block_allow = str(data.get('block_allow', getattr(cfg, 'block_allow', DEFAULT_BLOCK_ALLOW)) or "")
+            cfg.block_deny = str(data.get('block_deny', getattr(cfg, 'block_deny', DEFAULT_BLOCK_DENY)) or "")
+            cfg.record_dir = str(data.get('record_dir', getattr(cfg, 'record_dir', '')) or "").strip()
             # Budget (non-member price limit)
             try:
                 cfg.budget_enabled = bool(data.get('budget_enabled', getattr(cfg, 'budget_enabled', DEFAULT_BUDGET_ENABLED)))
@@ -308,10 +673,11 @@ def _load_config_from_file(path: str) -> bool:
                 cfg.budget_limit = int(data.get('budget_limit', getattr(cfg, 'budget_limit', DEFAULT_BUDGET_LIMIT)))
             except Exception:
                 cfg.budget_limit = DEFAULT_BUDGET_LIMIT
+        _bump_version("config")
         _log(f"Loaded config from {path}")
         return True
     except Exception as e:
-        _log(f"[error] load config from {path}: {e}")
+        _log(f"[error] load config from {path}: {e}", level="error")
         return False
 
 
@@ -322,6 +688,7 @@ def _save_config_to_file(path: str) -> bool:
             data = {
                 'start_date': cfg.start_date,
                 'end_date': cfg.end_date,
+                'extra_date_ranges': [list(x) for x in (getattr(cfg, 'extra_date_ranges', None) or [])],
                 'hotel_codes': list(cfg.hotel_codes),
                 'people': cfg.people,
                 'rooms': cfg.rooms,
@@ -344,9 +711,25 @@ def _save_config_to_file(path: str) -> bool:
                 'email_to': cfg.email_to,
                 'loop_interval_seconds': cfg.loop_interval_seconds,
                 'per_hotel_delay_seconds': cfg.per_hotel_delay_seconds,
+                'rate_limit_rps': getattr(cfg, 'rate_limit_rps', DEFAULT_RATE_LIMIT_RPS),
+                'rate_limit_burst': getattr(cfg, 'rate_limit_burst', DEFAULT_RATE_LIMIT_BURST),
+                'aimd_enabled': getattr(cfg, 'aimd_enabled', DEFAULT_AIMD_ENABLED),
+                'adaptive_polling': getattr(cfg, 'adaptive_polling', DEFAULT_ADAPTIVE_POLLING),
+                'poll_min_interval_sec': getattr(cfg, 'poll_min_interval_sec', DEFAULT_POLL_MIN_INTERVAL_SEC),
+                'poll_max_interval_sec': getattr(cfg, 'poll_max_interval_sec', DEFAULT_POLL_MAX_INTERVAL_SEC),
+                'concurrency': cfg.concurrency,
+                'selenium_pool_size': cfg.selenium_pool_size,
+                'execution_mode': cfg.execution_mode,
                 'available_alert_repeat': cfg.available_alert_repeat,
                 'available_alert_repeat_interval_sec': cfg.available_alert_repeat_interval_sec,
                 'engine': cfg.engine,
+                'playwright_capture': getattr(cfg, 'playwright_capture', DEFAULT_PLAYWRIGHT_CAPTURE),
+                'in_page_extract': getattr(cfg, 'in_page_extract', DEFAULT_IN_PAGE_EXTRACT),
+                'parser_backend': getattr(cfg, 'parser_backend', DEFAULT_PARSER_BACKEND),
+                'block_resources': getattr(cfg, 'block_resources', DEFAULT_BLOCK_RESOURCES),
+                'block_allow': getattr(cfg, 'block_allow', DEFAULT_BLOCK_ALLOW),
+                'block_deny': getattr(cfg, 'block_deny', DEFAULT_BLOCK_DENY),
+                'record_dir': getattr(cfg, 'record_dir', ''),
                 'budget_enabled': getattr(cfg, 'budget_enabled', DEFAULT_BUDGET_ENABLED),
                 'budget_limit': getattr(cfg, 'budget_limit', DEFAULT_BUDGET_LIMIT),
             }
@@ -355,11 +738,1046 @@ def _save_config_to_file(path: str) -> bool:
         _log(f"Saved config to {path}")
         return True
     except Exception as e:
-        _log(f"[error] save config to {path}: {e}")
+        _log(f"[error] save config to {path}: {e}", level="error")
         return False
 
 
+# ========= Watch Ranges =========
+_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+
+def _parse_date_ranges(value: Any) -> List[List[str]]:
+    """
+    Normalize extra stays to [[start, end], ...]. Accepts a list of pairs or
+    text with one stay per line (``2025-10-01 → 2025-10-03``, ``2025-10-01,2025-10-03``).
+    Invalid or reversed pairs are dropped.
+    """
+    if isinstance(value, str):
+        pairs = [_DATE_RE.findall(line) for line in value.splitlines()]
+    elif isinstance(value, (list, tuple)):
+        pairs = [list(x) if isinstance(x, (list, tuple)) else _DATE_RE.findall(str(x)) for x in value]
+    else:
+        return []
+    out: List[List[str]] = []
+    for p in pairs:
+        if len(p) < 2:
+            continue
+        start, end = str(p[0]), str(p[1])
+        try:
+            if datetime.strptime(end, "%Y-%m-%d") <= datetime.strptime(start, "%Y-%m-%d"):
+                continue
+        except ValueError:
+            continue
+        if [start, end] not in out:
+            out.append([start, end])
+    return out
+
+
+def _watch_ranges(cfg: AppConfig) -> List[Tuple[str, str]]:
+    """Every stay being watched: the primary dates first, then the extras."""
+    ranges = [(cfg.start_date, cfg.end_date)]
+    for start, end in (getattr(cfg, 'extra_date_ranges', None) or []):
+        if (start, end) not in ranges:
+            ranges.append((start, end))
+    return ranges
+
+
+def _format_ranges(ranges: List[Tuple[str, str]]) -> str:
+    return ", ".join(f"{s} → {e}" for s, e in ranges)
+
+
+# ========= Resource Blocking =========
+def _split_patterns(text: str) -> List[str]:
+    return [x.strip().lower() for x in re.split(r"[,\n]+", text or "") if x.strip()]
+
+
+def _block_policy(cfg: AppConfig) -> Optional[Dict[str, Any]]:
+    """Blocking policy for a render, or None when blocking is off."""
+    if not getattr(cfg, "block_resources", False):
+        return None
+    return {
+        "types": set(BLOCKED_RESOURCE_TYPES),
+        "deny": list(BLOCKED_URL_SUBSTRINGS) + _split_patterns(getattr(cfg, "block_deny", "")),
+        "allow": _split_patterns(getattr(cfg, "block_allow", "")),
+    }
+
+
+def _should_block(policy: Dict[str, Any], url: str, resource_type: str) -> bool:
+    u = url.lower()
+    if any(a in u for a in policy["allow"]):
+        return False
+    if resource_type in policy["types"]:
+        return True
+    return any(d in u for d in policy["deny"])
+
+
+def _selenium_blocked_patterns(policy: Dict[str, Any]) -> List[str]:
+    """
+    Network.setBlockedURLs has no resource types: map them onto URL wildcards.
+    It has no allow list either, so block_allow only applies to Playwright.
+    """
+    patterns = [f"*{ext}*" for ext in BLOCKED_URL_EXTENSIONS]
+    patterns += [f"*{d}*" for d in policy["deny"]]
+    return patterns
+
+
+def _note_blocked(resource_type: str) -> None:
+    rtype = resource_type if resource_type in BLOCKED_BYTES_ESTIMATE else "other"
+    with _BLOCK_STATS_LOCK:
+        _BLOCK_STATS["requests"] += 1
+        _BLOCK_STATS["bytes_est"] += BLOCKED_BYTES_ESTIMATE[rtype]
+        by_type = _BLOCK_STATS["by_type"]
+        by_type[rtype] = by_type.get(rtype, 0) + 1
+
+
+def _roll_block_stats() -> None:
+    """Start a new per-round counter, keeping the finished round for /status."""
+    global _BLOCK_STATS, _BLOCK_STATS_LAST
+    with _BLOCK_STATS_LOCK:
+        _BLOCK_STATS_LAST = _BLOCK_STATS
+        _BLOCK_STATS = {"requests": 0, "bytes_est": 0, "by_type": {}}
+
+
+def _block_stats_snapshot() -> Dict[str, Any]:
+    with _BLOCK_STATS_LOCK:
+        return {
+            "current_round": deepcopy(_BLOCK_STATS),
+            "last_round": deepcopy(_BLOCK_STATS_LAST),
+        }
+
+
+def _count_selenium_blocked(driver: webdriver.Chrome) -> None:
+    """Drain the performance log and count requests Chrome refused via setBlockedURLs."""
+    try:
+        entries = driver.get_log("performance")
+    except Exception:
+        return
+    for entry in entries:
+        msg = entry.get("message") or ""
+        if "Network.loadingFailed" not in msg or "blockedReason" not in msg:
+            continue
+        try:
+            params = json.loads(msg)["message"]["params"]
+        except Exception:
+            continue
+        if params.get("blockedReason"):
+            _note_blocked(str(params.get("type") or "other").lower())
+
+
+# ========= Metrics =========
+# A minimal registry rendered in the Prometheus text format at /metrics.
+# Stage timings of a check are collected per thread and travel on its
+# HotelResult, so checks run in render worker processes are observed too
+# (in the tracker process, by _observe_results). Stages outside a check
+# (notify, sleep) are observed where they happen.
+_METRICS: List["_Metric"] = []
+
+
+def _fmt_metric_value(v: float) -> str:
+    if v == float("inf"):
+        return "+Inf"
+    return str(int(v)) if float(v).is_integer() else f"{v:.9g}"
+
+
+def _escape_label(v: str) -> str:
+    return v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _fmt_metric_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{n}="{_escape_label(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+        self._series: Dict[Tuple[str, ...], Any] = {}
+        _METRICS.append(self)
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(n, "")) for n in self.labels)
+
+    def lines(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._series.items())
+        return [f"{self.name}{_fmt_metric_labels(self.labels, k)} {_fmt_metric_value(v)}" for k, v in items]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = self._series.get(key, 0.0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._series[self._key(labels)] = float(value)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...] = (), buckets=METRIC_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        idx = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][idx] += 1
+            series[1] += value
+            series[2] += 1
+
+    def lines(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, [list(v[0]), v[1], v[2]]) for k, v in self._series.items())
+        out = []
+        for key, (counts, total, n) in items:
+            cumulative = 0
+            for bound, c in zip(self.buckets + (float("inf"),), counts):
+                cumulative += c
+                le = f'le="{_fmt_metric_value(bound)}"'
+                out.append(f"{self.name}_bucket{_fmt_metric_labels(self.labels, key, le)} {cumulative}")
+            out.append(f"{self.name}_sum{_fmt_metric_labels(self.labels, key)} {_fmt_metric_value(total)}")
+            out.append(f"{self.name}_count{_fmt_metric_labels(self.labels, key)} {n}")
+        return out
+
+
+METRIC_CHECKS = Counter("toyoko_checks_total", "Hotel checks by outcome (available, sold_out, unknown).", ("result",))
+METRIC_CHECK_ERRORS = Counter("toyoko_check_errors_total", "Checks that failed or were degraded, by kind.", ("kind",))
+METRIC_CHECKS_UNCHANGED = Counter("toyoko_checks_unchanged_total", "Checks answered from the content cache.")
+METRIC_CHECK_SECONDS = Histogram("toyoko_check_seconds", "Time per hotel check, excluding rate-limiter waits.", ("engine",))
+METRIC_STAGE_SECONDS = Histogram("toyoko_stage_seconds", "Time per pipeline stage.", ("stage", "engine"))
+METRIC_FETCH_BYTES = Counter("toyoko_fetch_bytes_total", "Page bytes read back into Python.", ("engine",))
+METRIC_ROUNDS = Counter("toyoko_rounds_total", "Completed check rounds.")
+METRIC_ROUND_SECONDS = Histogram("toyoko_round_seconds", "Time per round: checks and notifications, not the wait.")
+METRIC_NOTIFICATIONS = Counter("toyoko_notifications_total", "Notifications by channel and outcome.", ("channel", "outcome"))
+METRIC_NOTIFY_SECONDS = Histogram("toyoko_notify_seconds", "Time to deliver one notification.", ("channel",))
+METRIC_WORKER_RUNNING = Gauge("toyoko_worker_running", "1 while the worker loop is running.")
+METRIC_RATE_LIMIT = Gauge("toyoko_rate_limit_rps", "Current fetch rate limit (requests per second).")
+METRIC_CONTENT_CACHE = Gauge("toyoko_content_cache_entries", "Pages remembered by the content cache.")
+
+_CHECK_TIMING = threading.local()  # .rec: stage timings of the check running on this thread
+
+
+def _add_stage(name: str, seconds: float) -> None:
+    rec = getattr(_CHECK_TIMING, "rec", None)
+    if rec is None:
+        METRIC_STAGE_SECONDS.observe(seconds, stage=name, engine="")
+    else:
+        rec["stages"][name] = rec["stages"].get(name, 0.0) + seconds * 1000.0
+
+
+@contextmanager
+def _stage(name: str):
+    t0 = _now_mono()
+    try:
+        yield
+    finally:
+        _add_stage(name, _now_mono() - t0)
+
+
+def _note_fetch(engine: Optional[str], nbytes: int = 0) -> None:
+    """Record the engine serving the current check (None keeps it) and bytes read back."""
+    rec = getattr(_CHECK_TIMING, "rec", None)
+    if rec is None:
+        if nbytes:
+            METRIC_FETCH_BYTES.inc(nbytes, engine=engine or "")
+        return
+    if engine:
+        if rec["engine"] is not None:
+            rec["retries"] += 1
+        rec["engine"] = engine
+    rec["bytes"] += nbytes
+
+
+def _begin_check_timing() -> None:
+    _CHECK_TIMING.rec = {"engine": None, "stages": {}, "bytes": 0, "retries": 0}
+
+
+def _end_check_timing(result: "HotelResult") -> None:
+    rec = getattr(_CHECK_TIMING, "rec", None)
+    _CHECK_TIMING.rec = None
+    if rec is None:
+        return
+    result.engine = rec["engine"]
+    result.stages = {k: round(v, 1) for k, v in rec["stages"].items()}
+    result.fetch_bytes = rec["bytes"] or None
+    result.retries = rec["retries"]
+
+
+def _observe_results(results: List["HotelResult"]) -> None:
+    for r in results:
+        METRIC_CHECKS.inc(result="available" if r.available else ("sold_out" if r.available is False else "unknown"))
+        if r.error:
+            METRIC_CHECK_ERRORS.inc(kind=r.error)
+        if r.unchanged:
+            METRIC_CHECKS_UNCHANGED.inc()
+        engine = r.engine or ""
+        if r.elapsed_ms is not None:
+            METRIC_CHECK_SECONDS.observe(r.elapsed_ms / 1000.0, engine=engine)
+        for stage, ms in (r.stages or {}).items():
+            METRIC_STAGE_SECONDS.observe(ms / 1000.0, stage=stage, engine=engine)
+        if r.fetch_bytes:
+            METRIC_FETCH_BYTES.inc(r.fetch_bytes, engine=engine)
+
+
+def _note_notification(channel: str, ok: bool, seconds: float) -> None:
+    METRIC_NOTIFICATIONS.inc(channel=channel, outcome="ok" if ok else "failed")
+    METRIC_NOTIFY_SECONDS.observe(seconds, channel=channel)
+
+
+# ---- Check timing window ----
+# Stages grouped into the columns shown in /status and the UI
+_TIMING_STAGE_GROUPS = {
+    "navigate_ms": ("navigate", "http_fetch"),
+    "ready_ms": ("ready_wait", "payload_capture"),
+    "transfer_ms": ("dom_transfer", "in_page_extract"),
+    "parse_ms": ("parse",),
+    "rate_wait_ms": ("rate_wait",),
+}
+
+
+def _check_timing_record(r: "HotelResult", round_no: int) -> Dict[str, Any]:
+    stages = r.stages or {}
+    rec: Dict[str, Any] = {
+        "round": round_no,
+        "code": r.code,
+        "name": r.name,
+        "start_date": r.start_date,
+        "end_date": r.end_date,
+        "engine": r.engine,
+        "total_ms": r.elapsed_ms,
+        "result": "available" if r.available else ("sold_out" if r.available is False else "unknown"),
+        "error": r.error,
+        "retries": r.retries or 0,
+        "unchanged": bool(r.unchanged),
+    }
+    for col, names in _TIMING_STAGE_GROUPS.items():
+        rec[col] = round(sum(stages.get(n, 0.0) for n in names), 1)
+    return rec
+
+
+def _record_round_timings(round_no: int, results: List["HotelResult"], round_s: float, notify_s: float) -> None:
+    """Keep one timing record per check and one per round; counted from results so render worker processes are included."""
+    checks = [_check_timing_record(r, round_no) for r in results]
+    summary = {
+        "round": round_no,
+        "ts": _now_wall(),
+        "checks": len(checks),
+        "total_ms": round(round_s * 1000.0, 1),
+        # Summed over checks, so with several lanes these can exceed total_ms
+        "fetch_ms": round(sum(c["navigate_ms"] + c["ready_ms"] + c["transfer_ms"] for c in checks), 1),
+        "parse_ms": round(sum(c["parse_ms"] for c in checks), 1),
+        "rate_wait_ms": round(sum(c["rate_wait_ms"] for c in checks), 1),
+        "notify_ms": round(notify_s * 1000.0, 1),
+        "sleep_ms": 0.0,
+    }
+    with _TIMING_LOCK:
+        _CHECK_TIMES.extend(checks)
+        _ROUND_TIMES.append(summary)
+    _bump_version("timings")
+    METRIC_ROUNDS.inc()
+    METRIC_ROUND_SECONDS.observe(round_s)
+
+
+def _note_round_sleep(seconds: float) -> None:
+    """Add a wait between rounds to the latest round record."""
+    _add_stage("sleep", seconds)
+    with _TIMING_LOCK:
+        if _ROUND_TIMES:
+            last = _ROUND_TIMES[-1]
+            last["sleep_ms"] = round(last["sleep_ms"] + seconds * 1000.0, 1)
+
+
+def _timing_stats() -> Dict[str, Any]:
+    with _TIMING_LOCK:
+        checks = list(_CHECK_TIMES)
+        rounds = [dict(x) for x in _ROUND_TIMES]
+
+    by_hotel: Dict[str, List[Dict[str, Any]]] = {}
+    for c in checks:
+        by_hotel.setdefault(c["code"], []).append(c)
+    hotels = []
+    for code, recs in by_hotel.items():
+        totals = sorted(c["total_ms"] for c in recs if c["total_ms"] is not None)
+        n = len(recs)
+        row = {
+            "code": code,
+            "name": next((c["name"] for c in reversed(recs) if c["name"]), None),
+            "checks": n,
+            "p50_ms": _percentile(totals, 0.50),
+            "p95_ms": _percentile(totals, 0.95),
+            "max_ms": totals[-1] if totals else None,
+            "timeouts": sum(1 for c in recs if c["error"] == "timeout"),
+            "errors": sum(1 for c in recs if c["error"]),
+            "retries": sum(c["retries"] for c in recs),
+            "last_result": recs[-1]["result"],
+            "engine": recs[-1]["engine"],
+        }
+        for col in ("navigate_ms", "ready_ms", "transfer_ms", "parse_ms"):
+            row[col] = round(sum(c[col] for c in recs) / n, 1)
+        hotels.append(row)
+    hotels.sort(key=lambda h: (h["p95_ms"] or 0.0, h["p50_ms"] or 0.0), reverse=True)
+
+    round_totals = sorted(x["total_ms"] for x in rounds)
+    split = {}
+    if rounds:
+        for col in ("fetch_ms", "parse_ms", "rate_wait_ms", "notify_ms", "sleep_ms"):
+            split[col] = round(sum(x[col] for x in rounds) / len(rounds), 1)
+    return {
+        "window_checks": len(checks),
+        "slowest_hotels": hotels[:SLOW_HOTELS_SHOWN],
+        "rounds": {
+            "count": len(rounds),
+            "p50_ms": _percentile(round_totals, 0.50),
+            "p95_ms": _percentile(round_totals, 0.95),
+            "max_ms": round_totals[-1] if round_totals else None,
+            "mean_split": split,
+            "last": rounds[-1] if rounds else None,
+        },
+    }
+
+
+def render_metrics() -> str:
+    METRIC_WORKER_RUNNING.set(1 if (_worker_thread is not None and _worker_thread.is_alive()) else 0)
+    limiter = _RATE_LIMITER
+    if limiter is not None:
+        METRIC_RATE_LIMIT.set(limiter.rate)
+    with _CONTENT_CACHE_LOCK:
+        METRIC_CONTENT_CACHE.set(len(_CONTENT_CACHE))
+    out = []
+    for m in _METRICS:
+        out.append(f"# HELP {m.name} {m.help}")
+        out.append(f"# TYPE {m.name} {m.kind}")
+        out.extend(m.lines())
+    return "\n".join(out) + "\n"
+
+
+# ========= Profiling =========
+# On-demand diagnostics for a live tracker; nothing runs until requested.
+# The sampler reads sys._current_frames() from the requesting Flask thread
+# for a bounded time, so it covers the worker, checker lanes and Flask
+# threads of this process (not render worker processes).
+_PROFILE_LOCK = threading.Lock()  # one sampling run at a time
+_TM_LOCK = threading.Lock()
+_TM_STATE: Dict[str, Any] = {"baseline": None, "baseline_at": None, "frames": 0}
+# Allocations made by the diagnostics themselves
+_TM_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def _frame_label(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def sample_stacks(seconds: float, interval: float, thread_filter: str = "") -> Tuple[Dict[str, int], int]:
+    """
+    Sample every other thread's Python stack every `interval` seconds for `seconds`.
+    Returns collapsed stacks ("thread;outer;...;inner" -> samples) and the number of sampling passes.
+    This is wall-clock sampling: threads blocked in a wait are counted where they wait.
+    """
+    me = threading.get_ident()
+    counts: Dict[str, int] = {}
+    passes = 0
+    deadline = _now_mono() + seconds
+    while True:
+        names = {t.ident: t.name for t in threading.enumerate()}
+        frames = sys._current_frames()
+        for ident, frame in frames.items():
+            if ident == me:
+                continue
+            tname = names.get(ident, f"thread-{ident}")
+            if thread_filter and thread_filter not in tname:
+                continue
+            labels = []
+            f = frame
+            while f is not None:
+                labels.append(_frame_label(f.f_code))
+                f = f.f_back
+            labels.append(tname)
+            key = ";".join(reversed(labels))
+            counts[key] = counts.get(key, 0) + 1
+        frames = frame = f = None  # don't keep other threads' frames alive between passes
+        passes += 1
+        remaining = deadline - _now_mono()
+        if remaining <= 0:
+            break
+        time.sleep(min(interval, remaining))
+    return counts, passes
+
+
+def format_collapsed(counts: Dict[str, int]) -> str:
+    """flamegraph.pl / speedscope input: one "stack samples" line per distinct stack."""
+    return "".join(f"{k} {v}\n" for k, v in sorted(counts.items(), key=lambda kv: -kv[1]))
+
+
+def format_top(counts: Dict[str, int], limit: int = 40) -> str:
+    """pstats-like table: samples where a function is the innermost frame (self) or anywhere on the stack (cum)."""
+    total = sum(counts.values()) or 1
+    own: Dict[str, int] = {}
+    cum: Dict[str, int] = {}
+    for stack, n in counts.items():
+        frames = stack.split(";")[1:]  # drop the thread name
+        if not frames:
+            continue
+        own[frames[-1]] = own.get(frames[-1], 0) + n
+        for fn in set(frames):
+            cum[fn] = cum.get(fn, 0) + n
+    rows = sorted(cum, key=lambda fn: (own.get(fn, 0), cum[fn]), reverse=True)[:limit]
+    out = [f"{total} samples", f"{'self':>8} {'self%':>6} {'cum':>8} {'cum%':>6}  function"]
+    for fn in rows:
+        s, c = own.get(fn, 0), cum[fn]
+        out.append(f"{s:>8} {100.0 * s / total:>5.1f}% {c:>8} {100.0 * c / total:>5.1f}%  {fn}")
+    return "\n".join(out) + "\n"
+
+
+def _tm_snapshot() -> "tracemalloc.Snapshot":
+    return tracemalloc.take_snapshot().filter_traces(_TM_FILTERS)
+
+
+def _tm_stat_row(stat) -> Dict[str, Any]:
+    row = {
+        "size_kib": round(stat.size / 1024.0, 1),
+        "count": stat.count,
+        "traceback": [f"{fr.filename}:{fr.lineno}" for fr in stat.traceback],
+    }
+    if hasattr(stat, "size_diff"):
+        row["size_diff_kib"] = round(stat.size_diff / 1024.0, 1)
+        row["count_diff"] = stat.count_diff
+    return row
+
+
+def tracemalloc_start(frames: int) -> Dict[str, Any]:
+    with _TM_LOCK:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+            _TM_STATE.update(baseline=None, baseline_at=None, frames=frames)
+    return tracemalloc_status()
+
+
+def tracemalloc_stop() -> Dict[str, Any]:
+    with _TM_LOCK:
+        tracemalloc.stop()
+        _TM_STATE.update(baseline=None, baseline_at=None, frames=0)
+    return tracemalloc_status()
+
+
+def tracemalloc_status() -> Dict[str, Any]:
+    tracing = tracemalloc.is_tracing()
+    current, peak = tracemalloc.get_traced_memory() if tracing else (0, 0)
+    with _TM_LOCK:
+        return {
+            "tracing": tracing,
+            "frames": _TM_STATE["frames"],
+            "traced_kib": round(current / 1024.0, 1),
+            "peak_kib": round(peak / 1024.0, 1),
+            "baseline_at": _TM_STATE["baseline_at"],
+        }
+
+
+def tracemalloc_snapshot(key: str, limit: int) -> Dict[str, Any]:
+    """Take a snapshot, keep it as the baseline for later diffs, and list its largest call sites."""
+    snap = _tm_snapshot()
+    with _TM_LOCK:
+        _TM_STATE.update(baseline=snap, baseline_at=_now_wall())
+    return {"top": [_tm_stat_row(s) for s in snap.statistics(key)[:limit]], **tracemalloc_status()}
+
+
+def tracemalloc_diff(key: str, limit: int, rebase: bool = False) -> Optional[Dict[str, Any]]:
+    """Call sites that grew most since the baseline; None when no baseline was taken."""
+    with _TM_LOCK:
+        base = _TM_STATE["baseline"]
+    if base is None:
+        return None
+    snap = _tm_snapshot()
+    stats = snap.compare_to(base, key)
+    stats.sort(key=lambda s: s.size_diff, reverse=True)
+    if rebase:
+        with _TM_LOCK:
+            _TM_STATE.update(baseline=snap, baseline_at=_now_wall())
+    return {"growth_kib": round(sum(s.size_diff for s in stats) / 1024.0, 1),
+            "top": [_tm_stat_row(s) for s in stats[:limit]], **tracemalloc_status()}
+
+
+# ========= Rate Limiting =========
+def _clamp_rps(value: Any, default: float = DEFAULT_RATE_LIMIT_RPS) -> float:
+    try:
+        return max(MIN_RATE_LIMIT_RPS, min(MAX_RATE_LIMIT_RPS, float(value)))
+    except (TypeError, ValueError):
+        return default
+
+
+def _clamp_burst(value: Any, default: int = DEFAULT_RATE_LIMIT_BURST) -> int:
+    try:
+        return max(1, min(MAX_RATE_LIMIT_BURST, int(value)))
+    except (TypeError, ValueError):
+        return default
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: `rate` tokens per second, holding at most `burst`.
+    Every page fetch takes one token, so concurrent lanes share one request
+    budget instead of each sleeping a fixed delay.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self._lock = threading.Lock()
+        self.rate = float(rate)
+        self.burst = int(burst)
+        self._tokens = float(burst)
+        self._stamp = _now_mono()
+        self._waiting = 0
+        self._stats = {"acquired": 0, "waited": 0, "wait_total_sec": 0.0, "last_wait_ms": 0.0}
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(float(self.burst), self._tokens + (now - self._stamp) * self.rate)
+        self._stamp = now
+
+    def configure(self, rate: float, burst: int) -> None:
+        with self._lock:
+            self._refill(_now_mono())
+            self.rate = float(rate)
+            self.burst = int(burst)
+            self._tokens = min(self._tokens, float(self.burst))
+
+    def drain(self) -> None:
+        """Drop saved-up tokens so a backoff takes effect immediately."""
+        with self._lock:
+            self._refill(_now_mono())
+            self._tokens = min(self._tokens, 0.0)
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            self._refill(_now_mono())
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                self._stats["acquired"] += 1
+                self._stats["last_wait_ms"] = 0.0
+                return True
+            return False
+
+    def acquire(self, stop: Optional[threading.Event] = None) -> bool:
+        """Block until a token is available. Returns False if `stop` was set first."""
+        t0 = _now_mono()
+        with self._lock:
+            self._waiting += 1
+        try:
+            while True:
+                with self._lock:
+                    now = _now_mono()
+                    self._refill(now)
+                    if self._tokens >= 1.0:
+                        self._tokens -= 1.0
+                        waited = now - t0
+                        self._stats["acquired"] += 1
+                        self._stats["last_wait_ms"] = waited * 1000.0
+                        if waited > 0.001:
+                            self._stats["waited"] += 1
+                            self._stats["wait_total_sec"] += waited
+                        return True
+                    sleep_s = (1.0 - self._tokens) / max(self.rate, 1e-6)
+                if stop is not None:
+                    if stop.wait(timeout=sleep_s):
+                        return False
+                else:
+                    time.sleep(sleep_s)
+        finally:
+            with self._lock:
+                self._waiting -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._refill(_now_mono())
+            out = dict(self._stats)
+            out.update({
+                "rate_rps": round(self.rate, 3),
+                "burst": self.burst,
+                "tokens": round(self._tokens, 2),
+                "fill": round(self._tokens / max(1, self.burst), 3),
+                "waiting": self._waiting,
+                "next_token_in_ms": 0.0 if self._tokens >= 1.0 else round((1.0 - self._tokens) / max(self.rate, 1e-6) * 1000.0, 1),
+            })
+        out["wait_total_sec"] = round(out["wait_total_sec"], 2)
+        out["last_wait_ms"] = round(out["last_wait_ms"], 1)
+        out["avg_wait_ms"] = round(out["wait_total_sec"] * 1000.0 / out["acquired"], 1) if out["acquired"] else 0.0
+        return out
+
+
+def _configure_rate_limiter(cfg: AppConfig) -> "TokenBucket":
+    global _RATE_LIMITER
+    rate = _clamp_rps(getattr(cfg, 'rate_limit_rps', DEFAULT_RATE_LIMIT_RPS))
+    burst = _clamp_burst(getattr(cfg, 'rate_limit_burst', DEFAULT_RATE_LIMIT_BURST))
+    if _RATE_LIMITER is None:
+        _RATE_LIMITER = TokenBucket(rate, burst)
+    else:
+        _RATE_LIMITER.configure(rate, burst)
+    return _RATE_LIMITER
+
+
+def _rate_acquire() -> None:
+    """Take a fetch token from the global bucket (no-op where no limiter is installed)."""
+    limiter = _RATE_LIMITER
+    if limiter is None:
+        return
+    t0 = _now_mono()
+    ok = limiter.acquire(_stop_event)
+    waited = _now_mono() - t0
+    _RATE_WAIT.seconds = getattr(_RATE_WAIT, "seconds", 0.0) + waited
+    _add_stage("rate_wait", waited)
+    if not ok:
+        raise RuntimeError("stopped while waiting for the rate limiter")
+
+
+def _rate_limiter_stats() -> Optional[Dict[str, Any]]:
+    limiter = _RATE_LIMITER
+    return limiter.stats() if limiter is not None else None
+
+
+# ========= Pacing Control (AIMD) =========
+def _classify_error(exc: BaseException) -> str:
+    """Map a failed fetch to timeout | blocked | site_error | error."""
+    if isinstance(exc, requests.HTTPError) and exc.response is not None:
+        return "blocked" if exc.response.status_code in (403, 429) else "site_error"
+    if isinstance(exc, requests.Timeout) or "timeout" in type(exc).__name__.lower() or "timed out" in str(exc).lower():
+        return "timeout"
+    return "error"
+
+
+class AimdController:
+    """
+    Additive-increase / multiplicative-decrease control of request pacing.
+    Every AIMD_WINDOW checks it looks at failures, block pages, timeouts and
+    latency against a healthy baseline: a degraded window halves the token
+    rate and the number of hotels checked at once, a healthy one adds
+    AIMD_RATE_STEP and one lane back, up to the configured values.
+    """
+
+    def __init__(self, cfg: AppConfig, concurrency: int):
+        self.cfg = cfg
+        self._cond = threading.Condition()
+        self.max_concurrency = max(1, int(concurrency))
+        self.limit = self.max_concurrency
+        self.rate = self._ceiling()
+        self._active = 0
+        self._window: List[HotelResult] = []
+        self._baseline_ms: Optional[float] = None
+        self._stats: Dict[str, Any] = {"increases": 0, "decreases": 0, "last_action": None, "last_reason": None}
+
+    def _ceiling(self) -> float:
+        return _clamp_rps(getattr(self.cfg, 'rate_limit_rps', DEFAULT_RATE_LIMIT_RPS))
+
+    @contextmanager
+    def slot(self):
+        """Hold one of the `limit` concurrent check slots."""
+        with self._cond:
+            while self._active >= self.limit and not _stop_event.is_set():
+                self._cond.wait(timeout=0.5)
+            self._active += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._active -= 1
+                self._cond.notify_all()
+
+    def observe(self, r: HotelResult) -> None:
+        with self._cond:
+            self._window.append(r)
+            if len(self._window) < AIMD_WINDOW:
+                return
+            window, self._window = self._window, []
+            self._decide(window)
+            self._cond.notify_all()
+
+    def _decide(self, window: List[HotelResult]) -> None:
+        ceiling = self._ceiling()
+        self.rate = min(self.rate, ceiling)
+        errors = [r.error for r in window if r.error]
+        failed = sum(1 for r in window if r.available is None)
+        lat = sorted(r.elapsed_ms for r in window if r.elapsed_ms is not None and r.available is not None)
+        median = lat[len(lat) // 2] if lat else None
+
+        reason = None
+        if "blocked" in errors:
+            reason = "block page"
+        elif "timeout" in errors:
+            reason = "timeouts"
+        elif failed / len(window) >= AIMD_FAIL_RATIO:
+            reason = f"{failed}/{len(window)} checks failed"
+        elif median is not None and self._baseline_ms is not None and median > self._baseline_ms * AIMD_LATENCY_FACTOR:
+            reason = f"latency {median:.0f}ms vs {self._baseline_ms:.0f}ms baseline"
+
+        if reason is not None:
+            self.rate = max(MIN_RATE_LIMIT_RPS, self.rate * AIMD_DECREASE)
+            self.limit = max(1, int(self.limit * AIMD_DECREASE))
+            self._stats["decreases"] += 1
+            self._stats["last_action"] = "decrease"
+            if _RATE_LIMITER is not None:
+                _RATE_LIMITER.drain()
+            _log(f"[pacing] backing off ({reason}): {self.rate:.2f} req/s, {self.limit} lane(s)", level="warning")
+        else:
+            if median is not None:
+                self._baseline_ms = median if self._baseline_ms is None else (
+                    AIMD_BASELINE_ALPHA * median + (1.0 - AIMD_BASELINE_ALPHA) * self._baseline_ms)
+            if self.rate < ceiling or self.limit < self.max_concurrency:
+                self.rate = min(ceiling, self.rate + AIMD_RATE_STEP)
+                self.limit = min(self.max_concurrency, self.limit + 1)
+                self._stats["increases"] += 1
+                self._stats["last_action"] = "increase"
+        self._stats["last_reason"] = reason
+        if _RATE_LIMITER is not None:
+            _RATE_LIMITER.configure(self.rate, _RATE_LIMITER.burst)
+
+    def retune(self) -> None:
+        """
+        Apply changed rate settings while running: the configured rate is only a
+        ceiling, so a backed-off rate stays where it is until a healthy window.
+        """
+        with self._cond:
+            self.rate = min(self.rate, self._ceiling())
+            if _RATE_LIMITER is not None:
+                burst = _clamp_burst(getattr(self.cfg, 'rate_limit_burst', DEFAULT_RATE_LIMIT_BURST))
+                _RATE_LIMITER.configure(self.rate, burst)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            out = dict(self._stats)
+            out.update({
+                "rate_rps": round(self.rate, 3),
+                "rate_ceiling_rps": round(self._ceiling(), 3),
+                "concurrency": self.limit,
+                "concurrency_max": self.max_concurrency,
+                "active": self._active,
+                "baseline_ms": round(self._baseline_ms, 1) if self._baseline_ms is not None else None,
+            })
+        return out
+
+
+@contextmanager
+def _pacing_slot():
+    ctl = _AIMD
+    if ctl is None:
+        yield
+        return
+    with ctl.slot():
+        yield
+
+
+def _aimd_observe(r: HotelResult) -> None:
+    ctl = _AIMD
+    if ctl is not None:
+        ctl.observe(r)
+
+
+def _aimd_stats() -> Optional[Dict[str, Any]]:
+    ctl = _AIMD
+    return ctl.stats() if ctl is not None else None
+
+
+# ========= Page Classification & Circuit Breaker =========
+def classify_page(rendered: "RenderedPage", offers: List[Dict[str, Any]]) -> str:
+    """
+    Tag a render as ok | no_vacancy | blocked | maintenance | error.
+    Data payloads are trusted as-is; DOM renders without room plans are
+    checked for bot-check, maintenance and error pages before they are
+    taken as "no vacancy".
+    """
+    if offers:
+        return "ok"
+    if rendered.source == "payload":
+        return "no_vacancy"
+    text = rendered.visible_text or ""
+    head = f"{rendered.title} {text[:PAGE_HEAD_CHARS]}".lower()
+    if any(m in head for m in BLOCK_PAGE_MARKERS):
+        return "blocked"
+    if any(m in head for m in MAINTENANCE_PAGE_MARKERS):
+        return "maintenance"
+    state = getattr(rendered, "ready_state", None)
+    if state == "error" or any(m in head for m in ERROR_PAGE_MARKERS):
+        return "error"
+    if state == "no_vacancy" or _NO_VACANCY_RE.search(text[:20000]):
+        return "no_vacancy"
+    if state == "timeout" and not text.strip():
+        return "error"  # never settled and nothing rendered
+    return "no_vacancy"
+
+
+class CircuitBreaker:
+    """
+    closed -> open after CIRCUIT_FAILURE_THRESHOLD bad pages in a row; open
+    pauses fetching for a cool-down that doubles with every trip (capped at
+    CIRCUIT_MAX_COOLDOWN_SEC); then one probe check runs half-open and either
+    closes the breaker or re-opens it.
+    """
+
+    def __init__(self, key: str):
+        self.key = key
+        self._cond = threading.Condition()
+        self.state = "closed"
+        self._failures = 0
+        self._trips = 0
+        self._opened_at = 0.0
+        self._cooldown = 0.0
+        self._probing = False
+        self._stats = {"bad": 0, "good": 0, "opened": 0, "last_reason": None}
+
+    def _remaining(self, now: float) -> float:
+        return max(0.0, self._opened_at + self._cooldown - now)
+
+    def allow(self) -> bool:
+        """Non-blocking: may a check start now? (May claim the half-open probe.)"""
+        with self._cond:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and self._remaining(_now_mono()) <= 0:
+                self.state = "half_open"
+            if self.state == "half_open" and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def wait(self, stop: Optional[threading.Event] = None) -> bool:
+        """Block until a check may start. Returns False if `stop` was set first."""
+        announced = False
+        while not self.allow():
+            with self._cond:
+                remaining = self._remaining(_now_mono()) if self.state == "open" else 0.5
+            if not announced:
+                _set_action(f"[circuit] {self.key} open, resuming in {remaining:.0f}s...")
+                announced = True
+            if stop is not None:
+                if stop.wait(timeout=max(0.2, min(remaining, 5.0))):
+                    return False
+            else:
+                time.sleep(max(0.2, min(remaining, 5.0)))
+        return True
+
+    def record(self, ok: bool, reason: Optional[str] = None) -> None:
+        with self._cond:
+            if ok:
+                self._stats["good"] += 1
+                self._failures = 0
+                if self.state != "closed":
+                    _log(f"[circuit] {self.key} closed again")
+                self.state = "closed"
+                self._trips = 0
+                self._probing = False
+            else:
+                self._stats["bad"] += 1
+                self._stats["last_reason"] = reason
+                self._failures += 1
+                if self.state == "half_open" or self._failures >= CIRCUIT_FAILURE_THRESHOLD:
+                    self._trips += 1
+                    self._cooldown = min(CIRCUIT_MAX_COOLDOWN_SEC, CIRCUIT_BASE_COOLDOWN_SEC * 2 ** (self._trips - 1))
+                    self._opened_at = _now_mono()
+                    self.state = "open"
+                    self._probing = False
+                    self._failures = 0
+                    self._stats["opened"] += 1
+                    _log(f"[circuit] {self.key} open after {reason or 'bad pages'}; pausing {self._cooldown:.0f}s", level="warning")
+            self._cond.notify_all()
+
+    def release(self) -> None:
+        """End a half-open probe without a verdict, letting another check probe."""
+        with self._cond:
+            self._probing = False
+            self._cond.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            out = dict(self._stats)
+            out.update({
+                "key": self.key,
+                "state": self.state,
+                "consecutive_failures": self._failures,
+                "trips": self._trips,
+                "cooldown_sec": round(self._cooldown, 1),
+                "resumes_in_sec": round(self._remaining(_now_mono()), 1) if self.state == "open" else 0.0,
+            })
+        return out
+
+
+def _circuit_key(cfg: AppConfig) -> str:
+    proxy = cfg.proxy_url if (cfg.enable_proxy and cfg.proxy_url) else "direct"
+    return f"{getattr(cfg, 'engine', 'selenium')}|{proxy}"
+
+
+def _circuit_for(cfg: AppConfig) -> Optional[CircuitBreaker]:
+    if not _CIRCUITS_ACTIVE:
+        return None
+    key = _circuit_key(cfg)
+    with _CIRCUITS_LOCK:
+        cb = _CIRCUITS.get(key)
+        if cb is None:
+            cb = _CIRCUITS[key] = CircuitBreaker(key)
+        return cb
+
+
+def _circuit_gate(cfg: AppConfig) -> None:
+    cb = _circuit_for(cfg)
+    if cb is not None and not cb.wait(_stop_event):
+        raise RuntimeError("stopped while the circuit breaker was open")
+
+
+def _circuit_observe(cfg: AppConfig, r: HotelResult) -> None:
+    """Feed one result to the breaker: recognised pages close it, bad pages and site failures count against it."""
+    cb = _circuit_for(cfg)
+    if cb is None:
+        return
+    if r.page_class in ("ok", "no_vacancy"):
+        cb.record(True)
+    elif r.page_class in PAGE_BAD_CLASSES:
+        cb.record(False, f"{r.page_class} page")
+    elif r.page_class is None and r.error in ("blocked", "timeout", "site_error"):
+        cb.record(False, r.error)
+    else:
+        # A local failure (browser crash, stop) says nothing about the site.
+        cb.release()
+
+
+def _circuit_stats() -> List[Dict[str, Any]]:
+    with _CIRCUITS_LOCK:
+        breakers = list(_CIRCUITS.values())
+    return [cb.stats() for cb in breakers]
+
+
 # ========= Selenium/Page Parsing =========
+_CHROMEDRIVER_PATH: Optional[str] = None
+_CHROMEDRIVER_PATH_LOCK = threading.Lock()
+
+
+def _chromedriver_path() -> str:
+    """Resolve chromedriver through webdriver-manager once per process."""
+    global _CHROMEDRIVER_PATH
+    with _CHROMEDRIVER_PATH_LOCK:
+        if _CHROMEDRIVER_PATH is None or not os.path.exists(_CHROMEDRIVER_PATH):
+            _CHROMEDRIVER_PATH = ChromeDriverManager().install()
+        return _CHROMEDRIVER_PATH
+
+
 def build_driver(cfg: AppConfig) -> webdriver.Chrome:
     _log("Launching headless Chrome...")
     _set_action("Launching headless Chrome...")
@@ -371,6 +1789,11 @@ def build_driver(cfg: AppConfig) -> webdriver.Chrome:
     opts.add_argument("--window-size=1280,1600")
     opts.add_argument("--lang=en-US,en;q=0.9")
     opts.add_argument(f"--user-agent={HEADERS['User-Agent']}")
+    policy = _block_policy(cfg)
+    if policy is not None:
+        # Network events in the performance log let us count blocked requests
+        opts.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+        opts.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
     if cfg.enable_proxy and cfg.proxy_url:
         _log(f"Using proxy for Chrome: {cfg.proxy_url}")
         _set_action(f"Using proxy for Chrome: {cfg.proxy_url}")
@@ -379,18 +1802,244 @@ def build_driver(cfg: AppConfig) -> webdriver.Chrome:
         if _HAS_WDM:
             _log("Using webdriver-manager to locate ChromeDriver...")
             _set_action("Using webdriver-manager to locate ChromeDriver...")
-            driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=opts)
+            driver = webdriver.Chrome(service=Service(_chromedriver_path()), options=opts)
         else:
             driver = webdriver.Chrome(options=opts)
     except WebDriverException:
-        _log("[error] Failed to start ChromeDriver. Try: pip install webdriver-manager")
+        _log("[error] Failed to start ChromeDriver. Try: pip install webdriver-manager", level="error")
         raise
     driver.set_page_load_timeout(TIMEOUT)
+    driver._tt_blocking = False
+    if policy is not None:
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": _selenium_blocked_patterns(policy)})
+            driver._tt_blocking = True
+        except Exception as e:
+            _log(f"[block] could not enable URL blocking for Chrome: {e}", level="warning")
     _set_action("ChromeDriver is ready.")
     _log("ChromeDriver is ready.")
     return driver
 
 
+def _driver_rss_mb(driver: webdriver.Chrome) -> Optional[float]:
+    """Resident memory of chromedriver plus its Chrome processes (needs psutil)."""
+    if not _HAS_PSUTIL:
+        return None
+    try:
+        proc = psutil.Process(driver.service.process.pid)
+        total = proc.memory_info().rss
+        for child in proc.children(recursive=True):
+            try:
+                total += child.memory_info().rss
+            except Exception:
+                pass
+        return total / (1024 * 1024)
+    except Exception:
+        return None
+
+
+def _kill_driver(driver: webdriver.Chrome) -> None:
+    """quit() can hang on a wedged Chrome, so quit from a helper thread and kill if needed."""
+    t = threading.Thread(target=lambda: driver.quit(), name="driver-quit", daemon=True)
+    t.start()
+    t.join(timeout=SELENIUM_PROBE_TIMEOUT_SEC)
+    if t.is_alive():
+        try:
+            driver.service.process.kill()
+        except Exception:
+            pass
+
+
+def _probe_driver(driver: webdriver.Chrome) -> bool:
+    """Liveness probe with a hard timeout (WebDriver calls have no short timeout of their own)."""
+    ok = []
+    def _run():
+        try:
+            driver.execute_script("return 1;")
+            ok.append(True)
+        except Exception:
+            pass
+    t = threading.Thread(target=_run, name="driver-probe", daemon=True)
+    t.start()
+    t.join(timeout=SELENIUM_PROBE_TIMEOUT_SEC)
+    return bool(ok)
+
+
+class SeleniumDriverPool:
+    """
+    A fixed number of warm Chrome drivers shared by all checker threads.
+    Each checkout runs a liveness probe; drivers are retired after
+    SELENIUM_RECYCLE_AFTER_LOADS page loads, when their RSS passes
+    SELENIUM_RECYCLE_RSS_MB, or when the probe fails. A background builder
+    thread quits retired drivers and builds replacements, so a check never
+    waits on ChromeDriverManager().install() or a Chrome launch unless the
+    pool is empty.
+    """
+
+    def __init__(self, cfg: AppConfig, size: int):
+        self.cfg = cfg
+        self.size = max(1, int(size))
+        self._cond = threading.Condition()
+        self._idle: List[Dict[str, Any]] = []
+        self._all: List[Dict[str, Any]] = []
+        self._retire: List[Dict[str, Any]] = []
+        self._building = 0
+        self._closed = False
+        self._stats = {"built": 0, "build_failures": 0, "recycled_loads": 0, "recycled_rss": 0,
+                       "probe_failures": 0, "checkouts": 0, "wait_ms_total": 0.0}
+        if not _HAS_PSUTIL:
+            _log("[selenium-pool] psutil is not installed, so drivers are not recycled by memory use "
+                 "(pip install 'toyoko-tracker[memory]')", level="warning")
+        self._builder = threading.Thread(target=self._builder_main, name="selenium-pool-builder", daemon=True)
+        self._builder.start()
+
+    def _need_build(self) -> bool:
+        return (not self._closed) and (len(self._all) + self._building < self.size)
+
+    def _builder_main(self) -> None:
+        while True:
+            with self._cond:
+                while not self._closed and not self._retire and not self._need_build():
+                    self._cond.wait(timeout=1.0)
+                if self._closed:
+                    retire, self._retire = self._retire, []
+                    build = False
+                else:
+                    retire, self._retire = self._retire, []
+                    build = self._need_build()
+                    if build:
+                        self._building += 1
+            for entry in retire:
+                _kill_driver(entry["driver"])
+            if self._closed and not build:
+                return
+            if not build:
+                continue
+            try:
+                with _stage("browser_launch"):
+                    driver = build_driver(self.cfg)
+            except Exception as e:
+                _log(f"[selenium-pool] build failed: {e}", level="error")
+                with self._cond:
+                    self._building -= 1
+                    self._stats["build_failures"] += 1
+                    self._cond.notify_all()
+                _stop_event.wait(timeout=5)
+                continue
+            entry = {"driver": driver, "loads": 0, "created": _now_wall()}
+            with self._cond:
+                self._building -= 1
+                if self._closed:
+                    self._retire.append(entry)
+                else:
+                    self._all.append(entry)
+                    self._idle.append(entry)
+                    self._stats["built"] += 1
+                self._cond.notify_all()
+
+    def _retire_entry(self, entry: Dict[str, Any], reason: str) -> None:
+        with self._cond:
+            if entry in self._all:
+                self._all.remove(entry)
+            if entry in self._idle:
+                self._idle.remove(entry)
+            self._retire.append(entry)
+            if reason in ("recycled_loads", "recycled_rss", "probe_failures"):
+                self._stats[reason] += 1
+            self._cond.notify_all()
+
+    @contextmanager
+    def driver(self, timeout: float = SELENIUM_ACQUIRE_TIMEOUT_SEC):
+        """Check out a live driver for one page load."""
+        t0 = _now_mono()
+        deadline = t0 + timeout
+        while True:
+            with self._cond:
+                while not self._idle:
+                    if self._closed:
+                        raise RuntimeError("Selenium driver pool is closed")
+                    remaining = deadline - _now_mono()
+                    if remaining <= 0:
+                        raise RuntimeError("no Selenium driver available")
+                    self._cond.wait(timeout=min(remaining, 1.0))
+                entry = self._idle.pop()
+            if _probe_driver(entry["driver"]):
+                break
+            _log("[selenium-pool] driver failed liveness probe, rebuilding in background", level="warning")
+            self._retire_entry(entry, "probe_failures")
+        with self._cond:
+            self._stats["checkouts"] += 1
+            self._stats["wait_ms_total"] += (_now_mono() - t0) * 1000.0
+        try:
+            yield entry["driver"]
+        finally:
+            entry["loads"] += 1
+            rss = None
+            if entry["loads"] % 10 == 0:
+                rss = _driver_rss_mb(entry["driver"])
+            if entry["loads"] >= SELENIUM_RECYCLE_AFTER_LOADS:
+                self._retire_entry(entry, "recycled_loads")
+            elif rss is not None and rss > SELENIUM_RECYCLE_RSS_MB:
+                _log(f"[selenium-pool] driver RSS {rss:.0f} MB over limit, recycling", level="warning")
+                self._retire_entry(entry, "recycled_rss")
+            else:
+                with self._cond:
+                    if self._closed or entry not in self._all:
+                        self._retire.append(entry)
+                    else:
+                        self._idle.append(entry)
+                    self._cond.notify_all()
+
+    def close(self) -> None:
+        """Quit every driver, including ones still checked out (aborting their page load)."""
+        with self._cond:
+            self._closed = True
+            self._retire.extend(self._all)
+            self._all = []
+            self._idle = []
+            self._cond.notify_all()
+        self._builder.join(timeout=SELENIUM_PROBE_TIMEOUT_SEC * 4)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            out = dict(self._stats)
+            out.update({
+                "size": self.size,
+                "live": len(self._all),
+                "idle": len(self._idle),
+                "building": self._building,
+                "loads": [e["loads"] for e in self._all],
+                "rss_recycling": _HAS_PSUTIL,
+            })
+        out["wait_ms_total"] = round(out["wait_ms_total"], 1)
+        return out
+
+
+def _get_selenium_pool(cfg: AppConfig) -> SeleniumDriverPool:
+    global _SELENIUM_POOL
+    with _SELENIUM_POOL_LOCK:
+        if _SELENIUM_POOL is None:
+            size = max(int(getattr(cfg, "selenium_pool_size", DEFAULT_SELENIUM_POOL_SIZE) or 1),
+                       int(getattr(cfg, "concurrency", DEFAULT_CONCURRENCY) or 1))
+            _SELENIUM_POOL = SeleniumDriverPool(cfg, size)
+        return _SELENIUM_POOL
+
+
+def _close_selenium_pool() -> None:
+    global _SELENIUM_POOL
+    with _SELENIUM_POOL_LOCK:
+        pool, _SELENIUM_POOL = _SELENIUM_POOL, None
+    if pool is not None:
+        pool.close()
+
+
+def _selenium_pool_stats() -> Optional[Dict[str, Any]]:
+    with _SELENIUM_POOL_LOCK:
+        pool = _SELENIUM_POOL
+    return pool.stats() if pool is not None else None
+
+
 def build_url(cfg: AppConfig, code: str, start: str, end: str) -> str:
     return (
         f"{BASE_URL}?hotel={code}"
@@ -400,100 +2049,846 @@ def build_url(cfg: AppConfig, code: str, start: str, end: str) -> str:
 
 
 class RenderedPage:
-    def __init__(self, soup: BeautifulSoup, visible_text: str):
-        self.soup = soup
+    """
+    A fetched result page. `offers` is set when the room plans were read from
+    a data payload instead of the DOM; `soup` may then be None.
+    Browser renders pass `html` instead of a soup: it is parsed on first use,
+    so an unchanged page (same fingerprint) is never parsed at all.
+    `source` is "payload" (offers from JSON data), "in_page" (offers extracted
+    by a script in the browser) or "dom".
+    """
+    def __init__(self, soup: Optional[BeautifulSoup], visible_text: str,
+                 offers: Optional[Tuple[List[Dict[str, Any]], Dict[str, bool]]] = None,
+                 name: Optional[str] = None, html: Optional[str] = None,
+                 source: Optional[str] = None, title: Optional[str] = None):
+        self._soup = soup
+        self.html = html
         self.visible_text = visible_text
+        self.offers = offers
+        self.name = name
+        self.source = source or ("payload" if offers is not None else "dom")
+        self._title = title
+        self.ready_state: Optional[str] = None
+
+    @property
+    def soup(self) -> Optional[BeautifulSoup]:
+        if self._soup is None and self.html is not None:
+            self._soup = BeautifulSoup(self.html, "html.parser")
+        return self._soup
+
+    @property
+    def title(self) -> str:
+        """Document title, read without building a tree when only the HTML is at hand."""
+        if self._title is not None:
+            return self._title
+        if self._soup is not None:
+            return self._soup.title.get_text(" ", strip=True) if self._soup.title is not None else ""
+        m = _TITLE_RE.search(self.html or "")
+        return " ".join(_html_unescape(m.group(1)).split()) if m else ""
+
+
+_TITLE_RE = re.compile(r"<title[^>]*>(.*?)</title>", re.I | re.S)
+
+
+# ---- Page readiness detection ----
+# Returns a terminal state once it has been seen on two consecutive polls:
+# "offers" (price cards present, count stable), "no_vacancy" or "error"; null while still loading.
+# The sold-out wording is only looked for inside the result list / empty-state message, so a
+# "sold out" plan badge or footer link elsewhere on the page can't end the wait early.
+# A page laid out differently settles as "quiet" once it has been loaded for READY_QUIET_MS
+# without any price card; classify_page() then reads its text like any other render.
+_READY_STATE_JS = r"""() => {
+  const body = document.body;
+  if (!body) return null;
+  let state = null;
+  const n = document.querySelectorAll('span[class*="SearchResultRoomPlanChildCard_value"]').length;
+  if (n > 0) {
+    state = 'offers:' + n;
+  } else if (document.readyState === 'complete') {
+    const head = (document.title || '') + ' ' + (body.innerText || '').slice(0, 400);
+    const empty = Array.from(document.querySelectorAll('__EMPTY_STATE_SEL__'))
+      .map(el => el.innerText || '').join(' ').slice(0, 4000);
+    if (/\b(access denied|forbidden|service unavailable|bad gateway|under maintenance|error\s*(403|404|500|502|503))\b/i.test(head)) {
+      state = 'error';
+    } else if (/no (rooms?|vacanc\w*|availability)|not available|fully booked|sold out/i.test(empty)) {
+      state = 'no_vacancy';
+    } else {
+      if (window.__ttQuietSince === undefined) window.__ttQuietSince = Date.now();
+      if (Date.now() - window.__ttQuietSince >= __QUIET_MS__) state = 'quiet';
+    }
+  }
+  const prev = window.__ttReadyState;
+  window.__ttReadyState = state;
+  if (state === null || state !== prev) return null;
+  return state.startsWith('offers') ? 'offers' : state;
+}""".replace("__QUIET_MS__", str(READY_QUIET_MS)).replace(
+    "__EMPTY_STATE_SEL__", ", ".join(f'[class*="{m}"]' for m in EMPTY_STATE_CLASS_MARKERS))
+
+
+def _record_ready(engine: str, t0: float, state: str) -> None:
+    ms = (_now_mono() - t0) * 1000.0
+    with _READY_LOCK:
+        dq = _READY_TIMINGS.get(engine)
+        if dq is None:
+            dq = _READY_TIMINGS[engine] = deque(maxlen=READY_TIMING_WINDOW)
+        dq.append((ms, state))
+
+
+def _percentile(sorted_vals: List[float], q: float) -> Optional[float]:
+    if not sorted_vals:
+        return None
+    idx = min(len(sorted_vals) - 1, max(0, int(round(q * (len(sorted_vals) - 1)))))
+    return sorted_vals[idx]
+
+
+def _ready_stats() -> Dict[str, Any]:
+    with _READY_LOCK:
+        snap = {k: list(v) for k, v in _READY_TIMINGS.items()}
+    out: Dict[str, Any] = {}
+    for engine, samples in snap.items():
+        vals = sorted(ms for ms, _ in samples)
+        states: Dict[str, int] = {}
+        for _, st in samples:
+            states[st] = states.get(st, 0) + 1
+        out[engine] = {
+            "count": len(vals),
+            "p50_ms": round(_percentile(vals, 0.50) or 0.0, 1),
+            "p95_ms": round(_percentile(vals, 0.95) or 0.0, 1),
+            "states": states,
+        }
+    return out
 
 
-def fetch_rendered_selenium(driver: webdriver.Chrome, url: str) -> RenderedPage:
-    driver.get(url)
+def _wait_ready_selenium(driver: webdriver.Chrome) -> str:
+    try:
+        return WebDriverWait(driver, READY_TIMEOUT_SEC, poll_frequency=READY_POLL_MS / 1000.0).until(
+            lambda d: d.execute_script(f"return ({_READY_STATE_JS})();")
+        )
+    except Exception:
+        return "timeout"
+
 
+def _wait_ready_playwright(page) -> str:
     try:
-        WebDriverWait(driver, 20).until(EC.presence_of_element_located((By.TAG_NAME, "main")))
+        handle = page.wait_for_function(_READY_STATE_JS, polling=READY_POLL_MS, timeout=READY_TIMEOUT_SEC * 1000)
+        return str(handle.json_value())
     except Exception:
-        WebDriverWait(driver, 20).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+        return "timeout"
+
+
+# ---- In-page offer extraction ----
+# Runs extract_offers' selectors inside the page and returns one row per child card:
+# [room_title, plan_name, price_value_text, price_block_text, member_value_text, card_text],
+# the same raw fields the Python extractors hand to _OfferCollector. Texts follow
+# get_text(sep, strip=True): stripped text nodes, empty ones dropped, joined by sep;
+# like get_text, the contents of script/style (and noscript/template) are left out.
+_EXTRACT_OFFERS_JS = r"""() => {
+  const SKIP = new Set(['SCRIPT', 'STYLE', 'NOSCRIPT', 'TEMPLATE']);
+  const visible = {acceptNode: n => (n.parentNode && SKIP.has(n.parentNode.nodeName))
+    ? NodeFilter.FILTER_REJECT : NodeFilter.FILTER_ACCEPT};
+  const txt = (el, sep) => {
+    const out = [];
+    const w = document.createTreeWalker(el, NodeFilter.SHOW_TEXT, visible);
+    for (let n = w.nextNode(); n; n = w.nextNode()) {
+      const s = n.nodeValue.trim();
+      if (s) out.push(s);
+    }
+    return out.join(sep);
+  };
+  const PARENT = 'div[class*="SearchResultRoomPlanParentCard_card"]';
+  const TITLE = '[class*="SearchResultRoomPlanParentCard_title"]';
+  const CHILD = 'div[class*="SearchResultRoomPlanChildCard_card-wrapper"]';
+  const row = (child, roomTitle) => {
+    const plan = child.querySelector('[class*="SearchResultRoomPlanChildCard_title"]');
+    const block = child.querySelector('div[class*="SearchResultRoomPlanChildCard_price"]');
+    const val = block ? block.querySelector('span[class*="SearchResultRoomPlanChildCard_value"]') : null;
+    const mem = child.querySelector('div[class*="SearchResultRoomPlanChildCard_member-section"] span[class*="SearchResultRoomPlanChildCard_value"]');
+    return [roomTitle, plan ? (txt(plan, '') || null) : null, val ? txt(val, '') : null,
+            block && !val ? txt(block, ' ') : null, mem ? txt(mem, '') : null, txt(child, ' ')];
+  };
+  const rows = [];
+  for (const card of document.querySelectorAll(PARENT)) {
+    const t = card.querySelector(TITLE);
+    const roomTitle = t ? txt(t, '') : null;
+    for (const child of card.querySelectorAll(CHILD)) rows.push(row(child, roomTitle));
+  }
+  let last = null;
+  for (const el of document.querySelectorAll(TITLE + ', ' + CHILD)) {
+    if (el.matches(CHILD) && !(el.parentElement && el.parentElement.closest('[class*="SearchResultRoomPlanParentCard_card"]'))) {
+      rows.push(row(el, last ? txt(last, '') : null));
+    }
+    if (el.matches(TITLE)) last = el;
+  }
+  const h = document.querySelector('h1[class*="room_plan_title"]');
+  const titleEl = document.querySelector('title');
+  const name = (h && txt(h, '')) || (titleEl && txt(titleEl, '')) || null;
+  const text = rows.length ? '' : ((document.body && document.body.innerText) || '').slice(0, __TEXT_CHARS__);
+  return {n: name, t: titleEl ? txt(titleEl, ' ') : '', c: rows, x: text};
+}""".replace("__TEXT_CHARS__", str(IN_PAGE_TEXT_CHARS))
+
+
+def offers_from_in_page(rows: List[List[Any]]) -> Tuple[List[Dict[str, Any]], Dict[str, bool]]:
+    """The extract_offers() result from the rows returned by _EXTRACT_OFFERS_JS."""
+    collector = _OfferCollector()
+    for room_title, plan_name, price_value_text, price_block_text, member_value_text, card_text in rows:
+        collector.add(room_title, plan_name, price_value_text, price_block_text,
+                      member_value_text, card_text or "")
+    return collector.result()
+
+
+def _in_page_enabled(cfg: Optional[AppConfig]) -> bool:
+    if cfg is None or not getattr(cfg, "in_page_extract", DEFAULT_IN_PAGE_EXTRACT):
+        return False
+    with _IN_PAGE_LOCK:
+        return not _IN_PAGE_STATS["disabled"]
 
+
+def _render_in_page(evaluate, page_html, cfg: AppConfig) -> Optional[RenderedPage]:
+    """
+    Build the page from an in-browser extraction. Every IN_PAGE_VALIDATE_EVERY-th
+    extraction is checked against the Python extractor on the full DOM; too many
+    disagreements turn in-page extraction off until the tracker restarts.
+    Returns None when the caller should parse the DOM instead.
+    """
     try:
-        WebDriverWait(driver, 5).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, 'span[class*="SearchResultRoomPlanChildCard_value"]'))
-        )
+        with _stage("in_page_extract"):
+            data = evaluate()
+        rows = data["c"]
+        offers = offers_from_in_page(rows)
+        _note_fetch(None, len(json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")))
+    except Exception as e:
+        with _IN_PAGE_LOCK:
+            _IN_PAGE_STATS["errors"] += 1
+        _log(f"[in-page] extraction failed, parsing the DOM instead: {e}", level="warning")
+        return None
+    name = data.get("n") or None
+
+    with _IN_PAGE_LOCK:
+        _IN_PAGE_STATS["extractions"] += 1
+        validate = (_IN_PAGE_STATS["extractions"] - 1) % IN_PAGE_VALIDATE_EVERY == 0
+    if validate:
+        backend = getattr(cfg, "parser_backend", DEFAULT_PARSER_BACKEND)
+        if parse_result_html(page_html(), backend) != (name, offers[0], offers[1]):
+            with _IN_PAGE_LOCK:
+                _IN_PAGE_STATS["validated"] += 1
+                _IN_PAGE_STATS["mismatches"] += 1
+                disable = _IN_PAGE_STATS["mismatches"] >= IN_PAGE_MAX_MISMATCHES and not _IN_PAGE_STATS["disabled"]
+                if disable:
+                    _IN_PAGE_STATS["disabled"] = True
+            _log("[in-page] extraction disagrees with the DOM parser; using the DOM result"
+                 + ("; in-page extraction disabled" if disable else ""), level="warning")
+            return None
+        with _IN_PAGE_LOCK:
+            _IN_PAGE_STATS["validated"] += 1
+
+    visible_text = data.get("x") or " ".join(row[5] or "" for row in rows)
+    return RenderedPage(None, visible_text, offers=offers, name=name, source="in_page",
+                        title=" ".join((data.get("t") or "").split()))
+
+
+def _in_page_stats() -> Dict[str, Any]:
+    with _IN_PAGE_LOCK:
+        return dict(_IN_PAGE_STATS)
+
+
+def fetch_rendered_selenium(driver: webdriver.Chrome, url: str, cfg: Optional[AppConfig] = None) -> RenderedPage:
+    _rate_acquire()
+    _note_fetch("selenium")
+    t0 = _now_mono()
+    with _stage("navigate"):
+        driver.get(url)
+    with _stage("ready_wait"):
+        state = _wait_ready_selenium(driver)
+    _record_ready("selenium", t0, state)
+
+    if _in_page_enabled(cfg):
+        page = _render_in_page(lambda: driver.execute_script(f"return ({_EXTRACT_OFFERS_JS})();"),
+                               lambda: driver.page_source, cfg)
+        if page is not None:
+            if getattr(driver, "_tt_blocking", False):
+                _count_selenium_blocked(driver)
+            page.ready_state = state
+            return page
+
+    with _stage("dom_transfer"):
+        html = driver.page_source
+        visible_text = driver.find_element(By.TAG_NAME, "body").text or ""
+    _note_fetch(None, len(html.encode("utf-8")) + len(visible_text.encode("utf-8")))
+    if getattr(driver, "_tt_blocking", False):
+        _count_selenium_blocked(driver)
+    page = RenderedPage(None, visible_text, html=html)
+    page.ready_state = state
+    return page
+
+
+# ---- Playwright-based renderer ----
+def _playwright_launch_args(cfg: AppConfig) -> List[str]:
+    args = []
+    if cfg.enable_proxy and cfg.proxy_url:
+        # Playwright proxy can also be provided via launch(proxy=...), but args works for http/https too
+        args.append(f"--proxy-server={cfg.proxy_url}")
+    args.append("--lang=en-US,en;q=0.9")
+    args.append("--no-sandbox")
+    args.append("--disable-dev-shm-usage")
+    args.append("--disable-gpu")
+    args.append("--window-size=1280,1600")
+    return args
+
+
+def _route_with_policy(route, policy: Dict[str, Any]) -> None:
+    req = route.request
+    try:
+        rtype = req.resource_type
+        if _should_block(policy, req.url, rtype):
+            _note_blocked(rtype)
+            route.abort()
+            return
+    except Exception:
+        pass
+    try:
+        route.continue_()
     except Exception:
         pass
 
-    time.sleep(1.5)
 
-    soup = BeautifulSoup(driver.page_source, "html.parser")
-    visible_text = driver.find_element(By.TAG_NAME, "body").text or ""
-    return RenderedPage(soup, visible_text)
+class PlaywrightPool:
+    """
+    Long-lived Chromium owned by one checker thread.
+    Hands out a warm context/page per check, recycles the context after
+    `max_navigations` page loads or after a failed check, and relaunches the
+    browser if it disconnects. Playwright's sync API is thread-bound, so each
+    thread gets its own pool (see _get_playwright_pool).
+    """
+
+    def __init__(self, cfg: AppConfig, max_navigations: int = PLAYWRIGHT_POOL_MAX_NAVIGATIONS):
+        self.proxy_key = cfg.proxy_url if (cfg.enable_proxy and cfg.proxy_url) else ""
+        self.max_navigations = max(1, int(max_navigations))
+        self.thread_name = threading.current_thread().name
+        self._pw = None
+        self._browser = None
+        self._context = None
+        self._page = None
+        self._navigations = 0
+        self._lock = threading.Lock()
+        self._stats = {
+            "browser_launches": 0,
+            "contexts_created": 0,
+            "recycles": 0,
+            "crashes": 0,
+            "navigations": 0,
+            "in_use": False,
+            "captures": 0,
+            "capture_misses": 0,
+        }
+        self.capture_miss_streak = 0
+        self.capture_skip_left = 0
+
+    def _ensure_browser(self, cfg: AppConfig) -> None:
+        if self._browser is not None:
+            try:
+                if self._browser.is_connected():
+                    return
+            except Exception:
+                pass
+            _log("[pool] Chromium disconnected, relaunching...", level="warning")
+            self._drop_context()
+            self._browser = None
+        if self._pw is None:
+            self._pw = sync_playwright().start()
+        _set_action("[pool] Launching Chromium...")
+        with _stage("browser_launch"):
+            self._browser = self._pw.chromium.launch(headless=True, args=_playwright_launch_args(cfg))
+        with self._lock:
+            self._stats["browser_launches"] += 1
+        _log(f"[pool] Chromium launched ({self.thread_name})")
+
+    def _ensure_page(self, cfg: AppConfig):
+        self._ensure_browser(cfg)
+        if self._context is None:
+            self._context = self._browser.new_context(
+                user_agent=HEADERS.get("User-Agent", None),
+                viewport={"width": 1280, "height": 1600},
+            )
+            policy = _block_policy(cfg)
+            if policy is not None:
+                self._context.route("**/*", lambda route: _route_with_policy(route, policy))
+            self._page = self._context.new_page()
+            self._navigations = 0
+            with self._lock:
+                self._stats["contexts_created"] += 1
+        return self._page
+
+    def _drop_context(self) -> None:
+        ctx = self._context
+        self._context = None
+        self._page = None
+        self._navigations = 0
+        if ctx is not None:
+            try:
+                ctx.close()
+            except Exception:
+                pass
+
+    @contextmanager
+    def page(self, cfg: AppConfig):
+        """Yield a warm page for a single check."""
+        page = self._ensure_page(cfg)
+        with self._lock:
+            self._stats["in_use"] = True
+        ok = False
+        try:
+            yield page
+            ok = True
+        finally:
+            self._navigations += 1
+            with self._lock:
+                self._stats["navigations"] += 1
+                self._stats["in_use"] = False
+                if not ok:
+                    self._stats["crashes"] += 1
+                    self._stats["recycles"] += 1
+                elif self._navigations >= self.max_navigations:
+                    self._stats["recycles"] += 1
+            if (not ok) or self._navigations >= self.max_navigations:
+                self._drop_context()
+
+    def close(self) -> None:
+        self._drop_context()
+        if self._browser is not None:
+            try:
+                self._browser.close()
+            except Exception:
+                pass
+            self._browser = None
+        if self._pw is not None:
+            try:
+                self._pw.stop()
+            except Exception:
+                pass
+            self._pw = None
+
+    def note_capture(self, hit: bool) -> None:
+        with self._lock:
+            self._stats["captures" if hit else "capture_misses"] += 1
+        if hit:
+            self.capture_miss_streak = 0
+            return
+        self.capture_miss_streak += 1
+        if self.capture_miss_streak >= PLAYWRIGHT_CAPTURE_MAX_MISSES:
+            _log(f"[pool] no room-plan response captured {self.capture_miss_streak}x, using DOM parsing for a while", level="warning")
+            self.capture_miss_streak = 0
+            self.capture_skip_left = PLAYWRIGHT_CAPTURE_BACKOFF_CHECKS
+
+    def should_capture(self, cfg: AppConfig) -> bool:
+        if not getattr(cfg, "playwright_capture", False):
+            return False
+        if self.capture_skip_left > 0:
+            self.capture_skip_left -= 1
+            return False
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            out = dict(self._stats)
+        out["thread"] = self.thread_name
+        out["context_navigations"] = self._navigations
+        out["max_navigations"] = self.max_navigations
+        out["browser_alive"] = self._browser is not None
+        return out
+
+
+def _get_playwright_pool(cfg: AppConfig) -> PlaywrightPool:
+    """Return the calling thread's pool, (re)creating it if missing or the proxy changed."""
+    pool = getattr(_PW_LOCAL, "pool", None)
+    proxy_key = cfg.proxy_url if (cfg.enable_proxy and cfg.proxy_url) else ""
+    if pool is not None and pool.proxy_key != proxy_key:
+        _close_thread_playwright_pool()
+        pool = None
+    if pool is None:
+        pool = PlaywrightPool(cfg)
+        _PW_LOCAL.pool = pool
+        with _PW_POOLS_LOCK:
+            _PW_POOLS.append(pool)
+    return pool
+
+
+def _close_thread_playwright_pool() -> None:
+    """Close the calling thread's pool (must run on the thread that created it)."""
+    pool = getattr(_PW_LOCAL, "pool", None)
+    if pool is None:
+        return
+    _PW_LOCAL.pool = None
+    with _PW_POOLS_LOCK:
+        try:
+            _PW_POOLS.remove(pool)
+        except ValueError:
+            pass
+    pool.close()
+
+
+def _playwright_pool_stats() -> List[Dict[str, Any]]:
+    with _PW_POOLS_LOCK:
+        pools = list(_PW_POOLS)
+    return [p.stats() for p in pools]
+
+
+_HOTEL_NAME_JS = """() => {
+  const h = document.querySelector('h1[class*="room_plan_title"]');
+  const t = h ? h.innerText.trim() : '';
+  return t || (document.title || '').trim() || null;
+}"""
+
+
+def _is_json_data_response(resp) -> bool:
+    """True for XHR/fetch JSON responses from the room-plan API (PLAYWRIGHT_CAPTURE_URL_RE)."""
+    try:
+        if resp.request.resource_type not in ("xhr", "fetch"):
+            return False
+        if not PLAYWRIGHT_CAPTURE_URL_RE.search(resp.url or ""):
+            return False
+        return "json" in (resp.headers.get("content-type") or "").lower()
+    except Exception:
+        return False
+
+
+def _capture_room_plan_payload(page, seen: List[Any], timeout_ms: int):
+    """
+    Wait for the room-plan API response (see _is_json_data_response).
+    `seen` is filled by a page.on("response") listener installed before navigation,
+    so responses that arrived during goto() are not missed.
+    Returns the offers tuple, or None on timeout.
+    """
+    deadline = _now_mono() + timeout_ms / 1000.0
+    checked = 0
+    while True:
+        while checked < len(seen):
+            resp = seen[checked]
+            checked += 1
+            try:
+                if resp.status >= 400:
+                    continue
+                parsed = offers_from_payload(resp.json())
+            except Exception:
+                continue
+            if parsed is not None:
+                return parsed
+        remaining_ms = int((deadline - _now_mono()) * 1000)
+        if remaining_ms <= 0:
+            return None
+        try:
+            page.wait_for_event("response", predicate=_is_json_data_response, timeout=remaining_ms)
+        except Exception:
+            return None
 
 
-# ---- Playwright-based renderer ----
 def fetch_rendered_playwright(cfg: AppConfig, url: str) -> RenderedPage:
     """
     Use Playwright (Chromium) to render without needing ChromeDriver.
     This runs headless and returns BeautifulSoup + visible body text, similar to Selenium path.
+    The browser comes from the calling thread's PlaywrightPool and stays warm between checks.
+    With cfg.playwright_capture the offers are built from the room-plan JSON response
+    as soon as it arrives; DOM parsing remains the fallback.
     """
     if not _HAS_PLAYWRIGHT:
         raise RuntimeError("Playwright is not available")
-    # Launch with optional proxy and custom UA
-    def _launch_args():
-        args = []
-        if cfg.enable_proxy and cfg.proxy_url:
-            # Playwright proxy can also be provided via launch(proxy=...), but args works for http/https too
-            args.append(f"--proxy-server={cfg.proxy_url}")
-        args.append("--lang=en-US,en;q=0.9")
-        args.append("--no-sandbox")
-        args.append("--disable-dev-shm-usage")
-        args.append("--disable-gpu")
-        args.append("--window-size=1280,1600")
-        return args
-
-    with sync_playwright() as pw:
-        browser = pw.chromium.launch(headless=True, args=_launch_args())
-        context = browser.new_context(user_agent=HEADERS.get("User-Agent", None), viewport={"width":1280, "height":1600})
-        page = context.new_page()
-        page.goto(url, wait_until="domcontentloaded", timeout=TIMEOUT * 1000)
-        # Wait for either main or body, then for possible price value span (best-effort)
-        try:
-            page.wait_for_selector("main", timeout=5000)
-        except Exception:
+
+    _rate_acquire()
+    _note_fetch("playwright")
+    pool = _get_playwright_pool(cfg)
+    with pool.page(cfg) as page:
+        t0 = _now_mono()
+        if pool.should_capture(cfg):
+            seen: List[Any] = []
+
+            def _on_response(resp):
+                if _is_json_data_response(resp):
+                    seen.append(resp)
+
+            page.on("response", _on_response)
+            try:
+                with _stage("navigate"):
+                    page.goto(url, wait_until="commit", timeout=TIMEOUT * 1000)
+                with _stage("payload_capture"):
+                    captured = _capture_room_plan_payload(page, seen, PLAYWRIGHT_CAPTURE_TIMEOUT_MS)
+            finally:
+                page.remove_listener("response", _on_response)
+            pool.note_capture(captured is not None)
+            if captured is not None:
+                _record_ready("playwright", t0, "payload")
+                # The navigation only committed; the heading exists once the DOM is parsed.
+                try:
+                    page.wait_for_load_state("domcontentloaded", timeout=PLAYWRIGHT_NAME_WAIT_MS)
+                    name = page.evaluate(_HOTEL_NAME_JS)
+                except Exception:
+                    name = None
+                rendered = RenderedPage(None, "", offers=captured, name=name)
+                rendered.ready_state = "payload"
+                return rendered
+            # Not captured: the navigation is already underway, continue with DOM parsing.
             try:
-                page.wait_for_selector("body", timeout=5000)
+                page.wait_for_load_state("domcontentloaded", timeout=TIMEOUT * 1000)
             except Exception:
                 pass
+        else:
+            with _stage("navigate"):
+                page.goto(url, wait_until="domcontentloaded", timeout=TIMEOUT * 1000)
+        with _stage("ready_wait"):
+            state = _wait_ready_playwright(page)
+        _record_ready("playwright", t0, state)
+        if _in_page_enabled(cfg):
+            rendered = _render_in_page(lambda: page.evaluate(_EXTRACT_OFFERS_JS), page.content, cfg)
+            if rendered is not None:
+                rendered.ready_state = state
+                return rendered
+        with _stage("dom_transfer"):
+            html = page.content()
+            try:
+                body_text = page.locator("body").inner_text()
+            except Exception:
+                body_text = ""
+        _note_fetch(None, len(html.encode("utf-8")) + len(body_text.encode("utf-8")))
+    rendered = RenderedPage(None, body_text, html=html)
+    rendered.ready_state = state
+    return rendered
+
+
+# ---- Browserless HTTP engine ----
+# Key names tried when reading room plans out of the page's hydration payload.
+_PAYLOAD_PLAN_LIST_KEYS = ("plans", "roomPlans", "planList", "ratePlans", "childPlans", "plan_list")
+_PAYLOAD_ROOM_NAME_KEYS = ("roomTypeName", "roomName", "roomTitle", "roomType", "room_name", "name", "title")
+_PAYLOAD_PLAN_NAME_KEYS = ("planName", "plan_name", "name", "title")
+_PAYLOAD_PRICE_KEYS = ("price", "normalPrice", "generalPrice", "nonMemberPrice", "totalPrice", "basePrice", "amount")
+_PAYLOAD_MEMBER_PRICE_KEYS = ("memberPrice", "membersPrice", "clubCardPrice", "clubPrice", "memberTotalPrice")
+_PAYLOAD_REMAINING_KEYS = ("remainingRooms", "remainingRoomCount", "remaining", "restRoom", "vacancyCount", "stock")
+_NEXT_DATA_RE = re.compile(r'<script[^>]+id="__NEXT_DATA__"[^>]*>(.*?)</script>', re.S)
+
+_HTTP_SESSION: Optional[requests.Session] = None
+_HTTP_SESSION_LOCK = threading.Lock()
+_HTTP_STATS = {"hits": 0, "fallbacks": 0, "errors": 0}
+_HTTP_STATS_LOCK = threading.Lock()
+
+
+def _http_session() -> requests.Session:
+    """Shared keep-alive session; the adapter pool is sized for MAX_CONCURRENCY lanes."""
+    global _HTTP_SESSION
+    with _HTTP_SESSION_LOCK:
+        if _HTTP_SESSION is None:
+            sess = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=max(4, MAX_CONCURRENCY * 2))
+            sess.mount("https://", adapter)
+            sess.mount("http://", adapter)
+            sess.headers.update(HEADERS)
+            sess.headers["Accept-Language"] = "en-US,en;q=0.9"
+            _HTTP_SESSION = sess
+        return _HTTP_SESSION
+
+
+def _http_stat(key: str) -> None:
+    with _HTTP_STATS_LOCK:
+        _HTTP_STATS[key] = _HTTP_STATS.get(key, 0) + 1
+
+
+def _http_stats() -> Dict[str, int]:
+    with _HTTP_STATS_LOCK:
+        return dict(_HTTP_STATS)
+
+
+def _first_value(d: Dict[str, Any], keys: Tuple[str, ...]) -> Any:
+    for k in keys:
+        v = d.get(k)
+        if v not in (None, ""):
+            return v
+    return None
+
+
+def _payload_price(v: Any) -> Optional[int]:
+    if isinstance(v, bool):
+        return None
+    if isinstance(v, (int, float)):
+        return int(v)
+    if isinstance(v, str):
+        return _parse_price_int(v) or (int(v.replace(",", "")) if v.replace(",", "").isdigit() else None)
+    if isinstance(v, dict):
+        return _payload_price(_first_value(v, ("value", "amount", "price", "total")))
+    return None
+
+
+def _payload_remaining_text(v: Any) -> Optional[str]:
+    if isinstance(v, bool) or v is None:
+        return None
+    try:
+        n = int(v)
+    except Exception:
+        return str(v) if isinstance(v, str) and v.strip() else None
+    if n <= 0:
+        return None
+    if n >= 10:
+        return "Reserve"
+    return f"Only {n} Room{'s' if n != 1 else ''} Left"
+
+
+def _is_plan_list(plans: Any) -> bool:
+    """
+    A list counts as room plans only when every entry is an object carrying a
+    price or remaining-rooms field; other lists that happen to use a plan key
+    (membership plans, campaign plans, ...) are walked past.
+    """
+    if not isinstance(plans, list) or not plans:
+        return False
+    fields = _PAYLOAD_PRICE_KEYS + _PAYLOAD_MEMBER_PRICE_KEYS + _PAYLOAD_REMAINING_KEYS
+    return all(isinstance(p, dict) and _first_value(p, fields) is not None for p in plans)
+
+
+def offers_from_payload(payload: Any) -> Optional[Tuple[List[Dict[str, Any]], Dict[str, bool]]]:
+    """
+    Build the extract_offers() result from a JSON payload (hydration data or an API response).
+    Returns None when no room-plan list is recognised (see _is_plan_list), so
+    callers can fall back to the DOM. An empty list is never taken as "sold out".
+    """
+    found_plan_list = False
+    offers: List[Dict[str, Any]] = []
+    stats = {"had_any_offer": False, "had_any_non_ignored_offer": False, "had_any_ignored_offer": False}
+
+    def _walk(node: Any, room_title: Optional[str]) -> None:
+        nonlocal found_plan_list
+        if isinstance(node, list):
+            for x in node:
+                _walk(x, room_title)
+            return
+        if not isinstance(node, dict):
+            return
+        for key in _PAYLOAD_PLAN_LIST_KEYS:
+            plans = node.get(key)
+            if not _is_plan_list(plans):
+                continue
+            found_plan_list = True
+            title = _first_value(node, _PAYLOAD_ROOM_NAME_KEYS)
+            title = str(title) if isinstance(title, (str, int)) else room_title
+            for plan in plans:
+                _add_plan(plan, title)
+            return
+        for v in node.values():
+            if isinstance(v, (dict, list)):
+                _walk(v, room_title)
+
+    def _add_plan(plan: Dict[str, Any], room_title: Optional[str]) -> None:
+        price_val = _payload_price(_first_value(plan, _PAYLOAD_PRICE_KEYS))
+        member_val = _payload_price(_first_value(plan, _PAYLOAD_MEMBER_PRICE_KEYS))
+        plan_name = _first_value(plan, _PAYLOAD_PLAN_NAME_KEYS)
+        remaining_text = _payload_remaining_text(_first_value(plan, _PAYLOAD_REMAINING_KEYS))
+        has_price = price_val is not None
+        if has_price:
+            stats["had_any_offer"] = True
+        if _is_ignored_room(room_title):
+            if has_price:
+                stats["had_any_ignored_offer"] = True
+            return
+        if has_price:
+            stats["had_any_non_ignored_offer"] = True
+        offers.append({
+            "room_title": room_title,
+            "plan_name": str(plan_name) if plan_name is not None else None,
+            "price_text": f"¥{price_val:,}" if has_price else None,
+            "price_val": price_val,
+            "member_price_text": f"¥{member_val:,}" if member_val is not None else None,
+            "remaining_text": remaining_text,
+            "remaining_norm": parse_remaining(remaining_text) if remaining_text else None,
+        })
+
+    _walk(payload, None)
+    if not found_plan_list:
+        return None
+    return offers, stats
+
+
+def fetch_rendered_http(cfg: AppConfig, url: str) -> Optional[RenderedPage]:
+    """
+    Fetch the result page without a browser. Uses server-rendered room plan
+    cards when present, otherwise the __NEXT_DATA__ hydration payload.
+    A page with neither that states it is sold out in its result list /
+    empty-state message is returned without offers; anything else returns
+    None so a browser engine renders it.
+    The page text is kept either way so the text check still sees it.
+    """
+    proxies = None
+    if cfg.enable_proxy and cfg.proxy_url:
+        proxies = {"http": cfg.proxy_url, "https": cfg.proxy_url}
+    _rate_acquire()
+    _note_fetch("http")
+    with _stage("http_fetch"):
+        resp = _http_session().get(url, timeout=TIMEOUT, proxies=proxies)
+        resp.raise_for_status()
+        html = resp.text
+    _note_fetch(None, len(resp.content))
+
+    if "SearchResultRoomPlanChildCard_" in html:
+        with _stage("parse"):
+            soup = BeautifulSoup(html, "html.parser")
+            body = soup.body or soup
+            text = body.get_text(" ", strip=True)
+        return RenderedPage(soup, text)
+
+    m = _NEXT_DATA_RE.search(html)
+    if m:
         try:
-            page.wait_for_selector('span[class*="SearchResultRoomPlanChildCard_value"]', timeout=5000)
-        except Exception:
-            pass
-        # Small settle
-        try:
-            page.wait_for_timeout(1200)
-        except Exception:
-            pass
-        html = page.content()
-        try:
-            body_text = page.locator("body").inner_text()
+            parsed = offers_from_payload(json.loads(m.group(1)))
         except Exception:
-            body_text = ""
-        try:
-            context.close()
-        finally:
-            browser.close()
-    soup = BeautifulSoup(html, "html.parser")
-    return RenderedPage(soup, body_text)
+            parsed = None
+        if parsed is not None:
+            with _stage("parse"):
+                soup = BeautifulSoup(html, "html.parser")
+                name = extract_hotel_name(soup)
+                body = soup.body or soup
+                text = body.get_text(" ", strip=True)
+            return RenderedPage(None, text, offers=parsed, name=name)
+
+    if any(marker in html for marker in EMPTY_STATE_CLASS_MARKERS):
+        with _stage("parse"):
+            soup = BeautifulSoup(html, "html.parser")
+            empty_text = _empty_state_text(soup)
+        if _NO_VACANCY_RE.search(empty_text):
+            body = soup.body or soup
+            return RenderedPage(soup, body.get_text(" ", strip=True))
+    return None
+
+
+def _empty_state_text(soup: BeautifulSoup) -> str:
+    """Text of the result list / empty-state message elements (EMPTY_STATE_CLASS_MARKERS)."""
+    els = soup.find_all(class_=lambda c: bool(c) and any(m in c for m in EMPTY_STATE_CLASS_MARKERS))
+    return " ".join(el.get_text(" ", strip=True) for el in els)
 
 
 def fetch_rendered_any(cfg: AppConfig, driver: Optional[webdriver.Chrome], url: str) -> RenderedPage:
     """
-    Dispatch to Playwright or Selenium based on cfg.engine.
+    Dispatch to the HTTP engine, Playwright or Selenium based on cfg.engine.
+    The HTTP engine falls back to a browser engine when it can't read room plans.
     """
     eng = getattr(cfg, "engine", "selenium")
+    if eng == "http":
+        try:
+            page = fetch_rendered_http(cfg, url)
+        except requests.HTTPError as e:
+            _http_stat("errors")
+            if _classify_error(e) == "blocked":
+                raise  # a browser would be refused too; let pacing back off instead
+            _log(f"[http] fetch failed, falling back to browser: {e}", level="warning")
+            page = None
+        except Exception as e:
+            _http_stat("errors")
+            _log(f"[http] fetch failed, falling back to browser: {e}", level="warning")
+            page = None
+        if page is not None:
+            _http_stat("hits")
+            return page
+        _http_stat("fallbacks")
+        eng = "playwright" if _HAS_PLAYWRIGHT else "selenium"
     if eng == "playwright" and _HAS_PLAYWRIGHT:
         return fetch_rendered_playwright(cfg, url)
     # default to selenium
     if driver is None:
-        raise RuntimeError("Selenium driver is None")
-    return fetch_rendered_selenium(driver, url)
+        with _get_selenium_pool(cfg).driver() as pooled:
+            return fetch_rendered_selenium(pooled, url, cfg)
+    return fetch_rendered_selenium(driver, url, cfg)
 
 
 def extract_hotel_name(soup: BeautifulSoup) -> Optional[str]:
@@ -505,10 +2900,17 @@ def extract_hotel_name(soup: BeautifulSoup) -> Optional[str]:
     return None
 
 
+_PRICE_VAL_RE = re.compile(r"¥\s*([\d,]+)")
+_PRICE_RE = re.compile(r"¥\s*[\d,]+")
+_MEMBER_PRICE_RE = re.compile(r"Club\s*Card\s*Member\s*Price\s*(¥\s*[\d,]+)", re.I)
+_ROOMS_LEFT_RE = re.compile(r"Only\s+\d+\s+Rooms?\s+Left", re.I)
+_RESERVE_RE = re.compile(r"\bReserve\b", re.I)
+
+
 def _parse_price_int(text: str) -> Optional[int]:
     if not text:
         return None
-    m = re.search(r"¥\s*([\d,]+)", text)
+    m = _PRICE_VAL_RE.search(text)
     if not m:
         return None
     try:
@@ -544,80 +2946,65 @@ def _is_ignored_room(title: Optional[str]) -> bool:
     return ("heartful" in t) or ("accessible" in t)
 
 
-def extract_offers(soup: BeautifulSoup) -> Tuple[List[Dict[str, Any]], Dict[str, bool]]:
+class _OfferCollector:
     """
-    Extract All Sub-Cards（offer）：
-      room_title, plan_name, price_text(Non-Member)、price_val、member_price_text、remaining_text/remaining_norm
+    Turns the raw fields of one child card into an offer and keeps the
+    had_any_* stats. Shared by every parser backend so they can only differ
+    in how they find the fields, not in how the fields are interpreted.
     """
-    offers: List[Dict[str, Any]] = []
-    had_any_offer = False                 # any offer with a numeric price
-    had_any_non_ignored_offer = False     # any non-ignored offer with price
-    had_any_ignored_offer = False         # any ignored (heartful/accessible) offer with price
 
-    def _extract_one_child(child, room_title):
-        plan_name = None
-        plan_el = child.select_one('[class*="SearchResultRoomPlanChildCard_title"]')
-        if plan_el:
-            plan_name = plan_el.get_text(strip=True) or None
+    def __init__(self):
+        self.offers: List[Dict[str, Any]] = []
+        self.had_any_offer = False                 # any offer with a numeric price
+        self.had_any_non_ignored_offer = False     # any non-ignored offer with price
+        self.had_any_ignored_offer = False         # any ignored (heartful/accessible) offer with price
 
+    def add(self, room_title: Optional[str], plan_name: Optional[str],
+            price_value_text: Optional[str], price_block_text: Optional[str],
+            member_value_text: Optional[str], child_text: str) -> None:
+        """
+        price_value_text / member_value_text: text of the price value spans (None when absent);
+        price_block_text: text of the price block (None when absent); child_text: whole card text.
+        """
         price_text = None
         price_val: Optional[int] = None
-        member_price_text = None
-
-        # Non-Member Price
-        price_block = child.select_one('div[class*="SearchResultRoomPlanChildCard_price"]')
-        if price_block:
-            val_el = price_block.select_one('span[class*="SearchResultRoomPlanChildCard_value"]')
-            if val_el:
-                price_text = val_el.get_text(strip=True)
+        if price_value_text is not None:
+            price_text = price_value_text
+            price_val = _parse_price_int(price_text)
+        elif price_block_text is not None:
+            m = _PRICE_RE.search(price_block_text)
+            if m:
+                price_text = m.group(0)
                 price_val = _parse_price_int(price_text)
-            else:
-                m = re.search(r"¥\s*[\d,]+", price_block.get_text(" ", strip=True))
-                if m:
-                    price_text = m.group(0)
-                    price_val = _parse_price_int(price_text)
 
-        # Member Price
-        mem_el = child.select_one(
-            'div[class*="SearchResultRoomPlanChildCard_member-section"] '
-            'span[class*="SearchResultRoomPlanChildCard_value"]'
-        )
-        if mem_el:
-            member_price_text = mem_el.get_text(strip=True)
+        member_price_text = member_value_text
         if not member_price_text:
-            txt = child.get_text(" ", strip=True)
-            m = re.search(r"Club\s*Card\s*Member\s*Price\s*(¥\s*[\d,]+)", txt, re.I)
+            m = _MEMBER_PRICE_RE.search(child_text)
             if m:
                 member_price_text = m.group(1).strip()
 
-        # Rooms Left
         remaining_text = None
-        block_text = child.get_text(" ", strip=True)
-        m = re.search(r"Only\s+\d+\s+Rooms?\s+Left", block_text, re.I)
+        m = _ROOMS_LEFT_RE.search(child_text)
         if m:
             remaining_text = m.group(0)
-        elif re.search(r"\bReserve\b", block_text, re.I):
+        elif _RESERVE_RE.search(child_text):
             remaining_text = "Reserve"
 
-        # Determine if this child represents a priced offer
         has_price = (price_val is not None)
         if has_price:
-            nonlocal had_any_offer
-            had_any_offer = True
+            self.had_any_offer = True
 
         # Ignore special accessibility rooms for the main offer list,
         # but record that such priced offers existed.
         if _is_ignored_room(room_title):
             if has_price:
-                nonlocal had_any_ignored_offer
-                had_any_ignored_offer = True
+                self.had_any_ignored_offer = True
             return
 
         if has_price:
-            nonlocal had_any_non_ignored_offer
-            had_any_non_ignored_offer = True
+            self.had_any_non_ignored_offer = True
 
-        offers.append({
+        self.offers.append({
             "room_title": room_title,
             "plan_name": plan_name,
             "price_text": price_text,
@@ -627,31 +3014,254 @@ def extract_offers(soup: BeautifulSoup) -> Tuple[List[Dict[str, Any]], Dict[str,
             "remaining_norm": parse_remaining(remaining_text) if remaining_text else None,
         })
 
-    # Ordinary Parent/Child Structure
-    for room_card in soup.select('div[class*="SearchResultRoomPlanParentCard_card"]'):
-        room_title = None
-        title_el = room_card.select_one('[class*="SearchResultRoomPlanParentCard_title"]')
-        if title_el:
-            room_title = title_el.get_text(strip=True)
-        for child in room_card.select('div[class*="SearchResultRoomPlanChildCard_card-wrapper"]'):
-            _extract_one_child(child, room_title)
-
-    for child in soup.select('div[class*="SearchResultRoomPlanChildCard_card-wrapper"]'):
-        anc = child.find_parent(attrs={"class": re.compile("SearchResultRoomPlanParentCard_card")})
-        if anc:
+    def result(self) -> Tuple[List[Dict[str, Any]], Dict[str, bool]]:
+        return self.offers, {
+            "had_any_offer": self.had_any_offer,
+            "had_any_non_ignored_offer": self.had_any_non_ignored_offer,
+            "had_any_ignored_offer": self.had_any_ignored_offer,
+        }
+
+
+# Class-name fragments the offer extractor keys on (CSS-module classes carry a hash suffix).
+_CLS_PREFIX = "SearchResultRoomPlan"
+_CLS_PARENT_CARD = "SearchResultRoomPlanParentCard_card"
+_CLS_PARENT_TITLE = "SearchResultRoomPlanParentCard_title"
+_CLS_CHILD_CARD = "SearchResultRoomPlanChildCard_card-wrapper"
+_CLS_CHILD_TITLE = "SearchResultRoomPlanChildCard_title"
+_CLS_CHILD_PRICE = "SearchResultRoomPlanChildCard_price"
+_CLS_CHILD_VALUE = "SearchResultRoomPlanChildCard_value"
+_CLS_CHILD_MEMBER = "SearchResultRoomPlanChildCard_member-section"
+
+# Exit actions of an open element during the extract_offers walk
+_EXIT_CARD, _EXIT_IN_CARD, _EXIT_MEMBER, _EXIT_CHILD = 1, 2, 4, 8
+
+
+class _ChildCardScan:
+    """First matching descendants of one child card, filled in while the walk is inside it."""
+    __slots__ = ("tag", "plan_el", "price_block", "price_open", "value_el", "member_el")
+
+    def __init__(self, tag):
+        self.tag = tag
+        self.plan_el = None
+        self.price_block = None
+        self.price_open = False
+        self.value_el = None
+        self.member_el = None
+
+    def add_to(self, collector: "_OfferCollector", room_title: Optional[str]) -> None:
+        plan_name = (self.plan_el.get_text(strip=True) or None) if self.plan_el is not None else None
+        price_value_text = None
+        price_block_text = None
+        if self.price_block is not None:
+            if self.value_el is not None:
+                price_value_text = self.value_el.get_text(strip=True)
+            else:
+                price_block_text = self.price_block.get_text(" ", strip=True)
+        member_value_text = self.member_el.get_text(strip=True) if self.member_el is not None else None
+        collector.add(room_title, plan_name, price_value_text, price_block_text,
+                      member_value_text, self.tag.get_text(" ", strip=True))
+
+
+def extract_offers(soup: BeautifulSoup) -> Tuple[List[Dict[str, Any]], Dict[str, bool]]:
+    """
+    Extract All Sub-Cards（offer）：
+      room_title, plan_name, price_text(Non-Member)、price_val、member_price_text、remaining_text/remaining_norm
+
+    One depth-first walk over the tree. Output order: the child cards of every
+    parent card (cards in document order, nested ones included), titled with
+    the card's first room title; then child cards outside any parent card,
+    titled with the closest preceding room title.
+    """
+    cards: List[List[Any]] = []        # [room title element, [child scans]] per parent card
+    open_cards: List[List[Any]] = []
+    open_children: List[_ChildCardScan] = []
+    orphans: List[Tuple[_ChildCardScan, Any]] = []
+    last_title = None
+    in_card = 0                         # open elements of any tag with a parent-card class
+    in_member = 0                       # open member-section divs
+
+    stack = [(iter(soup.contents), 0, None)]
+    while stack:
+        it, exits, price_of = stack[-1]
+        node = next(it, None)
+        if node is None:
+            stack.pop()
+            if exits & _EXIT_CARD:
+                open_cards.pop()
+            if exits & _EXIT_IN_CARD:
+                in_card -= 1
+            if exits & _EXIT_MEMBER:
+                in_member -= 1
+            if exits & _EXIT_CHILD:
+                open_children.pop()
+            if price_of:
+                for scan in price_of:
+                    scan.price_open = False
             continue
-        room_title = None
-        title_parent = child.find_previous(attrs={"class": re.compile("SearchResultRoomPlanParentCard_title")})
-        if title_parent:
-            room_title = title_parent.get_text(strip=True)
-        _extract_one_child(child, room_title)
-
-    stats = {
-        "had_any_offer": had_any_offer,
-        "had_any_non_ignored_offer": had_any_non_ignored_offer,
-        "had_any_ignored_offer": had_any_ignored_offer,
-    }
-    return offers, stats
+        if not isinstance(node, Tag):
+            continue
+        cls = node.attrs.get("class")
+        if cls and not isinstance(cls, str):
+            cls = " ".join(cls)
+        if not cls or _CLS_PREFIX not in cls:
+            if node.contents:
+                stack.append((iter(node.contents), 0, None))
+            continue
+
+        name = node.name
+        exits = 0
+        price_of = None
+        # As a descendant of the open child cards / parent cards (select_one skips the element itself)
+        for scan in open_children:
+            if scan.plan_el is None and _CLS_CHILD_TITLE in cls:
+                scan.plan_el = node
+            if name == "div" and scan.price_block is None and _CLS_CHILD_PRICE in cls:
+                scan.price_block = node
+                scan.price_open = True
+                price_of = (price_of or []) + [scan]
+            if name == "span" and _CLS_CHILD_VALUE in cls:
+                if scan.price_open and scan.value_el is None:
+                    scan.value_el = node
+                if in_member and scan.member_el is None:
+                    scan.member_el = node
+        if _CLS_PARENT_TITLE in cls:
+            for card in open_cards:
+                if card[0] is None:
+                    card[0] = node
+        # As a card itself
+        if name == "div" and _CLS_CHILD_CARD in cls:
+            scan = _ChildCardScan(node)
+            for card in open_cards:
+                card[1].append(scan)
+            if not in_card:
+                orphans.append((scan, last_title))
+            open_children.append(scan)
+            exits |= _EXIT_CHILD
+        if _CLS_PARENT_CARD in cls:
+            in_card += 1
+            exits |= _EXIT_IN_CARD
+            if name == "div":
+                card = [None, []]
+                cards.append(card)
+                open_cards.append(card)
+                exits |= _EXIT_CARD
+        if name == "div" and _CLS_CHILD_MEMBER in cls:
+            in_member += 1
+            exits |= _EXIT_MEMBER
+        if _CLS_PARENT_TITLE in cls:
+            last_title = node
+        stack.append((iter(node.contents), exits, price_of))
+
+    collector = _OfferCollector()
+    for title_el, scans in cards:
+        room_title = title_el.get_text(strip=True) if title_el is not None else None
+        for scan in scans:
+            scan.add_to(collector, room_title)
+    for scan, title_el in orphans:
+        scan.add_to(collector, title_el.get_text(strip=True) if title_el is not None else None)
+    return collector.result()
+
+
+# ---- Parser backends ----
+# "html.parser" is the reference; "lxml" swaps in a C tree builder under the same
+# BeautifulSoup code; "selectolax" (lexbor) walks the same selectors natively.
+def _resolve_parser_backend(name: Optional[str]) -> str:
+    name = (name or DEFAULT_PARSER_BACKEND).lower()
+    if name == "selectolax" and _HAS_SELECTOLAX:
+        return "selectolax"
+    if name == "lxml" and _HAS_LXML:
+        return "lxml"
+    if name == "auto":
+        if _HAS_SELECTOLAX:
+            return "selectolax"
+        if _HAS_LXML:
+            return "lxml"
+    return "html.parser"
+
+
+def _lexbor_text(node, sep: str = "") -> str:
+    """BeautifulSoup's get_text(sep, strip=True): stripped text nodes, empty ones dropped."""
+    parts = node.text(deep=True, separator="\x00", strip=True).split("\x00")
+    return sep.join(p for p in parts if p)
+
+
+def _lexbor_first(node, selector: str):
+    """select_one() semantics: descendants only (lexbor also matches the node itself)."""
+    for el in node.css(selector):
+        if el != node:
+            return el
+    return None
+
+
+def _extract_selectolax(html: str) -> Tuple[Optional[str], List[Dict[str, Any]], Dict[str, bool]]:
+    tree = LexborHTMLParser(html)
+    # BeautifulSoup's get_text() leaves out script and style contents; lexbor's text() doesn't
+    tree.strip_tags(["script", "style"])
+    name = None
+    tag = tree.css_first('h1[class*="room_plan_title"]')
+    if tag is not None and _lexbor_text(tag):
+        name = _lexbor_text(tag)
+    elif tree.css_first("title") is not None and _lexbor_text(tree.css_first("title")):
+        name = _lexbor_text(tree.css_first("title"))
+
+    collector = _OfferCollector()
+
+    def _one_child(child, room_title):
+        plan_el = _lexbor_first(child, '[class*="SearchResultRoomPlanChildCard_title"]')
+        plan_name = (_lexbor_text(plan_el) or None) if plan_el is not None else None
+        price_value_text = None
+        price_block_text = None
+        price_block = _lexbor_first(child, 'div[class*="SearchResultRoomPlanChildCard_price"]')
+        if price_block is not None:
+            val_el = _lexbor_first(price_block, 'span[class*="SearchResultRoomPlanChildCard_value"]')
+            if val_el is not None:
+                price_value_text = _lexbor_text(val_el)
+            else:
+                price_block_text = _lexbor_text(price_block, " ")
+        mem_el = _lexbor_first(
+            child,
+            'div[class*="SearchResultRoomPlanChildCard_member-section"] '
+            'span[class*="SearchResultRoomPlanChildCard_value"]'
+        )
+        member_value_text = _lexbor_text(mem_el) if mem_el is not None else None
+        collector.add(room_title, plan_name, price_value_text, price_block_text,
+                      member_value_text, _lexbor_text(child, " "))
+
+    child_sel = 'div[class*="SearchResultRoomPlanChildCard_card-wrapper"]'
+    for room_card in tree.css('div[class*="SearchResultRoomPlanParentCard_card"]'):
+        title_el = _lexbor_first(room_card, '[class*="SearchResultRoomPlanParentCard_title"]')
+        room_title = _lexbor_text(title_el) if title_el is not None else None
+        for child in room_card.css(child_sel):
+            if child != room_card:
+                _one_child(child, room_title)
+
+    # Children outside any parent card take the closest preceding room title (document order).
+    last_title = None
+    for el in tree.css(f'[class*="SearchResultRoomPlanParentCard_title"], {child_sel}'):
+        cls = el.attributes.get("class") or ""
+        if "SearchResultRoomPlanChildCard_card-wrapper" not in cls or el.tag != "div":
+            last_title = el
+            continue
+        anc = el.parent
+        while anc is not None and "SearchResultRoomPlanParentCard_card" not in (anc.attributes.get("class") or ""):
+            anc = anc.parent
+        if anc is None:
+            _one_child(el, _lexbor_text(last_title) if last_title is not None else None)
+        if "SearchResultRoomPlanParentCard_title" in cls:
+            last_title = el
+
+    offers, stats = collector.result()
+    return name, offers, stats
+
+
+def parse_result_html(html: str, backend: str = DEFAULT_PARSER_BACKEND) -> Tuple[Optional[str], List[Dict[str, Any]], Dict[str, bool]]:
+    """Hotel name, offers and offer stats of a result page using the given parser backend."""
+    backend = _resolve_parser_backend(backend)
+    if backend == "selectolax":
+        return _extract_selectolax(html)
+    soup = BeautifulSoup(html, "lxml" if backend == "lxml" else "html.parser")
+    offers, stats = extract_offers(soup)
+    return extract_hotel_name(soup), offers, stats
 
 
 def detect_price_available(visible_text: str) -> bool:
@@ -663,16 +3273,112 @@ def detect_price_available(visible_text: str) -> bool:
     return False
 
 
+# ---- Content fingerprints (skip re-parsing unchanged pages) ----
+def page_fingerprint(rendered: RenderedPage) -> str:
+    """
+    Hash of what the result depends on: the captured payload when there is one,
+    otherwise the rendered text of the page (markup, scripts and nonces excluded)
+    plus the readiness state.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    if rendered.offers is not None:
+        h.update(json.dumps([rendered.name, rendered.offers], sort_keys=True, default=str).encode("utf-8"))
+    else:
+        h.update((rendered.ready_state or "").encode("utf-8"))
+        h.update(b"\0")
+        h.update((rendered.visible_text or "").encode("utf-8"))
+    return h.hexdigest()
+
+
+def _content_key(cfg: AppConfig, url: str) -> str:
+    """(hotel, dates, query): the URL plus the filters applied after parsing."""
+    rr = getattr(cfg, 'room_requirement', getattr(cfg, 'om_requirement', 'any')) or 'any'
+    budget = getattr(cfg, 'budget_limit', DEFAULT_BUDGET_LIMIT) if getattr(cfg, 'budget_enabled', False) else None
+    return f"{url}|{rr}|{budget}"
+
+
+def _content_cache_get(key: str, fingerprint: str) -> Optional[HotelResult]:
+    with _CONTENT_CACHE_LOCK:
+        hit = _CONTENT_CACHE.get(key)
+        if hit is None or hit[0] != fingerprint:
+            return None
+        _CONTENT_CACHE.move_to_end(key)
+        return replace(hit[1], unchanged=True, elapsed_ms=None)
+
+
+def _content_cache_put(key: str, fingerprint: str, result: HotelResult) -> None:
+    with _CONTENT_CACHE_LOCK:
+        _CONTENT_CACHE[key] = (fingerprint, result)
+        _CONTENT_CACHE.move_to_end(key)
+        while len(_CONTENT_CACHE) > CONTENT_CACHE_MAX:
+            _CONTENT_CACHE.popitem(last=False)
+
+
+def _note_content_round(results: List[HotelResult]) -> None:
+    """Per-round hit ratio, counted from the results so render worker processes are included."""
+    hits = sum(1 for r in results if r.unchanged)
+    with _CONTENT_STATS_LOCK:
+        _CONTENT_STATS["hits"] += hits
+        _CONTENT_STATS["checks"] += len(results)
+        _CONTENT_STATS["last_round"] = {
+            "hits": hits,
+            "checks": len(results),
+            "hit_ratio": round(hits / len(results), 3) if results else None,
+        }
+
+
+def _content_stats() -> Dict[str, Any]:
+    with _CONTENT_STATS_LOCK:
+        out = deepcopy(_CONTENT_STATS)
+    out["hit_ratio"] = round(out["hits"] / out["checks"], 3) if out["checks"] else None
+    with _CONTENT_CACHE_LOCK:
+        out["entries"] = len(_CONTENT_CACHE)
+    return out
+
+
 def check_hotel(cfg: AppConfig, driver: Optional[webdriver.Chrome], code: str, start: str, end: str) -> HotelResult:
     url = build_url(cfg, code, start, end)
     try:
         rendered = fetch_rendered_any(cfg, driver, url)
-    except Exception:
-        return HotelResult(code=code, url=url, name=None, available=None)
-
-    name = extract_hotel_name(rendered.soup)
-
-    offers, offer_stats = extract_offers(rendered.soup)
+    except Exception as e:
+        return HotelResult(code=code, url=url, name=None, available=None, start_date=start, end_date=end,
+                           error=_classify_error(e))
+
+    content_key = _content_key(cfg, url)
+    fingerprint = page_fingerprint(rendered)
+    cached = _content_cache_get(content_key, fingerprint)
+    if cached is not None:
+        return cached
+
+    result = result_from_page(cfg, code, url, start, end, rendered)
+    if getattr(cfg, "record_dir", ""):
+        _record_page(cfg, rendered, result, fingerprint)
+    if result.error is None:
+        # Only settled, recognised pages are worth reusing
+        _content_cache_put(content_key, fingerprint, result)
+    return result
+
+
+def result_from_page(cfg: AppConfig, code: str, url: str, start: str, end: str, rendered: RenderedPage) -> HotelResult:
+    """Parse, classify and filter one fetched page into a HotelResult (no fetching, no caching)."""
+    if rendered.offers is not None:
+        name = rendered.name
+        offers, offer_stats = rendered.offers
+    elif rendered.html is not None:
+        with _stage("parse"):
+            name, offers, offer_stats = parse_result_html(rendered.html, getattr(cfg, "parser_backend", DEFAULT_PARSER_BACKEND))
+    else:
+        with _stage("parse"):
+            name = extract_hotel_name(rendered.soup)
+            offers, offer_stats = extract_offers(rendered.soup)
+    page_class = classify_page(rendered, offers)
+    if page_class in PAGE_BAD_CLASSES:
+        # Not a room-plan page: don't guess availability from its text
+        return HotelResult(code=code, url=url, name=name, available=None, start_date=start, end_date=end,
+                           error="blocked" if page_class == "blocked" else "site_error", page_class=page_class)
+    # The readiness detector saw the site's error banner: keep the result, flag it for pacing.
+    # A readiness timeout on a page that did render is not held against the site.
+    fetch_error = "site_error" if getattr(rendered, "ready_state", None) == "error" else None
     # ---- Room requirement filtering (single/double/twin) ----
     rr = getattr(cfg, 'room_requirement', getattr(cfg, 'om_requirement', 'any')) or 'any'
     rr = rr.lower()
@@ -775,7 +3481,7 @@ def check_hotel(cfg: AppConfig, driver: Optional[webdriver.Chrome], code: str, s
         min_member_price_text = None
         min_remaining = None
 
-    return HotelResult(
+    result = HotelResult(
         code=code,
         url=url,
         name=name,
@@ -788,7 +3494,60 @@ def check_hotel(cfg: AppConfig, driver: Optional[webdriver.Chrome], code: str, s
         min_remaining=min_remaining,
         requirement_unmet=requirement_unmet,
         offers_display=offers_display,
+        start_date=start,
+        end_date=end,
+        error=fetch_error,
+        page_class=page_class,
     )
+    return result
+
+
+# ---- Page recording (fixtures for `python -m toyoko_tracker.bench`) ----
+def _record_page(cfg: AppConfig, rendered: RenderedPage, result: HotelResult, fingerprint: str) -> None:
+    """
+    Save a parsed page to cfg.record_dir as <code>_<start>_<end>_<fp>.html plus a .json
+    with the URL params, visible text and what it parsed to. Pages rendered to the
+    same fingerprint are saved once. Payload and in-page renders carry no markup and
+    are skipped.
+    """
+    if rendered.html is not None:
+        html = rendered.html
+    elif rendered.source == "dom" and rendered.soup is not None:
+        html = str(rendered.soup)
+    else:
+        return
+    base = os.path.join(cfg.record_dir, f"{result.code}_{result.start_date}_{result.end_date}_{fingerprint[:10]}")
+    if os.path.exists(base + ".json"):
+        return
+    try:
+        name, offers, offer_stats = parse_result_html(html, "html.parser")
+        meta = {
+            "url": result.url,
+            "code": result.code,
+            "start_date": result.start_date,
+            "end_date": result.end_date,
+            "params": {f: getattr(cfg, f, None) for f in RECORD_PARAM_FIELDS},
+            "ready_state": rendered.ready_state,
+            "visible_text": rendered.visible_text,
+            "recorded_at": datetime.now().isoformat(timespec="seconds"),
+            "expected": {"name": name, "offers": offers, "stats": offer_stats},
+            "result": recorded_result_fields(result),
+        }
+        os.makedirs(cfg.record_dir, exist_ok=True)
+        with open(base + ".html", "w", encoding="utf-8") as f:
+            f.write(html)
+        with open(base + ".json", "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False, indent=1)
+    except Exception as e:
+        _log(f"[record] failed to save {base}: {e}", level="warning")
+
+
+def recorded_result_fields(result: HotelResult) -> Dict[str, Any]:
+    """The HotelResult fields a replay must reproduce (timing and cache flags excluded)."""
+    out = asdict(result)
+    for k in ("elapsed_ms", "unchanged", "engine", "stages", "fetch_bytes", "retries"):
+        out.pop(k, None)
+    return out
 
 
 # ========= Notification（Telegram/Local/Mail）=========
@@ -799,6 +3558,8 @@ def _tg_enabled(cfg: AppConfig) -> bool:
 def notify_telegram(cfg: AppConfig, message: str) -> None:
     if not _tg_enabled(cfg):
         return
+    t0 = _now_mono()
+    ok = False
     try:
         _set_action("[tg] sending message...")
         url = f"https://api.telegram.org/bot{cfg.bot_token}/sendMessage"
@@ -822,16 +3583,19 @@ def notify_telegram(cfg: AppConfig, message: str) -> None:
             _log("[tg] sent OK")
         else:
             _set_action(f"[tg] failed: {err or 'unknown error'}")
-            _log(f"[tg] failed: {err or 'unknown error'}")
+            _log(f"[tg] failed: {err or 'unknown error'}", level="error")
     except Exception as e:
         _set_action(f"[tg] exception: {e}")
-        _log(f"[tg] exception: {e}")
+        _log(f"[tg] exception: {e}", level="error")
+    _note_notification("telegram", ok, _now_mono() - t0)
 
 
 def notify_local(cfg: AppConfig, title: str, body: str) -> None:
     if not getattr(cfg, "enable_local", False):
         _log("[local] skipped: enable_local = False")
         return
+    t0 = _now_mono()
+    ok = False
     try:
         _set_action("[local] notifying...")
         # Windows consoles/toasters may not render emoji properly — sanitize to ASCII
@@ -859,7 +3623,7 @@ def notify_local(cfg: AppConfig, title: str, body: str) -> None:
                     sent = True
                     _log("[local] terminal-notifier invoked")
                 except Exception as _tn_e:
-                    _log(f"[local] terminal-notifier failed: {_tn_e}")
+                    _log(f"[local] terminal-notifier failed: {_tn_e}", level="warning")
             if not sent:
                 script = f'display notification {json.dumps(body)} with title {json.dumps(title)}'
                 try:
@@ -867,7 +3631,7 @@ def notify_local(cfg: AppConfig, title: str, body: str) -> None:
                                      stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
                     _log("[local] osascript notification invoked")
                 except Exception as _e2:
-                    _log(f"[local] osascript failed: {_e2}")
+                    _log(f"[local] osascript failed: {_e2}", level="warning")
         elif os.name == "nt":
             # Non-blocking Windows balloon tip via PowerShell + NotifyIcon (no user confirmation required)
             try:
@@ -892,16 +3656,18 @@ def notify_local(cfg: AppConfig, title: str, body: str) -> None:
                 )
                 _log("[local] powershell NotifyIcon balloon shown (non-blocking)")
             except Exception as _e_win_balloon:
-                _log(f"[local] NotifyIcon balloon failed: {_e_win_balloon}")
+                _log(f"[local] NotifyIcon balloon failed: {_e_win_balloon}", level="warning")
         else:
             try:
                 subprocess.Popen(["notify-send", title, body],
                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
                 _log("[local] notify-send invoked")
             except Exception as _e4:
-                _log(f"[local] notify-send failed: {_e4}")
+                _log(f"[local] notify-send failed: {_e4}", level="warning")
+        ok = True
     except Exception as e:
-        _log(f"[local] exception: {e}")
+        _log(f"[local] exception: {e}", level="error")
+    _note_notification("local", ok, _now_mono() - t0)
 
 
 def _email_enabled(cfg: AppConfig) -> bool:
@@ -912,6 +3678,7 @@ def _send_email_now(cfg_snapshot: Dict[str, Any], subject: str, body: str) -> No
     低层“立即发送”函数：使用配置快照（dict）防止并发修改。
     逻辑与旧版同步发送一致。
     """
+    t0 = _now_mono()
     try:
         host = cfg_snapshot.get("smtp_host") or ""
         port = int(cfg_snapshot.get("smtp_port") or 0)
@@ -922,7 +3689,7 @@ def _send_email_now(cfg_snapshot: Dict[str, Any], subject: str, body: str) -> No
         email_to = cfg_snapshot.get("email_to") or ""
 
         if not (host and email_from and email_to and port):
-            _log("[mail] skipped: incomplete SMTP configuration")
+            _log("[mail] skipped: incomplete SMTP configuration", level="warning")
             return
 
         msg = EmailMessage()
@@ -953,8 +3720,10 @@ def _send_email_now(cfg_snapshot: Dict[str, Any], subject: str, body: str) -> No
             server.close()
 
         _log("[mail] sent OK (worker)")
+        _note_notification("email", True, _now_mono() - t0)
     except Exception as e:
-        _log(f"[mail] exception (worker): {e}")
+        _log(f"[mail] exception (worker): {e}", level="error")
+        _note_notification("email", False, _now_mono() - t0)
 
 
 def _ensure_mail_worker_started() -> None:
@@ -995,25 +3764,26 @@ def notify_email(cfg: AppConfig, subject: str, body: str) -> None:
         _log("[mail] queued")
     except Exception as e:
         _set_action(f"[mail] queue exception: {e}")
-        _log(f"[mail] queue exception: {e}")
+        _log(f"[mail] queue exception: {e}", level="error")
 
 
 def _send_start_notifications(cfg: AppConfig) -> None:
     try:
         codes = ", ".join(cfg.hotel_codes) if cfg.hotel_codes else "(none)"
+        ranges = _watch_ranges(cfg)
         summary_lines = [
             "🟢 Tracking started",
-            f"Dates: {cfg.start_date} → {cfg.end_date}",
+            f"Dates ({len(ranges)}): {_format_ranges(ranges)}",
             f"People: {cfg.people} | Rooms: {cfg.rooms} | Smoking: {cfg.smoking}",
             f"Hotels ({len(cfg.hotel_codes)}): {codes}",
         ]
         msg = "\n".join(summary_lines)
         notify_telegram(cfg, msg)
         notify_email(cfg, "🟢 Tracking started", msg)
-        notify_local(cfg, "🟢 Tracking started", f"{cfg.start_date} → {cfg.end_date}\n{codes}")
+        notify_local(cfg, "🟢 Tracking started", f"{_format_ranges(ranges)}\n{codes}")
         _log("[start] start notifications sent (tg/email/local where enabled)")
     except Exception as e:
-        _log(f"[start] start notifications error: {e}")
+        _log(f"[start] start notifications error: {e}", level="warning")
 
 
 def _format_offer_lines_for_push(r: HotelResult) -> List[str]:
@@ -1047,10 +3817,15 @@ def _format_offer_lines_for_push(r: HotelResult) -> List[str]:
         lines.append(f"• {room} | {price} | Left: {left}")
     return lines
 
-def process_notifications(cfg: AppConfig, results: List[HotelResult], start_date: str, end_date: str) -> None:
+def process_notifications(cfg: AppConfig, results: List[HotelResult], default_start: str, default_end: str) -> None:
     for r in results:
         if getattr(r, "requirement_unmet", False):
             continue
+        if r.unchanged and not r.available:
+            continue  # same page as last time and nothing to remind about
+        # Alert state is per (hotel, stay)
+        start_date = r.start_date or default_start
+        end_date = r.end_date or default_end
         key = f"{r.code}|{start_date}|{end_date}"
         st = _ALERT_STATE.get(key, {"available": False, "sent": 0, "last": 0.0})
         was_available = bool(st.get("available", False))
@@ -1119,9 +3894,420 @@ def process_notifications(cfg: AppConfig, results: List[HotelResult], start_date
         _ALERT_STATE[key] = st
 
 
+# ========= Adaptive Polling =========
+def _poll_key(code: str, start: str, end: str) -> str:
+    return f"{code}|{start}|{end}"
+
+
+def _poll_bounds(cfg: AppConfig) -> Tuple[float, float]:
+    lo = float(max(5, int(getattr(cfg, 'poll_min_interval_sec', DEFAULT_POLL_MIN_INTERVAL_SEC) or 5)))
+    hi = float(max(lo, int(getattr(cfg, 'poll_max_interval_sec', DEFAULT_POLL_MAX_INTERVAL_SEC) or lo)))
+    return lo, hi
+
+
+def _poll_interval(lo: float, hi: float, score: float) -> float:
+    # Quadratic in (1 - score): a pair needs a sustained quiet streak to drift to the max.
+    return lo + (hi - lo) * (1.0 - score) ** 2
+
+
+def _poll_reset_schedule() -> None:
+    """Make every known pair due now (learned change scores are kept)."""
+    with _POLL_LOCK:
+        for st in _POLL_STATE.values():
+            st["next_due"] = 0.0
+
+
+def _poll_prune(tasks: List[Tuple[str, str, str]]) -> None:
+    """Forget pairs that are no longer watched (hotel or dates changed)."""
+    keep = {_poll_key(*t) for t in tasks}
+    with _POLL_LOCK:
+        for key in [k for k in _POLL_STATE if k not in keep]:
+            del _POLL_STATE[key]
+
+
+def _poll_due(tasks: List[Tuple[str, str, str]]) -> List[Tuple[str, str, str]]:
+    now = _now_mono()
+    with _POLL_LOCK:
+        return [t for t in tasks if _POLL_STATE.get(_poll_key(*t), {}).get("next_due", 0.0) <= now]
+
+
+def _poll_next_wait(cfg: AppConfig, tasks: List[Tuple[str, str, str]]) -> float:
+    """Seconds until the earliest pair is due again, clamped to [1, max interval]."""
+    lo, hi = _poll_bounds(cfg)
+    now = _now_mono()
+    with _POLL_LOCK:
+        dues = [_POLL_STATE.get(_poll_key(*t), {}).get("next_due", 0.0) for t in tasks]
+    if not dues:
+        return hi
+    return max(1.0, min(hi, min(dues) - now))
+
+
+def _poll_observe(cfg: AppConfig, r: HotelResult) -> None:
+    """
+    Fold one result into its pair's change score and schedule the next poll.
+    A change is an availability flip or a different `min_remaining`; failed
+    checks (available=None) keep the current interval.
+    """
+    lo, hi = _poll_bounds(cfg)
+    key = _poll_key(r.code, r.start_date or cfg.start_date, r.end_date or cfg.end_date)
+    now = _now_mono()
+    with _POLL_LOCK:
+        st = _POLL_STATE.get(key)
+        if st is None:
+            st = {"score": POLL_INITIAL_SCORE, "polls": 0, "changes": 0, "available": None,
+                  "remaining": None, "result": None}
+            _POLL_STATE[key] = st
+        st["polls"] += 1
+        st["result"] = r
+        if r.available is not None:
+            changed = st["available"] is not None and (
+                bool(r.available) != st["available"] or (r.min_remaining or None) != st["remaining"]
+            )
+            if changed:
+                st["changes"] += 1
+            st["score"] = POLL_CHANGE_ALPHA * (1.0 if changed else 0.0) + (1.0 - POLL_CHANGE_ALPHA) * st["score"]
+            st["available"] = bool(r.available)
+            st["remaining"] = r.min_remaining or None
+        st["interval"] = _poll_interval(lo, hi, st["score"])
+        st["next_due"] = now + st["interval"]
+
+
+def _poll_latest(tasks: List[Tuple[str, str, str]]) -> List[HotelResult]:
+    """Most recent result of every watched pair, in task order."""
+    with _POLL_LOCK:
+        out = [_POLL_STATE.get(_poll_key(*t), {}).get("result") for t in tasks]
+    return [r for r in out if r is not None]
+
+
+def _poll_stats() -> List[Dict[str, Any]]:
+    now = _now_mono()
+    with _POLL_LOCK:
+        items = list(_POLL_STATE.items())
+    out = []
+    for key, st in items:
+        if "interval" not in st:
+            continue
+        out.append({
+            "key": key,
+            "change_score": round(st["score"], 3),
+            "interval_sec": round(st["interval"], 1),
+            "next_in_sec": round(max(0.0, st["next_due"] - now), 1),
+            "polls": st["polls"],
+            "changes": st["changes"],
+        })
+    out.sort(key=lambda x: x["interval_sec"])
+    return out
+
+
 # ========= Worker Loop =========
+def _close_thread_resources() -> None:
+    """Release the browser owned by the calling checker thread."""
+    _close_thread_playwright_pool()
+
+
+def _check_one(cfg: AppConfig, code: str, start: str, end: str) -> HotelResult:
+    _set_action(f"[search] Checking hotel {code} for {start} → {end}...")
+    _log(f"[search] Checking hotel {code} for {start} → {end}...")
+    t0 = _now_mono()
+    _RATE_WAIT.seconds = 0.0
+    _begin_check_timing()
+    try:
+        _circuit_gate(cfg)
+        t0 = _now_mono()
+        if getattr(cfg, "engine", "selenium") == "selenium":
+            with _get_selenium_pool(cfg).driver() as driver:
+                result = check_hotel(cfg, driver, code, start, end)
+        else:
+            result = check_hotel(cfg, None, code, start, end)
+    except Exception as e:
+        _log(f"[error] check {code}: {e}", level="error")
+        result = HotelResult(code=code, url=build_url(cfg, code, start, end), name=None, available=None,
+                             start_date=start, end_date=end, error=_classify_error(e))
+    result.elapsed_ms = round(max(0.0, _now_mono() - t0 - _RATE_WAIT.seconds) * 1000.0, 1)
+    _end_check_timing(result)
+    _aimd_observe(result)
+    _circuit_observe(cfg, result)
+    return result
+
+
+def _mark_check_done(result: Optional[HotelResult] = None) -> None:
+    with _PROGRESS_LOCK:
+        _PROGRESS["done"] = min(_PROGRESS["done"] + 1, _PROGRESS["total"])
+    if result is not None and _EVENTS.active():
+        # Push each result as it lands; the round's results snapshot follows at the end
+        _EVENTS.publish("result", asdict(result))
+    _bump_version("state")
+
+
+class _CheckLanes:
+    """
+    A fixed set of checker threads ("lanes") fed from one task queue.
+    Each lane owns its own Playwright pool / Selenium driver for its whole
+    lifetime, so browsers stay warm across rounds. Results keep the order of
+    the submitted tasks.
+    """
+
+    def __init__(self, cfg: AppConfig, size: int):
+        self.cfg = cfg
+        self._tasks: "queue.Queue[Optional[Tuple[int, str, str, str, List[Optional[HotelResult]]]]]" = queue.Queue()
+        self._cond = threading.Condition()
+        self._pending = 0
+        self._threads = [
+            threading.Thread(target=self._lane_main, name=f"checker-lane-{i + 1}", daemon=True)
+            for i in range(size)
+        ]
+        for t in self._threads:
+            t.start()
+
+    def _lane_main(self) -> None:
+        try:
+            while True:
+                item = self._tasks.get()
+                if item is None:
+                    break
+                idx, code, start, end, out = item
+                try:
+                    if _stop_event.is_set():
+                        continue
+                    with _pacing_slot():
+                        out[idx] = _check_one(self.cfg, code, start, end)
+                    _mark_check_done(out[idx])
+                finally:
+                    with self._cond:
+                        self._pending -= 1
+                        self._cond.notify_all()
+        finally:
+            _close_thread_resources()
+
+    def run_round(self, tasks: List[Tuple[str, str, str]]) -> List[HotelResult]:
+        out: List[Optional[HotelResult]] = [None] * len(tasks)
+        with self._cond:
+            self._pending = len(tasks)
+        for idx, (code, start, end) in enumerate(tasks):
+            self._tasks.put((idx, code, start, end, out))
+        with self._cond:
+            while self._pending > 0:
+                self._cond.wait(timeout=0.5)
+        return [r for r in out if r is not None]
+
+    def close(self) -> None:
+        for _ in self._threads:
+            self._tasks.put(None)
+        for t in self._threads:
+            t.join(timeout=5)
+
+
+def _render_process_main(worker_id: int, cfg: AppConfig, inbox, outbox, stop) -> None:
+    """
+    Entry point of a render worker process: owns its own browser, returns picklable HotelResults.
+    `stop` is the pool's shared Event; it is mirrored onto this process's _stop_event so a
+    check in progress gives up as it would on the threaded path.
+    """
+    global _LOG_FORWARD
+    _LOG_FORWARD = lambda entry: outbox.put(("log", worker_id, entry))
+    cfg.concurrency = 1          # one browser per worker process
+    cfg.selenium_pool_size = 1
+
+    def _watch_stop() -> None:
+        stop.wait()
+        _stop_event.set()
+
+    threading.Thread(target=_watch_stop, name="render-worker-stop", daemon=True).start()
+    try:
+        while not _stop_event.is_set():
+            try:
+                item = inbox.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            if item is None:
+                break
+            round_id, idx, code, start, end = item
+            result = _check_one(cfg, code, start, end)
+            outbox.put(("result", worker_id, round_id, idx, result))
+    except (KeyboardInterrupt, EOFError):
+        pass
+    finally:
+        _close_thread_resources()
+        _close_selenium_pool()
+
+
+class RenderProcessPool:
+    """
+    Render workers in separate processes, so rendering and parsing use several
+    cores and a browser crash can't take down the Flask process.
+    The parent hands hotels to idle workers as the global rate limiter allows
+    (workers have no limiter of their own), restarts workers that die or hang,
+    and reports a failed check (available=None) for the hotel they were on.
+    """
+
+    def __init__(self, cfg: AppConfig, size: int):
+        self.cfg = deepcopy(cfg)
+        self._ctx = multiprocessing.get_context("spawn")  # fork is unsafe with our threads
+        self._outbox = self._ctx.Queue()
+        self._stop = self._ctx.Event()
+        self._round_id = 0
+        self._lock = threading.Lock()
+        self._stats = {"restarts": 0, "timeouts": 0, "tasks": 0}
+        self._workers = [self._spawn(i) for i in range(max(1, int(size)))]
+
+    def _spawn(self, worker_id: int) -> Dict[str, Any]:
+        inbox = self._ctx.Queue()
+        proc = self._ctx.Process(
+            target=_render_process_main,
+            args=(worker_id, self.cfg, inbox, self._outbox, self._stop),
+            name=f"render-worker-{worker_id + 1}",
+            daemon=True,
+        )
+        proc.start()
+        return {"id": worker_id, "proc": proc, "inbox": inbox, "task": None, "started": 0.0}
+
+    def _restart(self, w: Dict[str, Any]) -> None:
+        try:
+            if w["proc"].is_alive():
+                w["proc"].kill()
+            w["proc"].join(timeout=5)
+        except Exception:
+            pass
+        self._workers[w["id"]] = self._spawn(w["id"])
+        with self._lock:
+            self._stats["restarts"] += 1
+
+    def run_round(self, tasks: List[Tuple[str, str, str]]) -> List[HotelResult]:
+        self._round_id += 1
+        round_id = self._round_id
+        out: List[Optional[HotelResult]] = [None] * len(tasks)
+        pending = deque(enumerate(tasks))
+        outstanding = 0
+
+        def _fail(w: Dict[str, Any], why: str) -> None:
+            nonlocal outstanding
+            idx, code, start, end = w["task"]
+            _log(f"[error] render worker {w['id'] + 1} {why} while checking {code}, restarting it", level="error")
+            out[idx] = HotelResult(code=code, url=build_url(self.cfg, code, start, end), name=None, available=None,
+                                   start_date=start, end_date=end,
+                                   error="timeout" if why == "timed out" else "error")
+            _aimd_observe(out[idx])
+            _circuit_observe(self.cfg, out[idx])
+            outstanding -= 1
+            _mark_check_done(out[idx])
+
+        while pending or outstanding:
+            if _stop_event.is_set():
+                self._stop.set()
+                break
+            now = _now_mono()
+            limiter = _RATE_LIMITER
+            ctl = _AIMD
+            breaker = _circuit_for(self.cfg)
+            busy = sum(1 for w in self._workers if w["task"] is not None)
+            for w in self._workers:
+                if ctl is not None and busy >= ctl.limit:
+                    break
+                if w["task"] is None and pending:
+                    if breaker is not None and not breaker.allow():
+                        break
+                    if limiter is not None and not limiter.try_acquire():
+                        if breaker is not None:
+                            breaker.release()
+                        break
+                    busy += 1
+                    idx, (code, start, end) = pending.popleft()
+                    w["task"] = (idx, code, start, end)
+                    w["started"] = now
+                    w["inbox"].put((round_id, idx, code, start, end))
+                    outstanding += 1
+            try:
+                msg = self._outbox.get(timeout=0.2)
+            except queue.Empty:
+                msg = None
+            except Exception:
+                msg = None
+            if msg is not None and msg[0] == "log":
+                self._forward_log(msg[2])
+            elif msg is not None and msg[0] == "result":
+                _, wid, rid, idx, result = msg
+                w = self._workers[wid]
+                if rid == round_id and w["task"] is not None and w["task"][0] == idx:
+                    out[idx] = result
+                    _aimd_observe(result)
+                    _circuit_observe(self.cfg, result)
+                    w["task"] = None
+                    outstanding -= 1
+                    _mark_check_done(result)
+                    with self._lock:
+                        self._stats["tasks"] += 1
+            for w in list(self._workers):
+                if not w["proc"].is_alive():
+                    if w["task"] is not None:
+                        _fail(w, "died")
+                    self._restart(w)
+                elif w["task"] is not None and _now_mono() - w["started"] > RENDER_PROCESS_TASK_TIMEOUT_SEC:
+                    with self._lock:
+                        self._stats["timeouts"] += 1
+                    _fail(w, "timed out")
+                    self._restart(w)
+        if _stop_event.is_set():
+            # Results still in flight belong to this round id and will be ignored later.
+            for w in self._workers:
+                w["task"] = None
+        return [r for r in out if r is not None]
+
+    @staticmethod
+    def _forward_log(entry: Dict[str, Any]) -> None:
+        _append_log_entry(entry)
+        _safe_print(_format_log_entry(entry))
+
+    def _drain_outbox(self) -> None:
+        """Read whatever the workers have queued; late results are dropped, logs are kept."""
+        while True:
+            try:
+                msg = self._outbox.get_nowait()
+            except Exception:
+                return
+            if msg[0] == "log":
+                self._forward_log(msg[2])
+
+    def close(self) -> None:
+        self._stop.set()
+        for w in self._workers:
+            try:
+                w["inbox"].put(None)
+            except Exception:
+                pass
+        # Keep reading the outbox while the workers exit: a worker whose queue
+        # feeder is blocked on a full pipe can't finish otherwise.
+        deadline = _now_mono() + 10
+        while _now_mono() < deadline and any(w["proc"].is_alive() for w in self._workers):
+            self._drain_outbox()
+            time.sleep(0.05)
+        for w in self._workers:
+            if w["proc"].is_alive():
+                w["proc"].kill()
+            w["proc"].join(timeout=5)
+        self._drain_outbox()
+        for q in [w["inbox"] for w in self._workers] + [self._outbox]:
+            q.close()
+            q.join_thread()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            out = dict(self._stats)
+        out["workers"] = [
+            {"pid": w["proc"].pid, "alive": w["proc"].is_alive(), "busy": w["task"] is not None}
+            for w in self._workers
+        ]
+        return out
+
+
+def _render_process_stats() -> Optional[Dict[str, Any]]:
+    runner = _RENDER_RUNNER
+    if isinstance(runner, RenderProcessPool):
+        return runner.stats()
+    return None
+
+
 def _worker_loop():
-    global _driver, _LAST_RESULTS, _PROGRESS, _UPTIME_STARTED, _UPTIME_STARTED_MONO
+    global _LAST_RESULTS, _PROGRESS, _UPTIME_STARTED, _UPTIME_STARTED_MONO, _RENDER_RUNNER, _AIMD, _CIRCUITS_ACTIVE
     _log("Worker loop started.")
     _set_action("Worker loop started.")
     _UPTIME_STARTED = _now_wall()
@@ -1129,82 +4315,144 @@ def _worker_loop():
     with _CONFIG_LOCK:
         cfg = _CONFIG
         start, end = cfg.start_date, cfg.end_date
+        ranges = _watch_ranges(cfg)
+    if len(ranges) > 1:
+        _log(f"Watching {len(cfg.hotel_codes)} hotel(s) × {len(ranges)} date range(s).")
+    adaptive = bool(getattr(cfg, "adaptive_polling", DEFAULT_ADAPTIVE_POLLING))
+    if adaptive:
+        lo, hi = _poll_bounds(cfg)
+        _log(f"Adaptive polling: each hotel every {lo:.0f}-{hi:.0f}s depending on how often it changes.")
+        _poll_reset_schedule()
+    # One task per (hotel, stay); all of them share the same runner and browsers
+    watch_tasks = [(code, r_start, r_end) for code in cfg.hotel_codes for r_start, r_end in ranges]
+
+    limiter = _configure_rate_limiter(cfg)
+    _log(f"Rate limit: {limiter.rate:g} request(s)/s, burst {limiter.burst}.")
+    concurrency = max(1, min(MAX_CONCURRENCY, int(getattr(cfg, "concurrency", DEFAULT_CONCURRENCY) or 1)))
+    runner = None  # _CheckLanes | RenderProcessPool; None = check inline on this thread
+    if getattr(cfg, "execution_mode", DEFAULT_EXECUTION_MODE) == "process":
+        _log(f"Starting {concurrency} render worker process(es).")
+        runner = RenderProcessPool(cfg, concurrency)
+    elif concurrency > 1:
+        _log(f"Checking up to {concurrency} hotels in parallel.")
+        runner = _CheckLanes(cfg, concurrency)
+    _RENDER_RUNNER = runner
+    _AIMD = AimdController(cfg, concurrency) if getattr(cfg, "aimd_enabled", DEFAULT_AIMD_ENABLED) else None
+    _CIRCUITS_ACTIVE = True
+    with _IN_PAGE_LOCK:
+        _IN_PAGE_STATS.update(mismatches=0, disabled=False)
 
-    driver = None
-    if getattr(cfg, "engine", "selenium") == "selenium":
-        with _DRIVER_LOCK:
-            if _driver is None:
-                _driver = build_driver(cfg)
-        driver = _driver
+    try:
+        # Guard loop: (no code yet)
+        while not _stop_event.is_set():
+            # Hard guard: if user has requested stop, do not continue another round
+            try:
+                if not _RUN_REQUESTED:
+                    _log("Worker noticed RUN_REQUESTED=False, exiting loop.")
+                    break
+            except NameError:
+                # Backward-compat if the flag wasn't defined
+                pass
+            _poll_prune(watch_tasks)
+            tasks = watch_tasks
+            if adaptive:
+                tasks = _poll_due(watch_tasks)
+                if not tasks:
+                    wait_s = _poll_next_wait(cfg, watch_tasks)
+                    _set_action(f"No hotel due yet. Waiting {wait_s:.1f}s...")
+                    t_wait = _now_mono()
+                    stopped = _stop_event.wait(timeout=wait_s)
+                    _note_round_sleep(_now_mono() - t_wait)
+                    if stopped:
+                        break
+                    continue
+            with _PROGRESS_LOCK:
+                _PROGRESS["round"] += 1
+                _PROGRESS["done"] = 0
+                _PROGRESS["total"] = len(tasks)
+                _PROGRESS["round_started"] = _now_wall()
+                _PROGRESS["round_started_mono"] = _now_mono()
+            _bump_version("state")
+            current_round = _PROGRESS["round"]
+            round_tick_start = _now_mono()
+            _roll_block_stats()
+
+            results: List[HotelResult] = []
+            if runner is not None:
+                results = runner.run_round(tasks)
+            else:
+                for code, t_start, t_end in tasks:
+                    if _stop_event.is_set():
+                        break
+                    results.append(_check_one(cfg, code, t_start, t_end))
+                    _mark_check_done(results[-1])
 
-    # Guard loop: (no code yet)
-    while not _stop_event.is_set():
-        # Hard guard: if user has requested stop, do not continue another round
-        try:
-            if not _RUN_REQUESTED:
-                _log("Worker noticed RUN_REQUESTED=False, exiting loop.")
-                break
-        except NameError:
-            # Backward-compat if the flag wasn't defined
-            pass
-        with _PROGRESS_LOCK:
-            _PROGRESS["round"] += 1
-            _PROGRESS["done"] = 0
-            _PROGRESS["total"] = len(cfg.hotel_codes)
-            _PROGRESS["round_started"] = _now_wall()
-            _PROGRESS["round_started_mono"] = _now_mono()
-        current_round = _PROGRESS["round"]
-        round_tick_start = _now_mono()
-
-        results: List[HotelResult] = []
-        for code in cfg.hotel_codes:
-            if _stop_event.is_set():
-                break
-            _set_action(f"[search] Checking hotel {code} for {start} → {end}...")
-            _log(f"[search] Checking hotel {code} for {start} → {end}...")
+            t_notify = _now_mono()
             try:
-                result = check_hotel(cfg, driver, code, start, end)
+                process_notifications(cfg, results, start, end)
             except Exception as e:
-                _log(f"[error] check {code}: {e}")
-                result = HotelResult(code=code, url=build_url(cfg, code, start, end), name=None, available=None)
-            results.append(result)
+                _log(f"[error] notify: {e}", level="error")
+            notify_s = _now_mono() - t_notify
+            _add_stage("notify", notify_s)
+
+            _note_content_round(results)
+            _observe_results(results)
+            _record_round_timings(current_round, results, _now_mono() - round_tick_start, notify_s)
+            for r in results:
+                _poll_observe(cfg, r)
+            with _RESULTS_LOCK:
+                # Adaptive rounds only poll the due pairs; keep showing the rest
+                _LAST_RESULTS = _poll_latest(watch_tasks) if adaptive else results
+            _bump_version("results")
             with _PROGRESS_LOCK:
-                _PROGRESS["done"] = min(_PROGRESS["done"] + 1, _PROGRESS["total"])
-            time.sleep(max(1, min(30, int(cfg.per_hotel_delay_seconds))))
-
-        try:
-            process_notifications(cfg, results, start, end)
-        except Exception as e:
-            _log(f"[error] notify: {e}")
-
-        with _RESULTS_LOCK:
-            _LAST_RESULTS = results
-        with _PROGRESS_LOCK:
-            _PROGRESS["done"] = _PROGRESS["total"]
-
-        ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        widths = {
-            'code': max(len("HotelCode"), *(len(r.code) for r in results)) if results else 9,
-            'name': max(len("HotelName"), *(len((r.name or "(Hotel name not found)")) for r in results)) if results else 9,
-            'res':  max(len("Result"), *(len("✅" if r.available else "❌" if r.available is False else "❓") for r in results)) if results else 6,
-        }
-        bar = "=" * (widths['code'] + widths['name'] + widths['res'] + 2)
-        _log(bar)
-        _log(f"Time: {ts}")
-        _log(f"Search Dates: {start} → {end}")
-        _log(f"{'HotelCode':<{widths['code']}} {'HotelName':<{widths['name']}} {'Result':<{widths['res']}}")
-        _log("-" * (widths['code'] + widths['name'] + widths['res'] + 2))
-        for r in results:
-            res = "✅" if r.available else ("❌" if r.available is False else "❓")
-            _log(f"{r.code:<{widths['code']}} {(r.name or '(Hotel name not found)'):<{widths['name']}} {res:<{widths['res']}}")
-        _log(bar)
-
-        # Post-wait model: after a loop finishes, always wait the full interval
-        wait_s = float(max(1, int(cfg.loop_interval_seconds)))
-        _set_action(f"Round {current_round} complete. Waiting {wait_s:.1f}s...")
-        if _stop_event.wait(timeout=wait_s):
-            break
+                _PROGRESS["done"] = _PROGRESS["total"]
+            _bump_version("state")
+
+            ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            widths = {
+                'code': max(len("HotelCode"), *(len(r.code) for r in results)) if results else 9,
+                'name': max(len("HotelName"), *(len((r.name or "(Hotel name not found)")) for r in results)) if results else 9,
+                'res':  max(len("Result"), *(len("✅" if r.available else "❌" if r.available is False else "❓") for r in results)) if results else 6,
+            }
+            multi = len(ranges) > 1
+            dates_w = 24 if multi else 0  # "YYYY-MM-DD → YYYY-MM-DD" + separator
+            bar = "=" * (widths['code'] + widths['name'] + widths['res'] + 2 + dates_w)
+            _log(bar)
+            _log(f"Time: {ts}")
+            _log(f"Search Dates: {_format_ranges(ranges)}")
+            head_dates = f" {'Dates':<23}" if multi else ""
+            _log(f"{'HotelCode':<{widths['code']}}{head_dates} {'HotelName':<{widths['name']}} {'Result':<{widths['res']}}")
+            _log("-" * (widths['code'] + widths['name'] + widths['res'] + 2 + dates_w))
+            for r in results:
+                res = "✅" if r.available else ("❌" if r.available is False else "❓")
+                row_dates = f" {(r.start_date or start) + ' → ' + (r.end_date or end):<23}" if multi else ""
+                _log(f"{r.code:<{widths['code']}}{row_dates} {(r.name or '(Hotel name not found)'):<{widths['name']}} {res:<{widths['res']}}")
+            _log(bar)
+
+            # Post-wait model: after a loop finishes, always wait the full interval
+            # (adaptive: until the next pair is due)
+            if adaptive:
+                wait_s = _poll_next_wait(cfg, watch_tasks)
+            else:
+                wait_s = float(max(1, int(cfg.loop_interval_seconds)))
+            _set_action(f"Round {current_round} complete. Waiting {wait_s:.1f}s...")
+            t_wait = _now_mono()
+            stopped = _stop_event.wait(timeout=wait_s)
+            _note_round_sleep(_now_mono() - t_wait)
+            if stopped:
+                break
 
+    finally:
+        _RENDER_RUNNER = None
+        _AIMD = None
+        _CIRCUITS_ACTIVE = False
+        if runner is not None:
+            runner.close()
+        _close_selenium_pool()
+        # The Playwright pool is thread-bound: close it from the thread that owns it.
+        _close_thread_resources()
+
+    _bump_version("state")
     _log("Worker loop stopped.")
 
 # ========= Flask Application & Route =========
@@ -1216,6 +4464,8 @@ def home() -> Response:
         cfg = _CONFIG
     with _RESULTS_LOCK:
         results = list(_LAST_RESULTS)
+    extra_ranges_text = "\n".join(f"{s} → {e}" for s, e in (getattr(cfg, 'extra_date_ranges', None) or []))
+    multi_range = len({(r.start_date, r.end_date) for r in results}) > 1
 
     rows = []
     for r in results:
@@ -1262,6 +4512,8 @@ def home() -> Response:
 
         # 渲染多行：同一酒店只在首行显示 Code 和 HotelName
         name_html = f"<a href='{r.url}' target='_blank'>{(r.name or '(Hotel name not found)')}</a>"
+        if multi_range and r.start_date:
+            name_html += f"<div class='muted'>{r.start_date} → {r.end_date}</div>"
         for idx, row in enumerate(by_offers):
             code_cell = r.code if idx == 0 else ""
             name_cell = name_html if idx == 0 else ""
@@ -1332,6 +4584,10 @@ def home() -> Response:
                </div>
              </div>
 
+             <label>更多日期 Extra Date Ranges（每行一组 one stay per line）</label>
+             <div class='help'>格式 Format：2025-10-01 → 2025-10-03 / 2025-10-01,2025-10-03 ...（与上方日期一同追踪 watched together with the dates above）</div>
+             <textarea id='extra_date_ranges' placeholder='e.g. 2025-10-01 → 2025-10-03'>{extra_ranges_text}</textarea>
+
              <div class='row'>
                <div>
                  <label>人数 People (1-5)</label>
@@ -1386,9 +4642,52 @@ def home() -> Response:
                   <select id='engine'>
                     <option value='playwright' {'selected' if getattr(cfg,'engine','selenium') == 'playwright' else ''} {'disabled' if not _HAS_PLAYWRIGHT else ''}>Playwright (推荐/Recommend)</option>
                     <option value='selenium' {'selected' if getattr(cfg,'engine','selenium') == 'selenium' else ''}>Selenium (ChromeDriver)</option>
+                    <option value='http' {'selected' if getattr(cfg,'engine','selenium') == 'http' else ''}>HTTP (无浏览器/Browserless, 实验性/Experimental)</option>
                   </select>
                   <div class='help'>首次使用 Playwright 需安装浏览器内核 (Install Chromium to use Playwright)</div>
                   <div class='help'>安装 Install: <code>playwright install chromium</code></div>
+                  <div class='help'>HTTP 读不到房型时改用浏览器 HTTP falls back to a browser when a page has no readable room plans</div>
+                  <label>HTML解析器 HTML Parser</label>
+                  <select id='parser_backend'>
+                    <option value='auto' {'selected' if getattr(cfg, 'parser_backend', DEFAULT_PARSER_BACKEND) == 'auto' else ''}>自动 Auto（{_resolve_parser_backend('auto')}）</option>
+                    <option value='selectolax' {'selected' if getattr(cfg, 'parser_backend', DEFAULT_PARSER_BACKEND) == 'selectolax' else ''} {'disabled' if not _HAS_SELECTOLAX else ''}>selectolax (最快/Fastest)</option>
+                    <option value='lxml' {'selected' if getattr(cfg, 'parser_backend', DEFAULT_PARSER_BACKEND) == 'lxml' else ''} {'disabled' if not _HAS_LXML else ''}>lxml</option>
+                    <option value='html.parser' {'selected' if getattr(cfg, 'parser_backend', DEFAULT_PARSER_BACKEND) == 'html.parser' else ''}>html.parser (内置/Built-in)</option>
+                  </select>
+                  <label class="inline"><input id='playwright_capture' type='checkbox' {'checked' if getattr(cfg, 'playwright_capture', DEFAULT_PLAYWRIGHT_CAPTURE) else ''}> 直接读取房型数据接口 Capture room-plan JSON (Playwright)</label>
+                  <label class="inline"><input id='block_resources' type='checkbox' {'checked' if getattr(cfg, 'block_resources', DEFAULT_BLOCK_RESOURCES) else ''}> 拦截图片/字体/统计脚本 Block images, fonts &amp; trackers</label>
+                  <div class='help'>/status 中 bytes_est 为按类型估算值 bytes_est in /status is a per-type estimate, not a measurement</div>
+                </div>
+                <div>
+                  <label>并发数 Concurrency (1-{MAX_CONCURRENCY})</label>
+                  <input id='concurrency' type='number' min='1' max='{MAX_CONCURRENCY}' step='1' value='{getattr(cfg, 'concurrency', DEFAULT_CONCURRENCY)}'>
+                  <div class='help'>同时检索的酒店数，每路占用一个浏览器 Hotels checked in parallel, one browser each</div>
+                  <label>执行方式 Execution Mode</label>
+                  <select id='execution_mode'>
+                    <option value='thread' {'selected' if getattr(cfg, 'execution_mode', DEFAULT_EXECUTION_MODE) == 'thread' else ''}>线程 Threads</option>
+                    <option value='process' {'selected' if getattr(cfg, 'execution_mode', DEFAULT_EXECUTION_MODE) == 'process' else ''}>独立进程 Worker processes (多核/Multi-core)</option>
+                  </select>
+                  <label>Selenium 驱动池 Driver Pool Size</label>
+                  <input id='selenium_pool_size' type='number' min='1' max='{MAX_CONCURRENCY}' step='1' value='{getattr(cfg, 'selenium_pool_size', DEFAULT_SELENIUM_POOL_SIZE)}'>
+                  <div class='help'>预热的 Chrome 数（不少于并发数）Warm Chrome drivers (at least the concurrency)</div>
+                </div>
+              </div>
+              <div class="row">
+                <div>
+                  <label>拦截白名单 Block Allow List</label>
+                  <input id='block_allow' type='text' value='{getattr(cfg, 'block_allow', DEFAULT_BLOCK_ALLOW)}' placeholder='never block, e.g. toyoko-inn.com/api'>
+                  <div class='help'>仅对 Playwright 生效 Playwright only; Selenium ignores it</div>
+                </div>
+                <div>
+                  <label>拦截黑名单 Block Deny List</label>
+                  <input id='block_deny' type='text' value='{getattr(cfg, 'block_deny', DEFAULT_BLOCK_DENY)}' placeholder='also block, e.g. chat-widget.com'>
+                </div>
+              </div>
+              <div class="row">
+                <div>
+                  <label>页面录制目录 Record Pages To</label>
+                  <input id='record_dir' type='text' value='{getattr(cfg, 'record_dir', '')}' placeholder='e.g. fixtures/pages'>
+                  <div class='help'>保存解析过的页面供离线基准测试（留空关闭）Save parsed pages for offline benchmarks (empty = off)</div>
                 </div>
               </div>
             </fieldset>
@@ -1427,11 +4726,26 @@ def home() -> Response:
                 </div>
               
                  <div>
-                  <label>每家酒店间隔 Per-hotel Delay (seconds)</label>
-                  <input id='per_hotel_delay' type='range' min='1' max='30' step='1' value='{cfg.per_hotel_delay_seconds}'>
-                  <div class='help'>当前 Current: <b><span id="per_hotel_delay_val">{cfg.per_hotel_delay_seconds}</span></b> 秒 sec</div>
+                  <label>请求速率 Request Rate (requests/sec)</label>
+                  <input id='rate_limit_rps' type='number' min='{MIN_RATE_LIMIT_RPS}' max='{MAX_RATE_LIMIT_RPS}' step='0.05' value='{getattr(cfg, 'rate_limit_rps', DEFAULT_RATE_LIMIT_RPS)}'>
+                  <label>突发上限 Burst (requests)</label>
+                  <input id='rate_limit_burst' type='number' min='1' max='{MAX_RATE_LIMIT_BURST}' step='1' value='{getattr(cfg, 'rate_limit_burst', DEFAULT_RATE_LIMIT_BURST)}'>
+                  <div class='help'>所有并发共享 Shared by all lanes and engines（过快可能被网站拒绝 Too fast may be blocked）</div>
+                  <label class="inline"><input id='aimd_enabled' type='checkbox' {'checked' if getattr(cfg, 'aimd_enabled', DEFAULT_AIMD_ENABLED) else ''}> 自动降速 Auto back-off（网站变慢或拦截时降低速率与并发 slow down when the site degrades）</label>
                </div>
               </div>
+              <label class="inline"><input id='adaptive_polling' type='checkbox' {'checked' if getattr(cfg, 'adaptive_polling', DEFAULT_ADAPTIVE_POLLING) else ''}> 自适应检索频率 Adaptive polling（常变动的酒店查得更勤 poll volatile hotels more often）</label>
+              <div class="row">
+                <div>
+                  <label>最短检索间隔 Min Poll Interval (seconds)</label>
+                  <input id='poll_min_interval' type='number' min='5' step='5' value='{getattr(cfg, 'poll_min_interval_sec', DEFAULT_POLL_MIN_INTERVAL_SEC)}'>
+                </div>
+                <div>
+                  <label>最长检索间隔 Max Poll Interval (seconds)</label>
+                  <input id='poll_max_interval' type='number' min='5' step='5' value='{getattr(cfg, 'poll_max_interval_sec', DEFAULT_POLL_MAX_INTERVAL_SEC)}'>
+                </div>
+              </div>
+              <div class='help'>启用后替代每轮检索间隔 Replaces the loop interval when enabled</div>
             </fieldset>
 
             <!-- Telegram box -->
@@ -1520,7 +4834,7 @@ def home() -> Response:
           </fieldset>
 
           <p id="summary-line" class='muted' style="text-align:center">
-            日期 Dates: <b>{cfg.start_date}</b> → <b>{cfg.end_date}</b> |
+            日期 Dates: <b>{cfg.start_date}</b> → <b>{cfg.end_date}</b>{f" (+{len(cfg.extra_date_ranges)})" if getattr(cfg, 'extra_date_ranges', None) else ''} |
             代理 Proxy: <b>{'ON' if cfg.enable_proxy else 'OFF'}</b> |
             Tg机器人推送 Telegram: <b>{'ON' if cfg.enable_telegram else 'OFF'}</b> |
             本地推送 Local: <b>{'ON' if cfg.enable_local else 'OFF'}</b> |
@@ -1541,6 +4855,43 @@ def home() -> Response:
             <tbody id='results-body'>{''.join(rows) or '<tr><td colspan=6 style="text-align:center;color:#888">(no data yet)</td></tr>'}</tbody>
           </table>
 
+          <p class='muted' style="text-align:center;margin-top:16px">
+            最慢酒店 Slowest Hotels (最近 {CHECK_TIMING_WINDOW} 次检查 last {CHECK_TIMING_WINDOW} checks, ms) |
+            <span id='round-timing'>每轮耗时 Round time: -</span>
+          </p>
+          <table>
+            <thead>
+              <tr>
+                <th style="width:120px">编号 Code</th>
+                <th>酒店名 HotelName</th>
+                <th>次数 Checks</th>
+                <th>p50</th>
+                <th>p95</th>
+                <th>最大 Max</th>
+                <th>导航 Nav</th>
+                <th>就绪 Ready</th>
+                <th>传输 Transfer</th>
+                <th>解析 Parse</th>
+                <th>超时 Timeouts</th>
+                <th>重试 Retries</th>
+              </tr>
+            </thead>
+            <tbody id='timing-body'><tr><td colspan=12 style="text-align:center;color:#888">(no data yet)</td></tr></tbody>
+          </table>
+
+          <details id='log-panel' style="margin-top:16px">
+            <summary>日志 Logs</summary>
+            <div class='muted' style="margin:6px 0">
+              级别 Level:
+              <select id='log_level'>
+                <option value=''>全部 All</option>
+                <option value='warning'>警告及以上 Warning+</option>
+                <option value='error'>错误 Error</option>
+              </select>
+            </div>
+            <pre id='log-box' style="max-height:320px;overflow:auto;background:#f7f7f7;padding:8px;font-size:12px;white-space:pre-wrap;margin:0"></pre>
+          </details>
+
           <footer>
             {APP_NAME} — Version: <b>{APP_VERSION}</b> · Author: <b>{APP_AUTHOR}</b>
           </footer>
@@ -1575,7 +4926,8 @@ def home() -> Response:
               }[m]));
               const on = v => (v ? 'ON' : 'OFF');
               const html =
-                `日期 Dates: <b>${esc(cfg.start_date)}</b> → <b>${esc(cfg.end_date)}</b> | ` +
+                `日期 Dates: <b>${esc(cfg.start_date)}</b> → <b>${esc(cfg.end_date)}</b>` +
+                (extraRanges(cfg).length ? ` (+${extraRanges(cfg).length})` : '') + ` | ` +
                 `代理 Proxy: <b>${on(cfg.enable_proxy)}</b> | ` +
                 `Tg机器人推送 Telegram: <b>${on(cfg.enable_telegram)}</b> | ` +
                 `本地推送 Local: <b>${on(cfg.enable_local)}</b> | ` +
@@ -1584,6 +4936,13 @@ def home() -> Response:
               if (el) el.innerHTML = html;
             }
 
+            function extraRanges(cfg){
+              return (cfg && Array.isArray(cfg.extra_date_ranges)) ? cfg.extra_date_ranges : [];
+            }
+            function formatRanges(arr){
+              return arr.map(p => `${p[0]} → ${p[1]}`).join('\\n');
+            }
+
             function pad2(n){ return (n<10? '0':'') + n; }
             function todayStr(){ const d=new Date(); return `${d.getFullYear()}-${pad2(d.getMonth()+1)}-${pad2(d.getDate())}`; }
             function plusOneDayStr(){ const d=new Date(); d.setDate(d.getDate()+1); return `${d.getFullYear()}-${pad2(d.getMonth()+1)}-${pad2(d.getDate())}`; }
@@ -1595,6 +4954,7 @@ def home() -> Response:
               return {
                 start_date: document.getElementById('start_date').value,
                 end_date: document.getElementById('end_date').value,
+                extra_date_ranges: document.getElementById('extra_date_ranges').value,
                 people: Number(document.getElementById('people').value),
                 rooms: Number(document.getElementById('rooms').value),
                 smoking: document.getElementById('smoking').value,
@@ -1621,8 +4981,22 @@ def home() -> Response:
                 available_alert_repeat: Number(document.getElementById('alert_repeat').value),
                 available_alert_repeat_interval_sec: Number(document.getElementById('alert_interval').value),
                 loop_interval_seconds: Number(document.getElementById('loop_interval').value),
-                per_hotel_delay_seconds: Number(document.getElementById('per_hotel_delay').value),
-                engine: (document.getElementById('engine') ? document.getElementById('engine').value : 'selenium')
+                rate_limit_rps: Number(document.getElementById('rate_limit_rps') ? document.getElementById('rate_limit_rps').value : 0.33),
+                rate_limit_burst: Number(document.getElementById('rate_limit_burst') ? document.getElementById('rate_limit_burst').value : 2),
+                aimd_enabled: document.getElementById('aimd_enabled') ? document.getElementById('aimd_enabled').checked : true,
+                adaptive_polling: document.getElementById('adaptive_polling') ? document.getElementById('adaptive_polling').checked : false,
+                poll_min_interval_sec: Number(document.getElementById('poll_min_interval') ? document.getElementById('poll_min_interval').value : 30),
+                poll_max_interval_sec: Number(document.getElementById('poll_max_interval') ? document.getElementById('poll_max_interval').value : 900),
+                concurrency: Number(document.getElementById('concurrency') ? document.getElementById('concurrency').value : 1),
+                selenium_pool_size: Number(document.getElementById('selenium_pool_size') ? document.getElementById('selenium_pool_size').value : 2),
+                execution_mode: (document.getElementById('execution_mode') ? document.getElementById('execution_mode').value : 'thread'),
+                engine: (document.getElementById('engine') ? document.getElementById('engine').value : 'selenium'),
+                parser_backend: (document.getElementById('parser_backend') ? document.getElementById('parser_backend').value : 'auto'),
+                playwright_capture: document.getElementById('playwright_capture') ? document.getElementById('playwright_capture').checked : false,
+                block_resources: document.getElementById('block_resources') ? document.getElementById('block_resources').checked : false,
+                block_allow: document.getElementById('block_allow') ? document.getElementById('block_allow').value : '',
+                block_deny: document.getElementById('block_deny') ? document.getElementById('block_deny').value : '',
+                record_dir: document.getElementById('record_dir') ? document.getElementById('record_dir').value : ''
               };
             }
 
@@ -1636,10 +5010,11 @@ def home() -> Response:
               el.value = value;
             }
 
-            ['start_date','end_date','people','rooms','smoking','room_requirement','engine','hotel_codes',
+            ['start_date','end_date','extra_date_ranges','people','rooms','smoking','room_requirement','engine','parser_backend','hotel_codes',
              'enable_proxy','proxy_url','enable_telegram','bot_token','chat_id',
              'enable_local','enable_email','smtp_host','smtp_port','smtp_tls','smtp_user','smtp_pass','email_from','email_to',
-             'alert_repeat','alert_interval','loop_interval','per_hotel_delay','budget_enabled','budget_limit'
+             'alert_repeat','alert_interval','loop_interval','rate_limit_rps','rate_limit_burst','aimd_enabled','adaptive_polling','poll_min_interval','poll_max_interval','concurrency','selenium_pool_size','execution_mode','budget_enabled','budget_limit',
+             'playwright_capture','block_resources','block_allow','block_deny','record_dir'
             ].forEach(id=>{
               const el = document.getElementById(id);
               if(!el) return;
@@ -1647,7 +5022,7 @@ def home() -> Response:
               el.addEventListener('change', ()=>{ markEdited(id); BLOCK_REMOTE_OVERWRITE = true; });
             });
 
-            ['alert_repeat','alert_interval','loop_interval','per_hotel_delay','budget_limit'].forEach(id=>{
+            ['alert_repeat','alert_interval','loop_interval','budget_limit'].forEach(id=>{
               const el = document.getElementById(id);
               if(!el) return;
               el.addEventListener('input', syncDisplayValues);
@@ -1662,12 +5037,9 @@ def home() -> Response:
               const arv = document.getElementById('alert_repeat_val');
               const aiv = document.getElementById('alert_interval_val');
               const liv = document.getElementById('loop_interval_val');
-              const phd = document.getElementById('per_hotel_delay');
-              const phdv = document.getElementById('per_hotel_delay_val');
               if (ar && arv) arv.textContent = String(ar.value);
               if (ai && aiv) aiv.textContent = String(ai.value);
               if (li && liv) liv.textContent = String(li.value);
-              if (phd && phdv) phdv.textContent = String(phd.value);
               const bl  = document.getElementById('budget_limit');
               const blv = document.getElementById('budget_limit_val');
               if (bl && blv) blv.textContent = String(bl.value);
@@ -1686,6 +5058,7 @@ def home() -> Response:
                   document.getElementById('err').textContent = 'Save failed';
                   document.getElementById('msg').textContent = '';
                   setIfNotFocused('engine', j.config.engine || 'selenium');
+                  setIfNotFocused('parser_backend', j.config.parser_backend || 'auto');
                 }
               }catch(e){
                 document.getElementById('err').textContent = e;
@@ -1760,6 +5133,99 @@ def home() -> Response:
               pill.className = 'pill ' + (is ? 'on' : 'off');
             }
 
+            // Log panel: asks /logs only for entries after the last seq it has shown
+            let LOG_SEQ = 0, LOG_BUSY = false;
+            const LOG_KEEP = 1000;
+            async function fetchLogs(reset){
+              const panel = document.getElementById('log-panel');
+              const box = document.getElementById('log-box');
+              if (!panel || !box || LOG_BUSY) return;
+              if (reset){ LOG_SEQ = 0; box.textContent = ''; }
+              if (!panel.open) return;
+              LOG_BUSY = true;
+              try{
+                const lvl = document.getElementById('log_level').value;
+                const atBottom = box.scrollTop + box.clientHeight >= box.scrollHeight - 4;
+                while (true){
+                  const r = await fetch(`/logs?since=${LOG_SEQ}` + (lvl ? `&level=${lvl}` : ''));
+                  const j = await r.json();
+                  if (!j.ok) break;
+                  if (j.entries.length){
+                    const text = j.entries.map(e =>
+                      `[${new Date(e.ts * 1000).toTimeString().slice(0, 8)}] ` +
+                      (e.level !== 'info' ? e.level.toUpperCase() + ' ' : '') + e.message).join('\\n') + '\\n';
+                    box.textContent = (box.textContent + text).split('\\n').slice(-LOG_KEEP).join('\\n');
+                  }
+                  LOG_SEQ = j.next;
+                  if (j.next >= j.seq) break;
+                }
+                if (atBottom) box.scrollTop = box.scrollHeight;
+              }catch(e){
+                // ignore
+              }finally{
+                LOG_BUSY = false;
+              }
+            }
+            document.getElementById('log-panel').addEventListener('toggle', () => fetchLogs(false));
+            document.getElementById('log_level').addEventListener('change', () => fetchLogs(true));
+
+            // One finished check pushed by /events, ahead of the round's results snapshot
+            function mergeResult(res){
+              const i = LAST_ROWS.findIndex(x => x.code === res.code && x.start_date === res.start_date && x.end_date === res.end_date);
+              if (i >= 0) LAST_ROWS[i] = res; else LAST_ROWS.push(res);
+              renderRows(LAST_ROWS);
+            }
+            function fmtSecs(s){
+              s = Math.max(0, Math.floor(s));
+              const d = Math.floor(s / 86400), h = Math.floor(s % 86400 / 3600), m = Math.floor(s % 3600 / 60);
+              const parts = [];
+              if (d) parts.push(d + 'd');
+              if (h || d) parts.push(h + 'h');
+              if (m || h || d) parts.push(m + 'm');
+              parts.push((s % 60) + 's');
+              return parts.join(' ');
+            }
+            function tickProgress(){
+              if (!PROGRESS_SEEN || !PROGRESS_SEEN.running) return;
+              const p = PROGRESS_SEEN.p, dt = (Date.now() - PROGRESS_SEEN.at) / 1000;
+              document.getElementById('time-text').textContent =
+                `耗时 Loop elapsed: ${fmtSecs(Number(p.round_elapsed_sec||0) + dt)} | 总耗时 Uptime: ${fmtSecs(Number(p.uptime_sec||0) + dt)}`;
+            }
+
+            function renderTimings(t){
+                if (!t) return;
+                const ms = v => (v == null ? '-' : Math.round(Number(v)));
+                const rd = t.rounds || {};
+                const sp = rd.mean_split || {};
+                const rt = document.getElementById('round-timing');
+                if (rt) rt.textContent = rd.count
+                  ? `每轮耗时 Round time: p50 ${ms(rd.p50_ms)} / p95 ${ms(rd.p95_ms)} / max ${ms(rd.max_ms)} ms ` +
+                    `(平均 mean: fetch ${ms(sp.fetch_ms)}, parse ${ms(sp.parse_ms)}, rate wait ${ms(sp.rate_wait_ms)}, ` +
+                    `notify ${ms(sp.notify_ms)}, sleep ${ms(sp.sleep_ms)})`
+                  : '每轮耗时 Round time: -';
+                const tbody = document.getElementById('timing-body');
+                const hotels = Array.isArray(t.slowest_hotels) ? t.slowest_hotels : [];
+                if (hotels.length === 0){
+                    tbody.innerHTML = '<tr><td colspan="12" style="text-align:center;color:#888">(no data yet)</td></tr>';
+                    return;
+                }
+                tbody.innerHTML = hotels.map(h =>
+                    `<tr>
+                      <td>${h.code}</td>
+                      <td>${h.name || '-'}<div class="muted">${h.engine || ''}</div></td>
+                      <td>${h.checks}</td>
+                      <td>${ms(h.p50_ms)}</td>
+                      <td>${ms(h.p95_ms)}</td>
+                      <td>${ms(h.max_ms)}</td>
+                      <td>${ms(h.navigate_ms)}</td>
+                      <td>${ms(h.ready_ms)}</td>
+                      <td>${ms(h.transfer_ms)}</td>
+                      <td>${ms(h.parse_ms)}</td>
+                      <td>${h.timeouts}</td>
+                      <td>${h.retries}</td>
+                    </tr>`).join('');
+            }
+
             function renderRows(results){
                 const tbody = document.getElementById('results-body');
                 if (!Array.isArray(results) || results.length === 0){
@@ -1769,9 +5235,12 @@ def home() -> Response:
 
                 const rows = [];
 
+                const multiRange = new Set(results.map(r => `${r.start_date}|${r.end_date}`)).size > 1;
+
                 results.forEach(r => {
                     const hotelName = r.name || '(Hotel name not found)';
-                    const nameHtml  = `<a href="${r.url}" target="_blank">${hotelName}</a>`;
+                    const nameHtml  = `<a href="${r.url}" target="_blank">${hotelName}</a>` +
+                      ((multiRange && r.start_date) ? `<div class="muted">${r.start_date} → ${r.end_date}</div>` : '');
 
                     // 生成一行的帮助函数：是否显示Code/Name由首行决定
                     const addRow = (showCode, showName, status, priceHtml, leftHtml, roomHtml) => {
@@ -1826,15 +5295,32 @@ def home() -> Response:
                 tbody.innerHTML = rows.join('');
             }
 
+            // Versions from the last /status reply: later polls only receive what changed since
+            let STATUS_V = null;
+            let LAST_ROWS = [];
+            let PROGRESS_SEEN = null;  // {p, at, running}: lets the elapsed timers tick between updates
             async function refreshStatus(){
               try{
-                const r = await fetch('/status');
-                const j = await r.json();
+                const qs = STATUS_V ? '&' + Object.entries(STATUS_V).map(([k, v]) => `${k}_v=${v}`).join('&') : '';
+                const r = await fetch('/status?logs=0' + qs);
+                if (r.status === 304) return;
+                applyStatus(await r.json());
+              }catch(e){
+                // ignore
+              }
+            }
+            // A /status reply or an /events "status" message (full or delta)
+            function applyStatus(j){
+              try{
+                if (j.versions) STATUS_V = j.versions;
+                if (j.versions && j.versions.logs !== LOG_SEQ) fetchLogs(j.versions.logs < LOG_SEQ);
                 setRunning(!!j.running);
                 renderProgress(j.progress);
+                if (j.progress) PROGRESS_SEEN = {p: j.progress, at: Date.now(), running: !!j.running};
                 if (j && j.config){
                   setIfNotFocused('start_date', j.config.start_date);
                   setIfNotFocused('end_date', j.config.end_date);
+                  setIfNotFocused('extra_date_ranges', formatRanges(extraRanges(j.config)));
                   setIfNotFocused('people', j.config.people);
                   setIfNotFocused('rooms', j.config.rooms);
                   setIfNotFocused('smoking', j.config.smoking);
@@ -1867,10 +5353,29 @@ def home() -> Response:
                   if ('available_alert_repeat' in j.config) setIfNotFocused('alert_repeat', j.config.available_alert_repeat);
                   if ('available_alert_repeat_interval_sec' in j.config) setIfNotFocused('alert_interval', j.config.available_alert_repeat_interval_sec);
                   if ('loop_interval_seconds' in j.config) setIfNotFocused('loop_interval', j.config.loop_interval_seconds);
-                  if ('per_hotel_delay_seconds' in j.config) setIfNotFocused('per_hotel_delay', j.config.per_hotel_delay_seconds);
+                  if ('rate_limit_rps' in j.config) setIfNotFocused('rate_limit_rps', j.config.rate_limit_rps);
+                  if ('rate_limit_burst' in j.config) setIfNotFocused('rate_limit_burst', j.config.rate_limit_burst);
+                  const elAimd = document.getElementById('aimd_enabled');
+                  if (elAimd && !recentlyEdited('aimd_enabled') && !BLOCK_REMOTE_OVERWRITE) elAimd.checked = !!j.config.aimd_enabled;
+                  if ('poll_min_interval_sec' in j.config) setIfNotFocused('poll_min_interval', j.config.poll_min_interval_sec);
+                  if ('poll_max_interval_sec' in j.config) setIfNotFocused('poll_max_interval', j.config.poll_max_interval_sec);
+                  const elAP = document.getElementById('adaptive_polling');
+                  if (elAP && !recentlyEdited('adaptive_polling') && !BLOCK_REMOTE_OVERWRITE) elAP.checked = !!j.config.adaptive_polling;
+                  if ('concurrency' in j.config) setIfNotFocused('concurrency', j.config.concurrency);
+                  if ('selenium_pool_size' in j.config) setIfNotFocused('selenium_pool_size', j.config.selenium_pool_size);
+                  if ('execution_mode' in j.config) setIfNotFocused('execution_mode', j.config.execution_mode);
                   // keep numeric displays in sync
                   syncDisplayValues();
 
+                  const elCap = document.getElementById('playwright_capture');
+                  if (elCap && !recentlyEdited('playwright_capture') && !BLOCK_REMOTE_OVERWRITE) elCap.checked = !!j.config.playwright_capture;
+
+                  const elBlk = document.getElementById('block_resources');
+                  if (elBlk && !recentlyEdited('block_resources') && !BLOCK_REMOTE_OVERWRITE) elBlk.checked = !!j.config.block_resources;
+                  if ('block_allow' in j.config) setIfNotFocused('block_allow', j.config.block_allow);
+                  if ('block_deny' in j.config) setIfNotFocused('block_deny', j.config.block_deny);
+                  if ('record_dir' in j.config) setIfNotFocused('record_dir', j.config.record_dir);
+
                   const elBE = document.getElementById('budget_enabled');
                   if (elBE && !recentlyEdited('budget_enabled') && !BLOCK_REMOTE_OVERWRITE) elBE.checked = !!j.config.budget_enabled;
 
@@ -1886,7 +5391,8 @@ def home() -> Response:
                   }
                   renderSummary(j.config);
                 }
-                renderRows(j.results || []);
+                if (j.results){ LAST_ROWS = j.results; renderRows(LAST_ROWS); }
+                if (j.timings) renderTimings(j.timings);
                 const act = (j && j.action) ? j.action : '(idle)';
                 const age = (j && (typeof j.action_age_sec === 'number')) ? j.action_age_sec : null;
                 const actLine = '状态 Current: ' + act + (age!=null ? ` (${age}s ago)` : '');
@@ -1913,6 +5419,7 @@ def home() -> Response:
               // 恢复默认（不会立刻写磁盘）
               document.getElementById('start_date').value = todayStr();
               document.getElementById('end_date').value   = plusOneDayStr();
+              document.getElementById('extra_date_ranges').value = '';
               document.getElementById('people').value     = 1;
               document.getElementById('rooms').value      = 1;
               document.getElementById('smoking').value    = 'all';
@@ -1952,8 +5459,31 @@ def home() -> Response:
               });
             }
 
-            refreshStatus();
-            setInterval(refreshStatus, 2000);
+            // Server push when available (/status stays for older browsers and one-off refreshes).
+            // One /events stream per browser: the tab holding the 'tt-events' lock opens it and
+            // relays every message to the other tabs over a BroadcastChannel, so several open
+            // tabs don't use up the browser's per-host connection limit.
+            if (window.EventSource && window.BroadcastChannel && navigator.locks){
+              const relay = new BroadcastChannel('tt-events');
+              const onEvent = (type, data) => {
+                try{ if (type === 'status') applyStatus(data); else if (type === 'result') mergeResult(data); }catch(_){}
+              };
+              relay.onmessage = e => { if (e.data) onEvent(e.data.type, e.data.data); };
+              refreshStatus();
+              navigator.locks.request('tt-events', () => new Promise(() => {
+                const es = new EventSource('/events?logs=0');
+                ['status', 'result'].forEach(type => es.addEventListener(type, e => {
+                  let data;
+                  try{ data = JSON.parse(e.data); }catch(_){ return; }
+                  onEvent(type, data);
+                  relay.postMessage({type, data});
+                }));
+              }));
+              setInterval(tickProgress, 1000);
+            } else {
+              refreshStatus();
+              setInterval(refreshStatus, 2000);
+            }
           </script>
         </body></html>
         """
@@ -2058,7 +5588,7 @@ def _codes_from_name_input(text: str) -> list:
 
 @app.route("/start", methods=["POST"])
 def start() -> Response:
-        global _worker_thread, _driver, _RUN_REQUESTED
+        global _worker_thread, _RUN_REQUESTED
         payload = request.get_json(force=True, silent=True) or {}
 
         # If already running, skip creating another thread
@@ -2069,6 +5599,8 @@ def start() -> Response:
             cfg = _CONFIG
             cfg.start_date = payload.get("start_date", cfg.start_date)
             cfg.end_date = payload.get("end_date", cfg.end_date)
+            if "extra_date_ranges" in payload:
+                cfg.extra_date_ranges = _parse_date_ranges(payload.get("extra_date_ranges"))
             raw_codes = payload.get("hotel_codes_raw")
             if isinstance(raw_codes, str) and raw_codes.strip():
                 cfg.hotel_codes = _codes_from_name_input(raw_codes)
@@ -2081,6 +5613,33 @@ def start() -> Response:
                 'per_hotel_delay_seconds',
                 getattr(cfg, 'per_hotel_delay_seconds', DEFAULT_PER_HOTEL_DELAY_SECONDS)
             ))))
+            if "rate_limit_rps" in payload:
+                cfg.rate_limit_rps = _clamp_rps(payload.get("rate_limit_rps"), cfg.rate_limit_rps)
+            if "rate_limit_burst" in payload:
+                cfg.rate_limit_burst = _clamp_burst(payload.get("rate_limit_burst"), cfg.rate_limit_burst)
+            if "aimd_enabled" in payload:
+                cfg.aimd_enabled = bool(payload.get("aimd_enabled"))
+            if "adaptive_polling" in payload:
+                cfg.adaptive_polling = bool(payload.get("adaptive_polling"))
+            try:
+                cfg.poll_min_interval_sec = max(5, int(payload.get("poll_min_interval_sec", cfg.poll_min_interval_sec)))
+                cfg.poll_max_interval_sec = max(cfg.poll_min_interval_sec,
+                                                int(payload.get("poll_max_interval_sec", cfg.poll_max_interval_sec)))
+            except Exception:
+                pass
+            if "concurrency" in payload:
+                try:
+                    cfg.concurrency = max(1, min(MAX_CONCURRENCY, int(payload.get("concurrency"))))
+                except Exception:
+                    cfg.concurrency = DEFAULT_CONCURRENCY
+            if "selenium_pool_size" in payload:
+                try:
+                    cfg.selenium_pool_size = max(1, min(MAX_CONCURRENCY, int(payload.get("selenium_pool_size"))))
+                except Exception:
+                    cfg.selenium_pool_size = DEFAULT_SELENIUM_POOL_SIZE
+            mode = str(payload.get("execution_mode", cfg.execution_mode))
+            if mode in {"thread", "process"}:
+                cfg.execution_mode = mode
             p = int(payload.get("people", cfg.people))
             cfg.people = max(1, min(5, p))
             r = int(payload.get("rooms", cfg.rooms))
@@ -2135,12 +5694,28 @@ def start() -> Response:
             cfg.available_alert_repeat_interval_sec = int(
                 payload.get("available_alert_repeat_interval_sec", DEFAULT_AVAILABLE_ALERT_REPEAT_INTERVAL_SEC))
             eng = str(payload.get("engine", cfg.engine))
-            if eng not in {"selenium", "playwright"}:
+            if eng not in {"selenium", "playwright", "http"}:
                 eng = cfg.engine
             # If user picked playwright but it's not installed, fallback silently to selenium
             if eng == "playwright" and not _HAS_PLAYWRIGHT:
                 eng = "selenium"
             cfg.engine = eng
+            pb = str(payload.get("parser_backend", cfg.parser_backend))
+            if pb in PARSER_BACKENDS:
+                cfg.parser_backend = pb
+            if "playwright_capture" in payload:
+                cfg.playwright_capture = bool(payload.get("playwright_capture"))
+            if "in_page_extract" in payload:
+                cfg.in_page_extract = bool(payload.get("in_page_extract"))
+            if "block_resources" in payload:
+                cfg.block_resources = bool(payload.get("block_resources"))
+            if "block_allow" in payload:
+                cfg.block_allow = str(payload.get("block_allow") or "")
+            if "block_deny" in payload:
+                cfg.block_deny = str(payload.get("block_deny") or "")
+            if "record_dir" in payload:
+                cfg.record_dir = str(payload.get("record_dir") or "").strip()
+        _bump_version("config")
 
         # Mark that user explicitly wants the worker to run
         _RUN_REQUESTED = True
@@ -2150,24 +5725,19 @@ def start() -> Response:
 
         # Reset and Restart worker
         _set_action(
-            f"[start] hotels={len(_CONFIG.hotel_codes)} | {_CONFIG.start_date} → {_CONFIG.end_date} | people={_CONFIG.people}, rooms={_CONFIG.rooms}, smoking={_CONFIG.smoking}")
+            f"[start] hotels={len(_CONFIG.hotel_codes)} | {_format_ranges(_watch_ranges(_CONFIG))} | people={_CONFIG.people}, rooms={_CONFIG.rooms}, smoking={_CONFIG.smoking}")
 
         _stop_event.set()
         if _worker_thread and _worker_thread.is_alive():
             _worker_thread.join(timeout=2)
         _stop_event.clear()
 
-        with _DRIVER_LOCK:
-            if _driver is not None:
-                try:
-                    _driver.quit()
-                except Exception:
-                    pass
-                _driver = None
+        _close_selenium_pool()
 
         with _RESULTS_LOCK:
             global _LAST_RESULTS
             _LAST_RESULTS = []
+        _bump_version("results")
         _ALERT_STATE.clear()
 
         _worker_thread = threading.Thread(target=_worker_loop, name="checker-thread", daemon=True)
@@ -2178,7 +5748,7 @@ def start() -> Response:
         try:
             _send_start_notifications(_CONFIG)
         except Exception as e:
-            _log(f"[start] could not send start notifications: {e}")
+            _log(f"[start] could not send start notifications: {e}", level="warning")
 
         return jsonify({"ok": True, "message": "started", "config": asdict(_CONFIG)})
 
@@ -2190,14 +5760,7 @@ def stop() -> Response:
         if _worker_thread and _worker_thread.is_alive():
             _worker_thread.join(timeout=2)
         _worker_thread = None
-        with _DRIVER_LOCK:
-            global _driver
-            if _driver is not None:
-                try:
-                    _driver.quit()
-                except Exception:
-                    pass
-                _driver = None
+        _close_selenium_pool()
         with _PROGRESS_LOCK:
             _PROGRESS["round"] = 0
             _PROGRESS["done"] = 0
@@ -2211,67 +5774,294 @@ def stop() -> Response:
         _log("Stopped worker.")
         return jsonify({"ok": True, "message": "stopped"})
 
+def _config_snapshot() -> Dict[str, Any]:
+    with _CONFIG_LOCK:
+        return asdict(_CONFIG)
+
+
+def _results_snapshot() -> List[Dict[str, Any]]:
+    with _RESULTS_LOCK:
+        return [asdict(r) for r in _LAST_RESULTS]
+
+
+def _status_payload(since: Dict[str, Optional[int]], diag: bool, with_logs: bool = True) -> Optional[Dict[str, Any]]:
+    """
+    The /status body. With versions in `since` only the parts that moved are
+    included (see status()); None when nothing moved and the worker is idle.
+    Without `with_logs` the log lines are left out (clients reading /logs).
+    """
+    delta = any(v is not None for v in since.values())
+    ver = _versions()
+    try:
+        running = bool(_RUN_REQUESTED and _worker_thread and _worker_thread.is_alive())
+    except NameError:
+        running = bool(_worker_thread and _worker_thread.is_alive())
+    if delta and not running and all(since[k] == ver[k] for k in since):
+        return None
+
+    logs_since = since["logs"] if delta and since["logs"] is not None else None
+    if with_logs:
+        entries, seq, truncated = _log_entries(logs_since if logs_since is not None else 0)
+        logs_delta = logs_since is not None and not truncated and logs_since <= seq
+        if logs_since is not None and not logs_delta:
+            entries, seq, _ = _log_entries(0)
+        logs = [_format_log_entry(e) for e in entries[-300:]]
+    else:
+        with _LOG_LOCK:
+            seq = _LOG_SEQ
+    ver["logs"] = seq
+    with _PROGRESS_LOCK:
+        progress = dict(_PROGRESS)
+
+    now_ts = _now_wall()
+    now_mono = _now_mono()
+
+    rs_wall = float(progress.get("round_started") or 0.0)
+    rs_mono = float(progress.get("round_started_mono") or 0.0)
+
+    if running and _UPTIME_STARTED_MONO:
+        progress["uptime_sec"] = int(now_mono - _UPTIME_STARTED_MONO)
+    else:
+        progress["uptime_sec"] = 0
+
+    if running and rs_mono > 0.0:
+        progress["round_elapsed_sec"] = int(now_mono - rs_mono)
+    else:
+        progress["round_elapsed_sec"] = 0
+
+    with _ACTION_LOCK:
+        action = _CURRENT_ACTION
+        action_ts = _ACTION_TS
+    action_age_sec = int(now_ts - action_ts) if action_ts else None
+
+    def _fmt_secs(s: int) -> str:
+        d, rem = divmod(int(s), 86400)
+        h, rem = divmod(rem, 3600)
+        m, sec = divmod(rem, 60)
+        parts = []
+        if d: parts.append(f"{d}d")
+        if h or d: parts.append(f"{h}h")
+        if m or h or d: parts.append(f"{m}m")
+        parts.append(f"{sec}s")
+        return " ".join(parts)
+
+    progress["uptime_human"] = _fmt_secs(progress["uptime_sec"])
+    progress["round_elapsed_human"] = _fmt_secs(progress["round_elapsed_sec"])
+    out = {
+        "ok": True,
+        "running": running,
+        "versions": ver,
+        "delta": delta,
+        "progress": progress,
+        "action": action,
+        "action_ts": action_ts,
+        "action_age_sec": action_age_sec,
+    }
+    if with_logs:
+        out["logs"] = logs
+        out["logs_delta"] = logs_delta
+    if not delta or since["config"] != ver["config"]:
+        out["config"] = _cached_snapshot("config", ver["config"], _config_snapshot)
+    if not delta or since["results"] != ver["results"]:
+        out["results"] = _cached_snapshot("results", ver["results"], _results_snapshot)
+    if not delta or since["timings"] != ver["timings"]:
+        out["timings"] = _cached_snapshot("timings", ver["timings"], _timing_stats)
+    if not diag:
+        return out
+    with _CONFIG_LOCK:
+        parser_backend = _CONFIG.parser_backend
+    out.update({
+        "browser_pool": _playwright_pool_stats(),
+        "selenium_pool": _selenium_pool_stats(),
+        "render_processes": _render_process_stats(),
+        "http_engine": _http_stats(),
+        "parser_backend": _resolve_parser_backend(parser_backend),
+        "resource_blocking": _block_stats_snapshot(),
+        "readiness": _ready_stats(),
+        "adaptive_polling": _poll_stats(),
+        "rate_limiter": _rate_limiter_stats(),
+        "pacing": _aimd_stats(),
+        "circuit_breakers": _circuit_stats(),
+        "content_cache": _content_stats(),
+        "in_page_extract": _in_page_stats(),
+    })
+    return out
+
+
+_STATUS_PARTS = ("config", "results", "logs", "timings", "state")
+
+
 @app.route("/status")
 def status() -> Response:
-        with _CONFIG_LOCK:
-            cfg = asdict(_CONFIG)
-        with _RESULTS_LOCK:
-            results = [asdict(r) for r in _LAST_RESULTS]
-        with _LOG_LOCK:
-            logs = list(_LOG_LINES[-300:])
-        with _PROGRESS_LOCK:
-            progress = dict(_PROGRESS)
+        """
+        Full snapshot, or with <part>_v=N query arguments (from a previous "versions")
+        only the parts that moved: config/results/timings are left out when unchanged,
+        logs holds only the new lines, and diagnostics need ?diag=1.
+        ?logs=0 leaves the log lines out (see /logs).
+        304 when nothing at all moved and the worker is idle.
+        """
+        since = {k: request.args.get(f"{k}_v", type=int) for k in _STATUS_PARTS}
+        delta = any(v is not None for v in since.values())
+        out = _status_payload(since, diag=not delta or request.args.get("diag") in ("1", "true"),
+                              with_logs=request.args.get("logs") != "0")
+        if out is None:
+            return Response(status=304)
+        return jsonify(out)
 
-        now_ts = _now_wall()
-        now_mono = _now_mono()
+def _sse(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, separators=(',', ':'))}\n\n"
 
-        rs_wall = float(progress.get("round_started") or 0.0)
-        rs_mono = float(progress.get("round_started_mono") or 0.0)
 
+@app.route("/events")
+def events() -> Response:
+        """
+        Server-sent events: a full "status" snapshot on connect, then a "status"
+        delta (same shape as /status with versions) whenever something moves,
+        and a "result" event for each finished check. Nothing is sent to idle
+        clients but a keep-alive comment every EVENT_KEEPALIVE_SEC. ?logs=0 as for /status.
+        """
+        with_logs = request.args.get("logs") != "0"
+
+        def stream():
+            sub = _EVENTS.subscribe()
+            try:
+                since: Dict[str, Optional[int]] = {k: None for k in _STATUS_PARTS}
+                pending = True
+                while True:
+                    if pending:
+                        out = _status_payload(since, diag=False, with_logs=with_logs)
+                        if out is not None:
+                            since = dict(out["versions"])
+                            yield _sse("status", out)
+                        pending = False
+                    try:
+                        items = [sub.get(timeout=EVENT_KEEPALIVE_SEC)]
+                    except queue.Empty:
+                        yield ": keep-alive\n\n"
+                        continue
+                    while True:  # coalesce bursts into one status delta
+                        try:
+                            items.append(sub.get_nowait())
+                        except queue.Empty:
+                            break
+                    for event, data in items:
+                        if event == "result":
+                            yield _sse("result", data)
+                        elif event == "resync":
+                            since = {k: None for k in _STATUS_PARTS}
+                            pending = True
+                        else:
+                            pending = True
+            finally:
+                _EVENTS.unsubscribe(sub)
+
+        return Response(stream(), mimetype="text/event-stream",
+                        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@app.route("/logs")
+def logs() -> Response:
+        """
+        Log entries after ?since=<seq> (default 0), oldest first, at most ?limit= of them.
+        ?level= keeps that level and above; ?source= keeps one source.
+        Pass "next" back as since to page forward; "truncated" means entries after since were already dropped.
+        """
         try:
-            running = bool(_RUN_REQUESTED and _worker_thread and _worker_thread.is_alive())
-        except NameError:
-            running = bool(_worker_thread and _worker_thread.is_alive())
+            since = max(0, int(request.args.get("since", 0)))
+            limit = min(LOG_PAGE_MAX, max(1, int(request.args.get("limit", LOG_PAGE_MAX))))
+        except ValueError as e:
+            return jsonify({"ok": False, "error": str(e)}), 400
+        level = request.args.get("level") or None
+        if level is not None and level not in LOG_LEVELS:
+            return jsonify({"ok": False, "error": f"level must be one of {', '.join(LOG_LEVELS)}"}), 400
+        source = request.args.get("source") or None
+        entries, seq, truncated = _log_entries(since)
+        out = []
+        next_seq = seq
+        for e in entries:
+            if level is not None and LOG_LEVELS.get(e["level"], 0) < LOG_LEVELS[level]:
+                continue
+            if source is not None and e["source"] != source:
+                continue
+            if len(out) == limit:
+                next_seq = out[-1]["seq"]
+                break
+            out.append(e)
+        return jsonify({"ok": True, "entries": out, "next": next_seq, "seq": seq, "truncated": truncated})
 
-        if running and _UPTIME_STARTED_MONO:
-            progress["uptime_sec"] = int(now_mono - _UPTIME_STARTED_MONO)
-        else:
-            progress["uptime_sec"] = 0
+@app.route("/metrics")
+def metrics() -> Response:
+    return Response(render_metrics(), content_type="text/plain; version=0.0.4; charset=utf-8")
 
-        if running and rs_mono > 0.0:
-            progress["round_elapsed_sec"] = int(now_mono - rs_mono)
-        else:
-            progress["round_elapsed_sec"] = 0
-
-        with _ACTION_LOCK:
-            action = _CURRENT_ACTION
-            action_ts = _ACTION_TS
-        action_age_sec = int(now_ts - action_ts) if action_ts else None
-
-        def _fmt_secs(s: int) -> str:
-            d, rem = divmod(int(s), 86400)
-            h, rem = divmod(rem, 3600)
-            m, sec = divmod(rem, 60)
-            parts = []
-            if d: parts.append(f"{d}d")
-            if h or d: parts.append(f"{h}h")
-            if m or h or d: parts.append(f"{m}m")
-            parts.append(f"{sec}s")
-            return " ".join(parts)
-
-        progress["uptime_human"] = _fmt_secs(progress["uptime_sec"])
-        progress["round_elapsed_human"] = _fmt_secs(progress["round_elapsed_sec"])
-        return jsonify({
-            "ok": True,
-            "running": running,
-            "config": cfg,
-            "results": results,
-            "logs": logs,
-            "progress": progress,
-            "action": action,
-            "action_ts": action_ts,
-            "action_age_sec": action_age_sec,
-        })
+# ---- Diagnostics: sampling profiler and tracemalloc ----
+@app.route("/debug/profile")
+def debug_profile() -> Response:
+        """
+        Sample thread stacks for ?seconds= (default 10) and return the report as text.
+        ?format=collapsed (default, for flame graphs) or top; ?thread= keeps threads whose name contains it.
+        """
+        try:
+            seconds = min(PROFILE_MAX_SECONDS, max(0.1, float(request.args.get("seconds", 10))))
+            interval_ms = max(1.0, float(request.args.get("interval_ms", PROFILE_DEFAULT_INTERVAL_MS)))
+        except ValueError as e:
+            return jsonify({"ok": False, "error": str(e)}), 400
+        fmt = request.args.get("format", "collapsed")
+        if fmt not in ("collapsed", "top"):
+            return jsonify({"ok": False, "error": "format must be collapsed or top"}), 400
+        if not _PROFILE_LOCK.acquire(blocking=False):
+            return jsonify({"ok": False, "error": "a profile is already running"}), 409
+        try:
+            counts, _ = sample_stacks(seconds, interval_ms / 1000.0, request.args.get("thread", ""))
+        finally:
+            _PROFILE_LOCK.release()
+        body = format_collapsed(counts) if fmt == "collapsed" else format_top(counts)
+        return Response(body, content_type="text/plain; charset=utf-8")
+
+def _tm_args() -> Tuple[str, int]:
+    key = request.args.get("key", "lineno")
+    if key not in ("lineno", "traceback", "filename"):
+        raise ValueError("key must be lineno, traceback or filename")
+    return key, max(1, int(request.args.get("limit", TRACEMALLOC_TOP)))
+
+@app.route("/debug/tracemalloc")
+def debug_tracemalloc() -> Response:
+        return jsonify({"ok": True, **tracemalloc_status()})
+
+@app.route("/debug/tracemalloc/start", methods=["POST"])
+def debug_tracemalloc_start() -> Response:
+        payload = request.get_json(silent=True) or {}
+        try:
+            frames = max(1, int(payload.get("frames", request.args.get("frames", TRACEMALLOC_DEFAULT_FRAMES))))
+        except (TypeError, ValueError) as e:
+            return jsonify({"ok": False, "error": str(e)}), 400
+        return jsonify({"ok": True, **tracemalloc_start(frames)})
+
+@app.route("/debug/tracemalloc/stop", methods=["POST"])
+def debug_tracemalloc_stop() -> Response:
+        return jsonify({"ok": True, **tracemalloc_stop()})
+
+@app.route("/debug/tracemalloc/snapshot", methods=["POST"])
+def debug_tracemalloc_snapshot() -> Response:
+        if not tracemalloc.is_tracing():
+            return jsonify({"ok": False, "error": "tracemalloc is not running; POST /debug/tracemalloc/start first"}), 409
+        try:
+            key, limit = _tm_args()
+        except ValueError as e:
+            return jsonify({"ok": False, "error": str(e)}), 400
+        return jsonify({"ok": True, **tracemalloc_snapshot(key, limit)})
+
+@app.route("/debug/tracemalloc/diff")
+def debug_tracemalloc_diff() -> Response:
+        """Growth since the last snapshot; ?rebase=1 makes this snapshot the new baseline."""
+        if not tracemalloc.is_tracing():
+            return jsonify({"ok": False, "error": "tracemalloc is not running; POST /debug/tracemalloc/start first"}), 409
+        try:
+            key, limit = _tm_args()
+        except ValueError as e:
+            return jsonify({"ok": False, "error": str(e)}), 400
+        out = tracemalloc_diff(key, limit, request.args.get("rebase") in ("1", "true"))
+        if out is None:
+            return jsonify({"ok": False, "error": "no baseline; POST /debug/tracemalloc/snapshot first"}), 409
+        return jsonify({"ok": True, **out})
 
 @app.route("/save", methods=["POST"])
 def save() -> Response:
@@ -2280,6 +6070,8 @@ def save() -> Response:
         cfg = _CONFIG
         cfg.start_date = payload.get("start_date", cfg.start_date)
         cfg.end_date = payload.get("end_date", cfg.end_date)
+        if "extra_date_ranges" in payload:
+            cfg.extra_date_ranges = _parse_date_ranges(payload.get("extra_date_ranges"))
         raw_codes = payload.get("hotel_codes_raw")
         if isinstance(raw_codes, str) and raw_codes.strip():
             cfg.hotel_codes = _codes_from_name_input(raw_codes)
@@ -2344,16 +6136,69 @@ def save() -> Response:
 
         if "engine" in payload:
             eng = str(payload["engine"])
-            if eng in {"selenium", "playwright"}:
+            if eng in {"selenium", "playwright", "http"}:
                 if eng == "playwright" and not _HAS_PLAYWRIGHT:
                     eng = "selenium"
                 cfg.engine = eng
+        if "parser_backend" in payload:
+            pb = str(payload["parser_backend"])
+            if pb in PARSER_BACKENDS:
+                cfg.parser_backend = pb
+        if "playwright_capture" in payload:
+            cfg.playwright_capture = bool(payload["playwright_capture"])
+        if "in_page_extract" in payload:
+            cfg.in_page_extract = bool(payload["in_page_extract"])
+        if "block_resources" in payload:
+            cfg.block_resources = bool(payload["block_resources"])
+        if "block_allow" in payload:
+            cfg.block_allow = str(payload["block_allow"] or "")
+        if "block_deny" in payload:
+            cfg.block_deny = str(payload["block_deny"] or "")
+        if "record_dir" in payload:
+            cfg.record_dir = str(payload["record_dir"] or "").strip()
 
         if "per_hotel_delay_seconds" in payload:
             try:
                 cfg.per_hotel_delay_seconds = max(1, min(30, int(payload["per_hotel_delay_seconds"])))
             except Exception:
                 pass
+        if "rate_limit_rps" in payload or "rate_limit_burst" in payload:
+            cfg.rate_limit_rps = _clamp_rps(payload.get("rate_limit_rps", cfg.rate_limit_rps), cfg.rate_limit_rps)
+            cfg.rate_limit_burst = _clamp_burst(payload.get("rate_limit_burst", cfg.rate_limit_burst), cfg.rate_limit_burst)
+            ctl = _AIMD
+            if ctl is not None:
+                # live retune under AIMD: move the ceiling, keep any backoff in progress
+                ctl.retune()
+            elif _RATE_LIMITER is not None:
+                # live retune of a running tracker
+                _configure_rate_limiter(cfg)
+        if "aimd_enabled" in payload:
+            cfg.aimd_enabled = bool(payload["aimd_enabled"])
+
+        if "concurrency" in payload:
+            try:
+                cfg.concurrency = max(1, min(MAX_CONCURRENCY, int(payload["concurrency"])))
+            except Exception:
+                pass
+        if "selenium_pool_size" in payload:
+            try:
+                cfg.selenium_pool_size = max(1, min(MAX_CONCURRENCY, int(payload["selenium_pool_size"])))
+            except Exception:
+                pass
+        if "execution_mode" in payload:
+            mode = str(payload["execution_mode"])
+            if mode in {"thread", "process"}:
+                cfg.execution_mode = mode
+        if "adaptive_polling" in payload:
+            cfg.adaptive_polling = bool(payload["adaptive_polling"])
+        try:
+            if "poll_min_interval_sec" in payload:
+                cfg.poll_min_interval_sec = max(5, int(payload["poll_min_interval_sec"]))
+            if "poll_max_interval_sec" in payload:
+                cfg.poll_max_interval_sec = max(cfg.poll_min_interval_sec, int(payload["poll_max_interval_sec"]))
+        except Exception:
+            pass
+    _bump_version("config")
 
     ok = _save_config_to_file(SAVE_PATH)
     return jsonify({"ok": ok, "path": SAVE_PATH})
@@ -2372,7 +6217,7 @@ def hotel_lib_update() -> Response:
             _launch_terminal_for_hotel_scan()
             return jsonify({"ok": True, "message": "HotelNameLibUpdate started in a new terminal"})
         except Exception as e:
-            _log(f"[hotel_lib_update] failed: {e}")
+            _log(f"[hotel_lib_update] failed: {e}", level="error")
             return jsonify({"ok": False, "error": str(e)}), 500
 
  # ========= Startup Helper: Port and Browser =========
@@ -2459,6 +6304,9 @@ def _launch_terminal_for_hotel_scan() -> None:
 
 # ========= Application Entry Point =========
 def main() -> None:
+        # Render worker processes are spawned: a frozen (PyInstaller) build must
+        # hand control to the child here instead of starting a second app.
+        multiprocessing.freeze_support()
         try:
             logging.getLogger('werkzeug').setLevel(logging.ERROR)
         except Exception:
@@ -2468,7 +6316,7 @@ def main() -> None:
         try:
             _load_config_from_file(AUTO_SAVE_PATH)
         except Exception as e:
-            _log(f"[boot] auto-load skipped: {e}")
+            _log(f"[boot] auto-load skipped: {e}", level="warning")
 
         host = "127.0.0.1"
         port = _find_free_port(4170)
@@ -0,0 +1,574 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+离线基准 Offline benchmarks for the page-processing pipeline.
+
+  python -m toyoko_tracker.bench parsers [--corpus DIR] [--repeat N]
+  python -m toyoko_tracker.bench extract [--corpus DIR] [--repeat N]
+  python -m toyoko_tracker.bench in-page [--corpus DIR] [--repeat N]    (needs Playwright + Chromium)
+  python -m toyoko_tracker.bench pipeline [--corpus DIR] [--repeat N] [--backend B] [--update]
+  python -m toyoko_tracker.bench e2e [--duration S] [--hotels N] [--engine E] [stand-in options]
+
+Pages come from a fixture corpus (a directory of saved result pages, *.html)
+or, without one, from synthetic pages shaped like the live room-plan page.
+Every benchmark checks that the candidates produce exactly the same offers as
+the reference implementation and exits non-zero when they don't.
+
+A corpus is recorded by the tracker itself: set "Record Pages To" (record_dir)
+and each newly parsed page is saved as <code>_<start>_<end>_<fp>.html with a
+.json next to it (URL params, visible text, parsed offers and result). The
+pipeline benchmark replays those through the parse/filter path and fails when
+the offers or the result of any page differ from what was recorded.
+
+The e2e benchmark starts the local stand-in site (standin.py), points the
+tracker at it and runs the real worker loop through /start and /stop.
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from bs4 import BeautifulSoup
+
+from . import app
+
+# ---- Synthetic result pages ----
+_ROOM_TYPES = [
+    "Single Room", "Double Room", "Twin Room", "Economy Double", "Deluxe Twin",
+    "Heartful Twin Room (Accessible)", "Single Room (Smoking)", "Triple Room",
+]
+_PLANS = ["Standard Plan", "No Breakfast", "Early Bird 14 days", "Consecutive Nights", "Club Card Member Plan"]
+
+
+def _css(name: str, rnd: random.Random) -> str:
+    """CSS-module style class name, e.g. SearchResultRoomPlanChildCard_price__x7Yq2."""
+    return f"{name}__{''.join(rnd.choice('abcdefghijkLMNOPQ0123456789') for _ in range(5))}"
+
+
+def synthetic_result_page(seed: int = 0, rooms: int = 8, plans: int = 4, orphans: int = 2,
+                          sold_out: bool = False, filler_kb: int = 300) -> str:
+    """
+    A result page with the class structure the extractor relies on: parent room
+    cards holding child plan cards, a few child cards outside any parent card,
+    heartful rooms, and a large hydration payload / navigation like the real page.
+    """
+    rnd = random.Random(seed)
+    parent_card = _css("SearchResultRoomPlanParentCard_card", rnd)
+    parent_title = _css("SearchResultRoomPlanParentCard_title", rnd)
+    child_wrapper = _css("SearchResultRoomPlanChildCard_card-wrapper", rnd)
+    child_title = _css("SearchResultRoomPlanChildCard_title", rnd)
+    child_price = _css("SearchResultRoomPlanChildCard_price", rnd)
+    child_value = _css("SearchResultRoomPlanChildCard_value", rnd)
+    member_section = _css("SearchResultRoomPlanChildCard_member-section", rnd)
+
+    def child_card() -> str:
+        price = rnd.randrange(5800, 18000, 100)
+        member = price - rnd.randrange(200, 900, 100)
+        left = rnd.choice(["Only 1 Room Left", "Only 3 Rooms Left", "Reserve", "Reserve", "Sold out"])
+        price_html = (f"<span class='{child_value}'>¥{price:,}</span>" if rnd.random() > 0.1
+                      else f"<span>Total</span> <em>¥ {price:,}</em>")
+        return (
+            f"<div class='{child_wrapper}'><div class='SearchResultRoomPlanChildCard_card__q1'>"
+            f"<p class='{child_title}'> {rnd.choice(_PLANS)} </p>"
+            f"<div class='{child_price}'><span class='label'>Non-member</span> {price_html}</div>"
+            f"<div class='{member_section}'><span>Club Card Member Price</span>"
+            f"<span class='{child_value}'>¥{member:,}</span></div>"
+            f"<button class='SearchResultRoomPlanChildCard_button__zz'>{left}</button>"
+            f"</div></div>"
+        )
+
+    cards = []
+    if not sold_out:
+        for _ in range(rooms):
+            kids = "".join(child_card() for _ in range(rnd.randint(1, plans)))
+            cards.append(
+                f"<div class='{parent_card}'><div class='SearchResultRoomPlanParentCard_header__a'>"
+                f"<img src='/room.jpg' alt=''><h3 class='{parent_title}'>{rnd.choice(_ROOM_TYPES)}</h3>"
+                f"<ul><li>Bed width 140cm</li><li>Non-smoking</li></ul></div>"
+                f"<div class='SearchResultRoomPlanParentCard_plans__b'>{kids}</div></div>"
+            )
+        if orphans:
+            cards.append(f"<section><h3 class='{parent_title}'>{rnd.choice(_ROOM_TYPES)}</h3></section>")
+            cards.extend(child_card() for _ in range(orphans))
+        body = "".join(cards)
+    else:
+        body = "<div class='SearchResultEmpty_message__c'>No rooms available for the selected dates.</div>"
+
+    nav = "".join(f"<li><a href='/eng/hotel/{i:05d}'>Hotel {i:05d}</a></li>" for i in range(300))
+    filler = "".join(
+        f'{{"id":{i},"k":"{"".join(rnd.choice("abcdefghij") for _ in range(24))}"}},'
+        for i in range(max(0, filler_kb) * 1024 // 40)
+    )
+    return (
+        "<!DOCTYPE html><html lang='en'><head><meta charset='utf-8'>"
+        "<title>Toyoko Inn Tokyo Kamata No.1 | Room plans</title></head><body>"
+        f"<header><nav><ul>{nav}</ul></nav></header><main>"
+        "<h1 class='room_plan_title__h'>Toyoko Inn Tokyo Kamata No.1</h1>"
+        f"<div class='SearchResultRoomPlanList_list__l'>{body}</div></main>"
+        f"<footer><p>© TOYOKO INN CO., LTD.</p></footer>"
+        f"<script id='__NEXT_DATA__' type='application/json'>{{\"props\":[{filler}{{}}]}}</script>"
+        "</body></html>"
+    )
+
+
+def load_corpus(path: str) -> List[Tuple[str, str]]:
+    """(name, html) for every *.html file under `path`."""
+    files = sorted(Path(path).rglob("*.html"))
+    return [(f.name, f.read_text(encoding="utf-8", errors="replace")) for f in files]
+
+
+@dataclass
+class Fixture:
+    name: str
+    html: str
+    meta: Dict[str, Any] = field(default_factory=dict)
+    path: Optional[Path] = None  # the .json sidecar; None for synthetic pages
+
+
+def load_fixtures(path: str) -> List[Fixture]:
+    """Recorded pages under `path`: every *.html that has a .json sidecar."""
+    out = []
+    for f in sorted(Path(path).rglob("*.html")):
+        side = f.with_suffix(".json")
+        if not side.exists():
+            continue
+        meta = json.loads(side.read_text(encoding="utf-8"))
+        out.append(Fixture(f.name, f.read_text(encoding="utf-8", errors="replace"), meta, side))
+    return out
+
+
+def synthetic_fixtures() -> List[Fixture]:
+    """Synthetic pages with sidecars filled in from the current code (speed only, no regression check)."""
+    out = []
+    for i, (name, html) in enumerate(synthetic_corpus()):
+        code = f"{i + 1:05d}"
+        meta = {
+            "url": f"{app.BASE_URL}?hotel={code}&start=2026-11-01&end=2026-11-02",
+            "code": code, "start_date": "2026-11-01", "end_date": "2026-11-02",
+            "params": {}, "ready_state": "offers", "visible_text": "",
+        }
+        out.append(Fixture(name, html, meta))
+    return out
+
+
+def synthetic_corpus() -> List[Tuple[str, str]]:
+    pages = [(f"synthetic-{i}.html", synthetic_result_page(seed=i)) for i in range(6)]
+    pages.append(("synthetic-sold-out.html", synthetic_result_page(seed=99, sold_out=True)))
+    return pages
+
+
+def _time_per_page(fn: Callable[[str], object], html: str, repeat: int) -> float:
+    samples = []
+    for _ in range(max(1, repeat)):
+        t0 = time.perf_counter()
+        fn(html)
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples)
+
+
+def _report(title: str, names: List[str], timings: Dict[str, List[float]], mismatches: Dict[str, List[str]],
+            reference: str) -> int:
+    print(title)
+    ref_total = sum(timings[reference])
+    print(f"  {'candidate':<14} {'ms/page':>9} {'speedup':>8}  mismatches")
+    for name in names:
+        total = sum(timings[name])
+        per_page = total / max(1, len(timings[name])) * 1000.0
+        speedup = ref_total / total if total else float("inf")
+        bad = mismatches.get(name) or []
+        print(f"  {name:<14} {per_page:>9.2f} {speedup:>7.2f}x  {len(bad)}" + (f" ({', '.join(bad[:5])})" if bad else ""))
+    return 1 if any(mismatches.values()) else 0
+
+
+# ---- Reference implementations ----
+def extract_offers_two_pass(soup: BeautifulSoup):
+    """The original extractor (select parent cards, then every child card again with
+    find_parent / find_previous), kept as the reference for app.extract_offers."""
+    collector = app._OfferCollector()
+
+    def _extract_one_child(child, room_title):
+        plan_name = None
+        plan_el = child.select_one('[class*="SearchResultRoomPlanChildCard_title"]')
+        if plan_el:
+            plan_name = plan_el.get_text(strip=True) or None
+        price_value_text = None
+        price_block_text = None
+        price_block = child.select_one('div[class*="SearchResultRoomPlanChildCard_price"]')
+        if price_block:
+            val_el = price_block.select_one('span[class*="SearchResultRoomPlanChildCard_value"]')
+            if val_el:
+                price_value_text = val_el.get_text(strip=True)
+            else:
+                price_block_text = price_block.get_text(" ", strip=True)
+        mem_el = child.select_one(
+            'div[class*="SearchResultRoomPlanChildCard_member-section"] '
+            'span[class*="SearchResultRoomPlanChildCard_value"]'
+        )
+        member_value_text = mem_el.get_text(strip=True) if mem_el else None
+        collector.add(room_title, plan_name, price_value_text, price_block_text,
+                      member_value_text, child.get_text(" ", strip=True))
+
+    for room_card in soup.select('div[class*="SearchResultRoomPlanParentCard_card"]'):
+        room_title = None
+        title_el = room_card.select_one('[class*="SearchResultRoomPlanParentCard_title"]')
+        if title_el:
+            room_title = title_el.get_text(strip=True)
+        for child in room_card.select('div[class*="SearchResultRoomPlanChildCard_card-wrapper"]'):
+            _extract_one_child(child, room_title)
+
+    for child in soup.select('div[class*="SearchResultRoomPlanChildCard_card-wrapper"]'):
+        if child.find_parent(attrs={"class": re.compile("SearchResultRoomPlanParentCard_card")}):
+            continue
+        room_title = None
+        title_parent = child.find_previous(attrs={"class": re.compile("SearchResultRoomPlanParentCard_title")})
+        if title_parent:
+            room_title = title_parent.get_text(strip=True)
+        _extract_one_child(child, room_title)
+
+    return collector.result()
+
+
+# ---- Benchmarks ----
+def bench_parsers(pages: List[Tuple[str, str]], repeat: int) -> int:
+    """Every installed parser backend against html.parser: identical (name, offers, stats) and ms/page."""
+    backends = ["html.parser"]
+    if app._HAS_LXML:
+        backends.append("lxml")
+    if app._HAS_SELECTOLAX:
+        backends.append("selectolax")
+    timings: Dict[str, List[float]] = {b: [] for b in backends}
+    mismatches: Dict[str, List[str]] = {b: [] for b in backends}
+    for page_name, html in pages:
+        expected = app.parse_result_html(html, "html.parser")
+        for b in backends:
+            if app.parse_result_html(html, b) != expected:
+                mismatches[b].append(page_name)
+            timings[b].append(_time_per_page(lambda h: app.parse_result_html(h, b), html, repeat))
+    return _report(f"Parser backends — {len(pages)} page(s), median of {repeat} run(s)",
+                   backends, timings, mismatches, "html.parser")
+
+
+def bench_extract(pages: List[Tuple[str, str]], repeat: int) -> int:
+    """app.extract_offers against the two-pass reference on pre-parsed trees (extraction only)."""
+    candidates = {"two-pass": extract_offers_two_pass, "single-pass": app.extract_offers}
+    timings: Dict[str, List[float]] = {n: [] for n in candidates}
+    mismatches: Dict[str, List[str]] = {n: [] for n in candidates}
+    for page_name, html in pages:
+        soup = BeautifulSoup(html, "html.parser")
+        expected = extract_offers_two_pass(soup)
+        for n, fn in candidates.items():
+            if fn(soup) != expected:
+                mismatches[n].append(page_name)
+            timings[n].append(_time_per_page(lambda _h: fn(soup), html, repeat))
+    return _report(f"Offer extraction — {len(pages)} page(s), median of {repeat} run(s)",
+                   list(candidates), timings, mismatches, "two-pass")
+
+
+def bench_in_page(pages: List[Tuple[str, str]], repeat: int) -> int:
+    """
+    In-browser extraction (_EXTRACT_OFFERS_JS) against shipping the DOM back and
+    parsing it in Python, on the same pages loaded into headless Chromium.
+    """
+    if not app._HAS_PLAYWRIGHT:
+        print("Playwright is not installed (pip install playwright && playwright install chromium)")
+        return 2
+    backend = app._resolve_parser_backend("auto")
+    dom_name = f"dom+{backend}"
+    timings: Dict[str, List[float]] = {dom_name: [], "in-page": []}
+    mismatches: Dict[str, List[str]] = {dom_name: [], "in-page": []}
+
+    with app.sync_playwright() as pw:
+        try:
+            browser = pw.chromium.launch(headless=True)
+        except Exception as e:
+            print(f"Cannot launch Chromium: {str(e).splitlines()[0]}")
+            return 2
+        try:
+            page = browser.new_page()
+            for page_name, html in pages:
+                page.set_content(html, wait_until="domcontentloaded")
+                expected = app.parse_result_html(html, "html.parser")
+
+                def _dom(_h):
+                    return app.parse_result_html(page.content(), backend)
+
+                def _in_page(_h):
+                    data = page.evaluate(app._EXTRACT_OFFERS_JS)
+                    return (data.get("n") or None,) + app.offers_from_in_page(data["c"])
+
+                for n, fn in ((dom_name, _dom), ("in-page", _in_page)):
+                    if fn(html) != expected:
+                        mismatches[n].append(page_name)
+                    timings[n].append(_time_per_page(fn, html, repeat))
+        finally:
+            browser.close()
+    return _report(f"In-page extraction — {len(pages)} page(s), median of {repeat} run(s)",
+                   [dom_name, "in-page"], timings, mismatches, dom_name)
+
+
+def _replay(fx: Fixture, cfg: "app.AppConfig") -> "app.HotelResult":
+    """One fixture through the parse/classify/filter path, as check_hotel runs it after a fetch."""
+    rendered = app.RenderedPage(None, fx.meta.get("visible_text") or "", html=fx.html)
+    rendered.ready_state = fx.meta.get("ready_state")
+    return app.result_from_page(cfg, fx.meta.get("code", ""), fx.meta.get("url", ""),
+                                fx.meta.get("start_date", ""), fx.meta.get("end_date", ""), rendered)
+
+
+def _fixture_config(fx: Fixture, backend: str) -> "app.AppConfig":
+    cfg = app.AppConfig()
+    for k, v in (fx.meta.get("params") or {}).items():
+        if hasattr(cfg, k):
+            setattr(cfg, k, v)
+    cfg.parser_backend = backend
+    return cfg
+
+
+def _jsonable(value: Any) -> Any:
+    return json.loads(json.dumps(value, ensure_ascii=False))
+
+
+def bench_pipeline(fixtures: List[Fixture], repeat: int, backend: str, update: bool) -> int:
+    """
+    Replay recorded pages through result_from_page: pages/sec, p50/p99 latency and
+    peak traced allocations per page. Fails when the parsed offers or the result
+    of a page differ from its recording (--update rewrites the recordings instead).
+    """
+    resolved = app._resolve_parser_backend(backend)
+    changed: List[str] = []
+    checked = 0
+    for fx in fixtures:
+        cfg = _fixture_config(fx, backend)
+        name, offers, stats = app.parse_result_html(fx.html, backend)
+        parsed = _jsonable({"name": name, "offers": offers, "stats": stats})
+        result = _jsonable(app.recorded_result_fields(_replay(fx, cfg)))
+        if fx.path is None:
+            continue
+        if update:
+            fx.meta["expected"], fx.meta["result"] = parsed, result
+            fx.path.write_text(json.dumps(fx.meta, ensure_ascii=False, indent=1), encoding="utf-8")
+            continue
+        checked += 1
+        diffs = []
+        if fx.meta.get("expected") != parsed:
+            diffs.append("offers")
+        if fx.meta.get("result") != result:
+            diffs.append("result")
+        if diffs:
+            changed.append(f"{fx.name} ({'/'.join(diffs)})")
+
+    samples: List[float] = []
+    t_start = time.perf_counter()
+    for _ in range(max(1, repeat)):
+        for fx in fixtures:
+            cfg = _fixture_config(fx, backend)
+            t0 = time.perf_counter()
+            _replay(fx, cfg)
+            samples.append((time.perf_counter() - t0) * 1000.0)
+    wall = time.perf_counter() - t_start
+
+    peaks: List[float] = []
+    tracemalloc.start()
+    try:
+        for fx in fixtures:
+            cfg = _fixture_config(fx, backend)
+            tracemalloc.reset_peak()
+            base, _ = tracemalloc.get_traced_memory()
+            _replay(fx, cfg)
+            peaks.append((tracemalloc.get_traced_memory()[1] - base) / 1024.0)
+    finally:
+        tracemalloc.stop()
+
+    samples.sort()
+    peaks.sort()
+    print(f"Check pipeline — {len(fixtures)} page(s) x {repeat}, parser {resolved}")
+    print(f"  pages/sec      {len(samples) / wall:>10.1f}")
+    print(f"  latency p50    {app._percentile(samples, 0.50):>10.2f} ms")
+    print(f"  latency p99    {app._percentile(samples, 0.99):>10.2f} ms")
+    print(f"  alloc peak p50 {app._percentile(peaks, 0.50):>10.0f} KiB/page")
+    print(f"  alloc peak max {peaks[-1]:>10.0f} KiB/page")
+    if update:
+        print(f"  updated {sum(1 for fx in fixtures if fx.path is not None)} recording(s)")
+        return 0
+    if not checked:
+        print("  (synthetic pages: nothing recorded to compare against)")
+    print(f"  changed        {len(changed):>10d} of {checked}")
+    for line in changed[:20]:
+        print(f"    {line}")
+    return 1 if changed else 0
+
+
+def _rss_mb() -> Optional[float]:
+    if app._HAS_PSUTIL:
+        return app.psutil.Process().memory_info().rss / (1024.0 * 1024.0)
+    try:
+        with open("/proc/self/statm") as f:  # Linux without psutil
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024.0 * 1024.0)
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def bench_e2e(args: argparse.Namespace) -> int:
+    """
+    Drive the worker loop against the stand-in site for args.duration seconds:
+    rounds/minute, detection latency (stand-in flip to alert) and memory over the run.
+    The tracker's own check results are tallied by outcome and error kind; any
+    failed check makes the run exit non-zero.
+    """
+    from . import standin
+
+    site = standin.StandInSite(standin.settings_from_args(args), args.corpus)
+    server = standin.serve(site)
+    app.BASE_URL = os.environ["TOYOKO_BASE_URL"] = standin.base_url(server)  # env: render worker processes
+    tmp = tempfile.mkdtemp(prefix="toyoko-bench-")
+    app.AUTO_SAVE_PATH = os.path.join(tmp, "auto_save.json")
+    app.SAVE_PATH = os.path.join(tmp, "save.json")
+    if not args.verbose:
+        app._safe_print = lambda *_a, **_k: None
+
+    # Alert transitions as process_notifications sees them, timed against the stand-in's schedule
+    t_begin = time.time()
+    detections: List[float] = []
+    alerts = {"available": 0}
+    outcomes: Dict[str, int] = {}
+    errors: Dict[str, int] = {}
+    real_process_notifications = app.process_notifications
+
+    def _observed(cfg, results, default_start, default_end):
+        now = time.time()
+        for r in results:
+            outcome = "available" if r.available else ("sold_out" if r.available is False else "unknown")
+            outcomes[outcome] = outcomes.get(outcome, 0) + 1
+            if r.error:
+                errors[r.error] = errors.get(r.error, 0) + 1
+            key = f"{r.code}|{r.start_date or default_start}|{r.end_date or default_end}"
+            was = app._ALERT_STATE.get(key, {}).get("available", False)
+            if r.available and not was and not r.requirement_unmet:
+                alerts["available"] += 1
+                since = site.available_since(key, now)
+                if since is not None and since >= t_begin:
+                    detections.append(now - since)
+        real_process_notifications(cfg, results, default_start, default_end)
+
+    app.process_notifications = _observed
+    codes = [f"{i + 1:05d}" for i in range(args.hotels)]
+    start_date, end_date = "2026-12-01", "2026-12-02"
+    client = app.app.test_client()
+    resp = client.post("/start", json={
+        "hotel_codes": codes, "start_date": start_date, "end_date": end_date,
+        "engine": args.engine, "loop_interval_seconds": args.loop_interval,
+        "concurrency": args.concurrency, "rate_limit_rps": args.rps, "rate_limit_burst": max(1, args.concurrency),
+        "enable_telegram": False, "enable_email": False, "enable_local": False,
+    })
+    if resp.status_code != 200:
+        print(f"/start failed: HTTP {resp.status_code}")
+        return 2
+
+    rss: List[Tuple[float, float]] = []
+    try:
+        deadline = time.time() + args.duration
+        while time.time() < deadline:
+            mb = _rss_mb()
+            if mb is not None:
+                rss.append((time.time() - t_begin, mb))
+            time.sleep(min(args.sample_every, max(0.0, deadline - time.time())))
+        with app._PROGRESS_LOCK:
+            rounds = app._PROGRESS["round"]
+    finally:
+        client.post("/stop")
+        app.process_notifications = real_process_notifications
+        server.shutdown()
+    t_end = time.time()
+    elapsed = t_end - t_begin
+
+    keys = [f"{c}|{start_date}|{end_date}" for c in codes]
+    flips = sum(site.flips_to_available(k, t_begin, t_end) for k in keys)
+    served = site.state()["counts"]
+    lat = sorted(detections)
+    print(f"End-to-end — {args.hotels} hotel(s), engine {args.engine}, {elapsed:.0f}s against {app.BASE_URL}")
+    print(f"  rounds            {rounds:>10d}  ({rounds / elapsed * 60.0:.1f}/min)")
+    print(f"  requests          {served['requests']:>10d}  ({served['requests'] / elapsed:.1f}/s; "
+          f"{served['available']} available, {served['sold_out']} sold out, "
+          f"{served['blocked']} blocked, {served['error']} errors)")
+    checked = sum(outcomes.values())
+    failed = sum(errors.values())
+    kinds = ", ".join(f"{n} {kind}" for kind, n in sorted(errors.items()))
+    print(f"  checks            {checked:>10d}  ({outcomes.get('available', 0)} available, "
+          f"{outcomes.get('sold_out', 0)} sold out, {outcomes.get('unknown', 0)} unknown; "
+          f"{failed} failed" + (f": {kinds})" if kinds else ")"))
+    print(f"  flips detected    {len(lat):>10d} of {flips} (alerts sent: {alerts['available']})")
+    if lat:
+        print(f"  detection p50     {app._percentile(lat, 0.50):>10.1f} s")
+        print(f"  detection p90     {app._percentile(lat, 0.90):>10.1f} s")
+        print(f"  detection max     {lat[-1]:>10.1f} s")
+    if rss:
+        first, last, peak = rss[0][1], rss[-1][1], max(mb for _, mb in rss)
+        # Growth rate after warm-up: from the first sample past a quarter of the run
+        warm = next((s for s in rss if s[0] >= elapsed / 4), rss[0])
+        span_h = max(1e-9, (rss[-1][0] - warm[0]) / 3600.0)
+        print(f"  RSS start/end/max {first:>7.1f} / {last:.1f} / {peak:.1f} MB  "
+              f"({(last - warm[1]) / span_h:+.1f} MB/h after warm-up)")
+    else:
+        print("  RSS               (unavailable: install psutil)")
+    return 0 if rounds and not failed else 1
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m toyoko_tracker.bench", description=__doc__.split("\n\n")[0])
+    pages_opts = argparse.ArgumentParser(add_help=False)
+    pages_opts.add_argument("--corpus", help="Directory of saved result pages (*.html); synthetic pages when omitted")
+    pages_opts.add_argument("--repeat", type=int, default=5, help="Runs per page (default: 5)")
+    sub = parser.add_subparsers(dest="bench", required=True)
+    sub.add_parser("parsers", parents=[pages_opts], help="Compare HTML parser backends for the offer extractor")
+    sub.add_parser("extract", parents=[pages_opts], help="Single-pass offer extraction vs the two-pass reference")
+    sub.add_parser("in-page", parents=[pages_opts], help="In-browser offer extraction vs DOM parsing (Playwright)")
+    p = sub.add_parser("pipeline", parents=[pages_opts], help="Replay recorded pages through the parse/filter path")
+    p.add_argument("--backend", default=app.DEFAULT_PARSER_BACKEND, choices=app.PARSER_BACKENDS,
+                   help="Parser backend (default: auto)")
+    p.add_argument("--update", action="store_true", help="Rewrite the recorded offers/results from the current code")
+    from .standin import add_site_arguments
+    p = sub.add_parser("e2e", help="Run the worker loop against the local stand-in site")
+    p.add_argument("--duration", type=float, default=120.0, help="Seconds to run (default: 120)")
+    p.add_argument("--hotels", type=int, default=20, help="Hotels to watch (default: 20)")
+    p.add_argument("--engine", default="http", choices=("http", "playwright", "selenium"))
+    p.add_argument("--concurrency", type=int, default=4)
+    p.add_argument("--rps", type=float, default=20.0, help="Tracker rate limit, requests/sec (default: 20)")
+    p.add_argument("--loop-interval", type=int, default=5, help="Seconds between rounds (default: 5)")
+    p.add_argument("--sample-every", type=float, default=5.0, help="Memory sampling period (default: 5)")
+    p.add_argument("--verbose", action="store_true", help="Keep the tracker's console log")
+    add_site_arguments(p)
+    args = parser.parse_args(argv)
+
+    if args.bench == "e2e":
+        return bench_e2e(args)
+    if args.bench == "pipeline":
+        fixtures = load_fixtures(args.corpus) if args.corpus else synthetic_fixtures()
+        if not fixtures:
+            print(f"No recorded pages (*.html with a .json) found under {args.corpus}")
+            return 2
+        return bench_pipeline(fixtures, args.repeat, args.backend, args.update)
+
+    pages = load_corpus(args.corpus) if args.corpus else synthetic_corpus()
+    if not pages:
+        print(f"No *.html pages found under {args.corpus}")
+        return 2
+    if args.bench == "parsers":
+        return bench_parsers(pages, args.repeat)
+    if args.bench == "extract":
+        return bench_extract(pages, args.repeat)
+    if args.bench == "in-page":
+        return bench_in_page(pages, args.repeat)
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
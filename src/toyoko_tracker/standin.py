@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+本地替身站点 Local stand-in for the Toyoko Inn room-plan search.
+
+  python -m toyoko_tracker.standin [--port 8765] [--latency-ms 300] [--error-rate 0.02]
+                                   [--block-rate 0.01] [--flip-interval 60] [--corpus DIR]
+  TOYOKO_BASE_URL=http://127.0.0.1:8765/eng/search/result/room_plan/ python -m toyoko_tracker
+
+Answers any hotel=/start=/end= query with a result page: recorded pages from a
+corpus (see bench.py) or synthetic ones. Per (hotel, stay) availability flips
+on a fixed schedule so detection latency can be measured; latency, server
+errors and bot-check pages are injected at the configured rates.
+GET /_standin/state returns the request counters as JSON.
+"""
+
+import argparse
+import json
+import math
+import random
+import sys
+import threading
+import time
+import zlib
+from dataclasses import dataclass, asdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit, parse_qs
+
+from .bench import load_fixtures, synthetic_result_page
+
+ROOM_PLAN_PATH = "/eng/search/result/room_plan/"
+
+BLOCK_PAGE_HTML = (
+    "<!DOCTYPE html><html><head><title>Access Denied</title></head><body>"
+    "<h1>Access Denied</h1><p>You don't have permission to access this resource. "
+    "Please verify you are human.</p></body></html>"
+)
+ERROR_PAGE_HTML = (
+    "<!DOCTYPE html><html><head><title>503 Service Unavailable</title></head><body>"
+    "<h1>Service Unavailable</h1><p>The server is temporarily unable to service your request.</p>"
+    "</body></html>"
+)
+
+
+@dataclass
+class StandInSettings:
+    latency_ms: float = 200.0      # mean response delay
+    jitter_ms: float = 100.0       # standard deviation of the delay
+    error_rate: float = 0.0        # share of requests answered with HTTP 503
+    block_rate: float = 0.0        # share of requests answered with a 403 bot-check page
+    flip_interval_sec: float = 60.0
+    flip_share: float = 0.5        # share of (hotel, stay) pairs that flip; the rest stay sold out
+    seed: int = 0
+
+
+class StandInSite:
+    """
+    Page selection and fault injection, independent of the HTTP server.
+    A flipping pair is sold out for one flip interval, then available for
+    the next, with a per-pair phase so pairs don't flip together.
+    """
+
+    def __init__(self, settings: StandInSettings, corpus: Optional[str] = None):
+        self.settings = settings
+        self.started = time.time()
+        self._rnd = random.Random(settings.seed)
+        self._lock = threading.Lock()
+        self._counts: Dict[str, int] = {"requests": 0, "available": 0, "sold_out": 0, "blocked": 0, "error": 0}
+        self.available_pages, self.sold_out_pages = self._load_pages(corpus)
+
+    @staticmethod
+    def _load_pages(corpus: Optional[str]) -> Tuple[List[str], List[str]]:
+        available: List[str] = []
+        sold_out: List[str] = []
+        for fx in (load_fixtures(corpus) if corpus else []):
+            page_class = (fx.meta.get("result") or {}).get("page_class")
+            if page_class not in (None, "ok", "no_vacancy"):
+                continue  # recorded block/error pages are injected separately
+            if (fx.meta.get("expected") or {}).get("offers"):
+                available.append(fx.html)
+            else:
+                sold_out.append(fx.html)
+        if not available:
+            available = [synthetic_result_page(seed=i) for i in range(4)]
+        if not sold_out:
+            sold_out = [synthetic_result_page(seed=100, sold_out=True)]
+        return available, sold_out
+
+    # ---- Availability schedule ----
+    def _hash(self, key: str) -> int:
+        return zlib.crc32(f"{self.settings.seed}|{key}".encode("utf-8"))
+
+    def flips(self, key: str) -> bool:
+        return (self._hash(key) % 1000) < self.settings.flip_share * 1000
+
+    def _spell(self, key: str, now: float) -> int:
+        """Index of the current flip interval for `key` (odd = available)."""
+        phase = (self._hash(key) % 997) / 997.0
+        return int(math.floor((now - self.started) / self.settings.flip_interval_sec + phase))
+
+    def is_available(self, key: str, now: Optional[float] = None) -> bool:
+        return self.flips(key) and self._spell(key, time.time() if now is None else now) % 2 == 1
+
+    def available_since(self, key: str, now: Optional[float] = None) -> Optional[float]:
+        """Wall-clock time the current available spell of `key` began; None when sold out."""
+        now = time.time() if now is None else now
+        if not self.is_available(key, now):
+            return None
+        phase = (self._hash(key) % 997) / 997.0
+        return self.started + (self._spell(key, now) - phase) * self.settings.flip_interval_sec
+
+    def flips_to_available(self, key: str, t0: float, t1: float) -> int:
+        """How many available spells of `key` began within [t0, t1]."""
+        if not self.flips(key):
+            return 0
+        phase = (self._hash(key) % 997) / 997.0
+        iv = self.settings.flip_interval_sec
+        first, last = self._spell(key, t0), self._spell(key, t1)
+        return sum(1 for k in range(first, last + 1)
+                   if k % 2 == 1 and t0 <= self.started + (k - phase) * iv <= t1)
+
+    # ---- Requests ----
+    def respond(self, query: Dict[str, str]) -> Tuple[int, str]:
+        """(status, html) for one room-plan request, after the injected delay."""
+        s = self.settings
+        with self._lock:
+            delay = max(0.0, self._rnd.gauss(s.latency_ms, s.jitter_ms)) / 1000.0 if s.latency_ms > 0 else 0.0
+            roll = self._rnd.random()
+            self._counts["requests"] += 1
+        if delay:
+            time.sleep(delay)
+        key = f"{query.get('hotel', '')}|{query.get('start', '')}|{query.get('end', '')}"
+        if roll < s.error_rate:
+            kind, status, html = "error", 503, ERROR_PAGE_HTML
+        elif roll < s.error_rate + s.block_rate:
+            kind, status, html = "blocked", 403, BLOCK_PAGE_HTML
+        elif self.is_available(key):
+            kind, status = "available", 200
+            html = self.available_pages[self._hash(key) % len(self.available_pages)]
+        else:
+            kind, status = "sold_out", 200
+            html = self.sold_out_pages[self._hash(key) % len(self.sold_out_pages)]
+        with self._lock:
+            self._counts[kind] += 1
+        return status, html
+
+    def state(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = dict(self._counts)
+        return {"uptime_sec": round(time.time() - self.started, 1), "settings": asdict(self.settings),
+                "pages": {"available": len(self.available_pages), "sold_out": len(self.sold_out_pages)},
+                "counts": counts}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    site: StandInSite = None  # set per server by serve()
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        if parts.path == "/_standin/state":
+            self._send(200, json.dumps(self.site.state()), "application/json")
+            return
+        query = {k: v[0] for k, v in parse_qs(parts.query).items()}
+        status, html = self.site.respond(query)
+        self._send(status, html, "text/html; charset=utf-8")
+
+    def _send(self, status: int, body: str, content_type: str) -> None:
+        data = body.encode("utf-8")
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        if not isinstance(sys.exc_info()[1], (ConnectionError, TimeoutError)):
+            super().handle_error(request, client_address)  # clients hanging up early are routine
+
+
+def serve(site: StandInSite, host: str = "127.0.0.1", port: int = 0) -> ThreadingHTTPServer:
+    """Start the stand-in on a daemon thread (port 0 picks a free port)."""
+    handler = type("StandInHandler", (_Handler,), {"site": site})
+    server = _Server((host, port), handler)
+    threading.Thread(target=server.serve_forever, name="standin-http", daemon=True).start()
+    return server
+
+
+def base_url(server: ThreadingHTTPServer) -> str:
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}{ROOM_PLAN_PATH}"
+
+
+def settings_from_args(args: argparse.Namespace) -> StandInSettings:
+    return StandInSettings(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+                           block_rate=args.block_rate, flip_interval_sec=args.flip_interval,
+                           flip_share=args.flip_share, seed=args.seed)
+
+
+def add_site_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--latency-ms", type=float, default=200.0, help="Mean response delay (default: 200)")
+    parser.add_argument("--jitter-ms", type=float, default=100.0, help="Delay standard deviation (default: 100)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of HTTP 503 responses (default: 0)")
+    parser.add_argument("--block-rate", type=float, default=0.0, help="Share of 403 bot-check pages (default: 0)")
+    parser.add_argument("--flip-interval", type=float, default=60.0, help="Seconds between availability flips (default: 60)")
+    parser.add_argument("--flip-share", type=float, default=0.5, help="Share of hotels that flip (default: 0.5)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--corpus", help="Recorded pages to serve (see bench.py); synthetic pages when omitted")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m toyoko_tracker.standin", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    add_site_arguments(parser)
+    args = parser.parse_args(argv)
+
+    site = StandInSite(settings_from_args(args), args.corpus)
+    server = serve(site, args.host, args.port)
+    print(f"Stand-in site on {base_url(server)}")
+    print(f"  export TOYOKO_BASE_URL={base_url(server)}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
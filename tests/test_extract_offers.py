@@ -0,0 +1,105 @@
+"""
+extract_offers (one-pass walk), the selectolax backend and the original
+two-pass extractor in bench.py must agree on every page shape.
+"""
+import pytest
+from bs4 import BeautifulSoup
+
+from toyoko_tracker import app
+from toyoko_tracker.bench import extract_offers_two_pass, synthetic_result_page
+
+PARENT = "SearchResultRoomPlanParentCard_card__p1"
+TITLE = "SearchResultRoomPlanParentCard_title__t1"
+CHILD = "SearchResultRoomPlanChildCard_card-wrapper__c1"
+PLAN = "SearchResultRoomPlanChildCard_title__n1"
+PRICE = "SearchResultRoomPlanChildCard_price__r1"
+VALUE = "SearchResultRoomPlanChildCard_value__v1"
+MEMBER = "SearchResultRoomPlanChildCard_member-section__m1"
+
+
+def child(plan: str, price: str, member: str = "", extra: str = "", left: str = "Reserve") -> str:
+    member_html = f"<div class='{MEMBER}'><span>Member</span><span class='{VALUE}'>{member}</span></div>" if member else ""
+    return (
+        f"<div class='{CHILD}'>{extra}<p class='{PLAN}'>{plan}</p>"
+        f"<div class='{PRICE}'><span>Non-member</span><span class='{VALUE}'>{price}</span></div>"
+        f"{member_html}<button>{left}</button></div>"
+    )
+
+
+def title_span(text: str) -> str:
+    return f"<span class='{TITLE}'>{text}</span>"
+
+
+SCRIPTS = "<script>window.x = 'Only 2 Rooms Left';</script><style>.y{}</style>"
+
+
+def page(body: str) -> str:
+    return (
+        "<html><head><title>Toyoko Inn Test</title></head><body>"
+        f"<h1 class='room_plan_title__h'>Toyoko Inn Test</h1><main>{body}</main></body></html>"
+    )
+
+
+PAGES = {
+    "plain": page(
+        f"<div class='{PARENT}'><h3 class='{TITLE}'>Single</h3>"
+        f"{child('Standard', '¥7,800', '¥7,400')}{child('No breakfast', '¥7,200', left='Only 1 Room Left')}</div>"
+    ),
+    "nested_cards": page(
+        f"<div class='{PARENT}'><h3 class='{TITLE}'>Double</h3>{child('Outer', '¥9,100')}"
+        f"<div class='{PARENT}'><h3 class='{TITLE}'>Twin</h3>{child('Inner', '¥11,300', '¥10,900')}</div></div>"
+    ),
+    "orphan_cards": page(
+        f"<section><h3 class='{TITLE}'>Heartful Single</h3></section>"
+        f"{child('Orphan A', '¥8,000')}<p>between</p>{child('Orphan B', '¥8,500', left='Sold out')}"
+        f"<div class='{PARENT}'><h3 class='{TITLE}'>Twin</h3>{child('Carded', '¥12,000')}</div>"
+        f"{child('Orphan after card', '¥6,900')}"
+    ),
+    "orphan_without_title": page(child("Untitled", "¥5,900")),
+    "title_inside_child": page(
+        f"<div class='{PARENT}'>"
+        f"{child('First', '¥7,000', extra=title_span('Semi-double'))}"
+        f"<h3 class='{TITLE}'>Single</h3>{child('Second', '¥7,500')}</div>"
+        f"{child('Orphan', '¥6,000', extra=title_span('Inner title'))}"
+    ),
+    "script_and_style": page(
+        f"<div class='{PARENT}'><h3 class='{TITLE}'>Single<style>.x{{color:red}}</style></h3>"
+        f"{child('Scripted', '¥7,700', extra=SCRIPTS)}"
+        f"</div><script>var plans = [];</script>"
+    ),
+    "price_without_value_span": page(
+        f"<div class='{PARENT}'><h3 class='{TITLE}'>Single</h3><div class='{CHILD}'>"
+        f"<p class='{PLAN}'>Total only</p><div class='{PRICE}'><span>Total</span> <em>¥ 8,800</em></div></div></div>"
+    ),
+    "sold_out": synthetic_result_page(seed=1, sold_out=True, filler_kb=1),
+}
+for _seed in range(3):
+    PAGES[f"synthetic_{_seed}"] = synthetic_result_page(seed=_seed, orphans=2, filler_kb=1)
+
+
+@pytest.mark.parametrize("name", sorted(PAGES))
+def test_one_pass_matches_two_pass(name):
+    html = PAGES[name]
+    assert app.extract_offers(BeautifulSoup(html, "html.parser")) == \
+        extract_offers_two_pass(BeautifulSoup(html, "html.parser"))
+
+
+@pytest.mark.skipif(not app._HAS_SELECTOLAX, reason="selectolax is not installed")
+@pytest.mark.parametrize("name", sorted(PAGES))
+def test_selectolax_matches_two_pass(name):
+    html = PAGES[name]
+    _, offers, stats = app._extract_selectolax(html)
+    assert (offers, stats) == extract_offers_two_pass(BeautifulSoup(html, "html.parser"))
+
+
+def test_script_and_style_text_is_ignored():
+    offers, _ = app.extract_offers(BeautifulSoup(PAGES["script_and_style"], "html.parser"))
+    assert [o["room_title"] for o in offers] == ["Single"]
+    assert offers[0]["remaining_text"] != "Only 2 Rooms Left"
+
+
+def test_nested_cards_list_inner_children_under_both_titles():
+    offers, _ = app.extract_offers(BeautifulSoup(PAGES["nested_cards"], "html.parser"))
+    assert [(o["room_title"], o["plan_name"]) for o in offers] == [
+        ("Double", "Outer"), ("Double", "Inner"), ("Twin", "Inner"),
+    ]
@@ -0,0 +1,61 @@
+"""fetch_rendered_http on pages the browserless engine must (or must not) read itself."""
+import pytest
+
+from toyoko_tracker import app
+from toyoko_tracker.bench import synthetic_result_page
+
+MEMBERSHIP_DATA = (
+    '<script id="__NEXT_DATA__" type="application/json">'
+    '{"props":{"pageProps":{"membership":{"plans":[{"name":"Club Card","fee":1500}]}}}}</script>'
+)
+
+
+class _Response:
+    def __init__(self, html: str):
+        self.text = html
+        self.content = html.encode("utf-8")
+
+    def raise_for_status(self) -> None:
+        pass
+
+
+class _Session:
+    def __init__(self, html: str):
+        self.html = html
+
+    def get(self, *args, **kwargs) -> _Response:
+        return _Response(self.html)
+
+
+@pytest.fixture
+def serve_html(monkeypatch):
+    def _serve(html: str):
+        monkeypatch.setattr(app, "_http_session", lambda: _Session(html))
+        return app.fetch_rendered_http(app.AppConfig(), "http://stand-in/")
+    return _serve
+
+
+def test_cards_win_over_unrelated_payload_lists(serve_html):
+    html = synthetic_result_page(seed=3, filler_kb=1).replace("</body>", MEMBERSHIP_DATA + "</body>")
+    page = serve_html(html)
+    assert page is not None and page.source == "dom"
+    offers, _ = app.extract_offers(page.soup)
+    assert offers and page.visible_text
+
+
+def test_payload_plan_list_needs_prices():
+    assert app.offers_from_payload({"membership": {"plans": [{"name": "Club Card", "fee": 1500}]}}) is None
+    assert app.offers_from_payload({"roomPlans": []}) is None
+    offers, stats = app.offers_from_payload({"rooms": [{"roomName": "Single", "plans": [{"planName": "A", "price": 7800}]}]})
+    assert [o["price_val"] for o in offers] == [7800] and stats["had_any_offer"]
+
+
+def test_sold_out_empty_state_is_read_without_a_browser(serve_html):
+    page = serve_html(synthetic_result_page(seed=4, sold_out=True, filler_kb=1))
+    assert page is not None
+    assert app.classify_page(page, app.extract_offers(page.soup)[0]) == "no_vacancy"
+
+
+def test_page_without_cards_or_sold_out_wording_falls_back(serve_html):
+    assert serve_html("<html><body><main><div class='SearchResultEmpty_message__c'></div></main></body></html>") is None
+    assert serve_html("<html><body><p>Loading…</p></body></html>") is None
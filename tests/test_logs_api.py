@@ -0,0 +1,53 @@
+"""/logs: sequence-numbered entries from the ring, paged with since/limit and filtered by level."""
+from collections import deque
+
+import pytest
+
+from toyoko_tracker import app
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(app, "_safe_print", lambda *_a, **_k: None)
+    monkeypatch.setattr(app, "_LOG_RING", deque(maxlen=app.LOG_RING_SIZE))
+    monkeypatch.setattr(app, "_LOG_SEQ", 0)
+    return app.app.test_client()
+
+
+def test_since_returns_only_newer_entries(client):
+    app._log("one", level="info")
+    seq = client.get("/logs").get_json()["seq"]
+    app._log("two", level="info")
+    app._log("three", level="error")
+    out = client.get("/logs", query_string={"since": seq}).get_json()
+    assert [e["message"] for e in out["entries"]] == ["two", "three"]
+    assert [e["seq"] for e in out["entries"]] == [seq + 1, seq + 2]
+    assert out["next"] == out["seq"] == seq + 2 and not out["truncated"]
+
+
+def test_limit_pages_through_a_level_filter(client):
+    for i in range(7):
+        app._log(f"line {i}", level="warning" if i % 2 else "info")
+    seen, since = [], 0
+    for _ in range(3):
+        out = client.get("/logs", query_string={"since": since, "limit": 2, "level": "warning"}).get_json()
+        assert all(e["level"] == "warning" for e in out["entries"])
+        seen += [e["message"] for e in out["entries"]]
+        since = out["next"]
+    assert seen == ["line 1", "line 3", "line 5"]
+    assert since == out["seq"] == 7
+    assert client.get("/logs", query_string={"since": since, "level": "warning"}).get_json()["entries"] == []
+
+
+def test_truncated_once_the_ring_wraps(client):
+    for i in range(app.LOG_RING_SIZE + 10):
+        app._log(f"line {i}")
+    out = client.get("/logs", query_string={"limit": 1}).get_json()
+    assert out["truncated"]
+    assert out["entries"][0]["seq"] == 11 and out["entries"][0]["message"] == "line 10"
+    assert not client.get("/logs", query_string={"since": out["next"]}).get_json()["truncated"]
+
+
+def test_bad_arguments_are_rejected(client):
+    assert client.get("/logs", query_string={"level": "loud"}).status_code == 400
+    assert client.get("/logs", query_string={"limit": "many"}).status_code == 400
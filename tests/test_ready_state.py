@@ -0,0 +1,83 @@
+"""
+_READY_STATE_JS against recorded-style pages, run in node with a minimal DOM
+stand-in and a fake clock. Skipped when node is not installed.
+"""
+import json
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+from bs4 import BeautifulSoup
+
+from toyoko_tracker import app
+from toyoko_tracker.bench import synthetic_result_page
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+HARNESS = """
+const f = (__JS__);
+const page = __PAGE__;
+let now = 0;
+Date.now = () => now;
+global.window = {};
+global.document = {
+  readyState: 'complete',
+  title: page.title,
+  body: {innerText: page.text},
+  querySelectorAll: sel => sel.includes('ChildCard_value')
+    ? Array(page.cards).fill({}) : page.empty.map(t => ({innerText: t})),
+};
+let result = null;
+for (; now <= __LIMIT__; now += __POLL__) {
+  const s = f();
+  if (s) { result = {state: s, ms: now}; break; }
+}
+console.log(JSON.stringify(result));
+"""
+
+
+def settle(html: str, limit_ms: int = app.READY_TIMEOUT_SEC * 1000):
+    """(state, ms) the readiness script settles on for `html`, polling every READY_POLL_MS."""
+    soup = BeautifulSoup(html, "html.parser")
+    markers = app.EMPTY_STATE_CLASS_MARKERS
+    empty = [el.get_text(" ", strip=True)
+             for el in soup.find_all(class_=lambda c: bool(c) and any(m in c for m in markers))]
+    page = {
+        "title": soup.title.get_text(strip=True) if soup.title else "",
+        "text": soup.body.get_text("\n", strip=True),
+        "cards": len(soup.select('span[class*="SearchResultRoomPlanChildCard_value"]')),
+        "empty": empty,
+    }
+    script = (HARNESS.replace("__JS__", app._READY_STATE_JS).replace("__PAGE__", json.dumps(page))
+              .replace("__LIMIT__", str(limit_ms)).replace("__POLL__", str(app.READY_POLL_MS)))
+    out = subprocess.run(["node", "-e", script], capture_output=True, text=True, check=True, timeout=30)
+    result = json.loads(out.stdout)
+    return (result["state"], result["ms"]) if result else (None, None)
+
+
+pytestmark = pytest.mark.skipif(shutil.which("node") is None, reason="node is not installed")
+
+
+def test_sold_out_page_without_known_classes_settles_quickly():
+    state, ms = settle((FIXTURES / "sold_out_plain.html").read_text(encoding="utf-8"))
+    assert state == "quiet"
+    assert ms <= app.READY_QUIET_MS + 2 * app.READY_POLL_MS
+
+
+def test_quiet_sold_out_page_is_classified_as_no_vacancy():
+    html = (FIXTURES / "sold_out_plain.html").read_text(encoding="utf-8")
+    soup = BeautifulSoup(html, "html.parser")
+    rendered = app.RenderedPage(soup, soup.body.get_text(" ", strip=True))
+    rendered.ready_state = "quiet"
+    assert app.classify_page(rendered, app.extract_offers(soup)[0]) == "no_vacancy"
+
+
+def test_empty_state_message_settles_as_no_vacancy():
+    state, ms = settle(synthetic_result_page(seed=2, sold_out=True, filler_kb=1))
+    assert state == "no_vacancy" and ms < app.READY_QUIET_MS
+
+
+def test_page_with_cards_settles_as_offers():
+    state, ms = settle(synthetic_result_page(seed=2, filler_kb=1))
+    assert state == "offers" and ms < app.READY_QUIET_MS
@@ -0,0 +1,67 @@
+"""/status with <part>_v versions: only the parts that moved, 304 when nothing did."""
+from collections import deque
+
+import pytest
+
+from toyoko_tracker import app
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(app, "_safe_print", lambda *_a, **_k: None)
+    monkeypatch.setattr(app, "_LOG_RING", deque(maxlen=app.LOG_RING_SIZE))
+    monkeypatch.setattr(app, "_LOG_SEQ", 0)
+    return app.app.test_client()
+
+
+def _since(versions):
+    return {f"{part}_v": v for part, v in versions.items()}
+
+
+def test_full_snapshot_carries_versions(client):
+    out = client.get("/status").get_json()
+    assert out["ok"] and not out["delta"]
+    assert set(out["versions"]) == set(app._STATUS_PARTS)
+    assert {"config", "results", "timings", "logs"} <= set(out)
+
+
+def test_unchanged_versions_are_answered_with_304(client):
+    versions = client.get("/status").get_json()["versions"]
+    resp = client.get("/status", query_string=_since(versions))
+    assert resp.status_code == 304
+    assert resp.get_data() == b""
+
+
+def test_only_moved_parts_are_sent(client):
+    versions = client.get("/status").get_json()["versions"]
+    app._bump_version("config")
+    resp = client.get("/status", query_string=_since(versions))
+    assert resp.status_code == 200
+    out = resp.get_json()
+    assert out["delta"] and out["versions"]["config"] == versions["config"] + 1
+    assert "config" in out
+    assert "results" not in out and "timings" not in out
+    assert out["logs"] == [] and out["logs_delta"]
+    assert client.get("/status", query_string=_since(out["versions"])).status_code == 304
+
+
+def test_logs_hold_only_new_lines(client):
+    app._log("before")
+    versions = client.get("/status").get_json()["versions"]
+    app._log("first")
+    app._log("second")
+    out = client.get("/status", query_string=_since(versions)).get_json()
+    assert out["logs_delta"]
+    assert [line.split("] ", 1)[1] for line in out["logs"]] == ["first", "second"]
+    assert out["versions"]["logs"] == versions["logs"] + 2
+
+
+def test_wrapped_ring_resends_the_tail(client):
+    app._log("before")
+    versions = client.get("/status").get_json()["versions"]
+    for i in range(app.LOG_RING_SIZE + 5):
+        app._log(f"line {i}")
+    out = client.get("/status", query_string=_since(versions)).get_json()
+    assert not out["logs_delta"]
+    assert len(out["logs"]) == 300
+    assert out["logs"][-1].endswith(f"line {app.LOG_RING_SIZE + 4}")